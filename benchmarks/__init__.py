@@ -0,0 +1,3 @@
+"""
+Benchmarks de rendimiento de TraductorOCR (ejecutar con: python -m benchmarks.<nombre>)
+"""
@@ -0,0 +1,130 @@
+"""
+Benchmark del camino de audio completo sin hardware: reproduce archivos WAV/FLAC
+por AudioTranslator (búfer -> remuestreo -> detector de voz -> Vosk -> subtítulos)
+traduciendo contra el servidor local de pruebas.
+
+Informa por archivo del factor de tiempo real (tiempo de proceso / duración del
+audio), la latencia por trozo y por frase, el uso de CPU, el tiempo de
+decodificación y el audio descartado por el detector de voz. Con --concurrent
+los archivos se reproducen a la vez, cada uno como una fuente con su propio
+reconocedor (como el audio del juego y el chat de voz); --workers limita los
+procesos de reconocimiento, uno por fuente (0 = decodificar en este proceso).
+Necesita Vosk y el modelo de voz.
+
+Uso:
+    python -m benchmarks.bench_audio_replay archivo.wav [otro.flac ...] [--realtime] [--concurrent]
+                                            [--workers 4] [--stub-latency-ms 0] [--timeout 30]
+                                            [--output informe.json]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.common import dump_json
+from traductorocr.core.audio_translator import AudioSourceGroup
+from traductorocr.core.batch_translator import BatchTranslator
+from traductorocr.core.config import SPEECH_WORKER_PROCESSES
+from traductorocr.core.speech_model import SpeechModelLoader
+from traductorocr.core.translation_backend import StubTranslationServer, StubServerBackend
+from traductorocr.core.translation_cache import TranslationCache
+
+def replay(paths, realtime, backend, timeout, loader):
+    """Reproduce los archivos a la vez (una fuente por archivo) y devuelve sus métricas"""
+    subtitles = {index: [] for index in range(len(paths))}
+    errors = {index: [] for index in range(len(paths))}
+    group = AudioSourceGroup(on_translation=lambda index, text: subtitles[index].append(text),
+                             on_error=lambda index, error: errors[index].append(error),
+                             max_sources=len(paths), model_loader=loader)
+    sources = [group.source(index) for index in range(len(paths))]
+    for audio, path in zip(sources, paths):
+        # Traducción sin red ni caché en disco: cada ejecución mide lo mismo
+        audio.batcher = BatchTranslator(backend.translate_batch)
+        audio.translation_cache = TranslationCache()
+        audio.set_replay_file(path, realtime=realtime)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    group.start_all()
+    processed_s = {}
+    while len(processed_s) < len(sources):
+        for index, audio in enumerate(sources):
+            if index not in processed_s and audio.finished.is_set():
+                processed_s[index] = time.perf_counter() - started
+        time.sleep(0.002)
+    # Esperar a que lleguen las traducciones pendientes
+    deadline = time.perf_counter() + timeout
+    while any(audio.subtitles.outstanding > 0 for audio in sources) and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    wall_s = time.perf_counter() - started
+    cpu_s = time.process_time() - cpu_started
+    recognizers = [audio.recognizer.stats() for audio in sources]
+    group.stop_all()
+
+    files = {}
+    for index, (audio, path) in enumerate(zip(sources, paths)):
+        duration = audio.source.duration
+        files[path] = {
+            "audio_s": round(duration, 3),
+            "processing_s": round(processed_s[index], 3),
+            "real_time_factor": round(processed_s[index] / duration, 4) if duration else None,
+            "recognizer": recognizers[index],
+            "subtitles": audio.subtitles.stats(),
+            "vad": audio.vad.stats() if audio.vad is not None else None,
+            "buffer": audio.buffer_stats(),
+            "pending_translations": audio.subtitles.outstanding,
+            "last_subtitles": subtitles[index][-3:],
+            "errors": errors[index],
+        }
+    longest = max(audio.source.duration for audio in sources)
+    return {
+        "sources": len(sources),
+        "realtime": realtime,
+        "wall_s": round(wall_s, 3),
+        "real_time_factor": round(max(processed_s.values()) / longest, 4) if longest else None,
+        # Solo este proceso: con procesos de reconocimiento, su CPU se ve en 'decode_ms' de cada fuente
+        "cpu_s": round(cpu_s, 3),
+        "cpu_percent": round(100.0 * cpu_s / wall_s, 1) if wall_s else None,
+        "files": files,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+', help="Archivos WAV/FLAC con voz en inglés")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Reproducir al ritmo real (por defecto, lo más rápido posible)")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="Reproducir todos los archivos a la vez, una fuente por archivo")
+    parser.add_argument('--workers', type=int, default=SPEECH_WORKER_PROCESSES,
+                        help="Máximo de procesos de reconocimiento (0 = decodificar en este proceso)")
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0,
+                        help="Retardo artificial del servidor de traducción de pruebas")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Espera máxima de las traducciones pendientes al terminar")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    loader = SpeechModelLoader(workers=max(0, args.workers))
+    loader.load()
+    while not loader.wait(timeout=0.1) and loader.error is None:
+        pass
+    if loader.error is not None:
+        print(f"El modelo de voz no está disponible: {loader.error}", file=sys.stderr)
+        sys.exit(1)
+
+    server = StubTranslationServer(latency_ms=args.stub_latency_ms).start()
+    backend = StubServerBackend(server.url)
+    try:
+        if args.concurrent:
+            runs = [replay(args.files, args.realtime, backend, args.timeout, loader)]
+        else:
+            runs = [replay([path], args.realtime, backend, args.timeout, loader) for path in args.files]
+    finally:
+        backend.close()
+        server.stop()
+        loader.shutdown()
+
+    dump_json({"model_load_ms": round(loader.load_ms or 0.0, 1), "workers": args.workers,
+               "runs": runs}, args.output)
+
+if __name__ == "__main__":
+    main()
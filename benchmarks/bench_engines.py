@@ -0,0 +1,110 @@
+"""
+Compara la precisión y la latencia de los motores de OCR (Tesseract, EasyOCR)
+sobre los mismos fotogramas, para elegir el motor de cada zona: el rápido para
+el texto de HUD y el robusto para las fuentes estilizadas.
+
+La precisión se mide contra el texto esperado: SAMPLE_LINES en los casos
+sintéticos, o un archivo '<captura>.txt' junto a cada captura de --fixtures
+(las capturas sin .txt solo cuentan para la latencia).
+
+Uso:
+    python -m benchmarks.bench_engines [--engines tesseract,easyocr] [--fixtures DIR]
+                                       [--repeats N] [--output informe.json]
+"""
+import argparse
+import difflib
+import os
+import time
+
+import cv2
+
+from benchmarks.common import SAMPLE_LINES, FONT_PATH, synth_text_image, load_fixture_images, summarize, dump_json
+from traductorocr.core.config import OCR_ENGINES, THRESHOLD_VALUE
+from traductorocr.core.ocr_engine import get_ocr_engine
+from traductorocr.core.ocr_lines import recognize_lines
+from traductorocr.core.preprocessing import normalize_scale, detect_text_blocks
+
+def build_cases(fixtures_dir=None):
+    """Devuelve [(nombre, fotograma binarizado, texto esperado o None)]"""
+    if fixtures_dir:
+        cases = []
+        for name, frame in load_fixture_images(fixtures_dir):
+            expected = None
+            sidecar = os.path.join(fixtures_dir, os.path.splitext(name)[0] + '.txt')
+            if os.path.isfile(sidecar):
+                with open(sidecar, encoding='utf-8') as f:
+                    expected = f.read()
+            cases.append((name, frame, expected))
+    else:
+        cases = [
+            (f"synth_{size}px_noise{noise}", synth_text_image(SAMPLE_LINES[:3], FONT_PATH, size, noise=noise),
+             "\n".join(SAMPLE_LINES[:3]))
+            for size in (16, 24, 36)
+            for noise in (0, 12)
+        ]
+    binarized = []
+    for name, frame, expected in cases:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+        _, processed = cv2.threshold(gray, THRESHOLD_VALUE, 255, cv2.THRESH_BINARY)
+        processed, _ = normalize_scale(processed)
+        binarized.append((name, processed, expected))
+    return binarized
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+def similarity(recognized: str, expected: str) -> float:
+    """Parecido 0-1 entre el texto reconocido y el esperado (espacios y mayúsculas aparte)"""
+    return difflib.SequenceMatcher(None, normalize_text(recognized), normalize_text(expected)).ratio()
+
+def run_engine(engine_name, cases, repeats):
+    """Mide el pipeline de OCR por líneas con un motor (tras una pasada de calentamiento)"""
+    started = time.perf_counter()
+    engine = get_ocr_engine(engine_name=engine_name)
+    init_ms = (time.perf_counter() - started) * 1000.0
+    if engine.name != engine_name:
+        raise RuntimeError(f"'{engine_name}' no disponible (se usaría '{engine.name}')")
+
+    report = {"init_ms": round(init_ms, 3), "cases": {}}
+    samples, scores = [], []
+    for name, frame, expected in cases:
+        boxes = detect_text_blocks(frame)
+        text = "\n".join(line.text for line in recognize_lines(frame, boxes, engine_name))
+        case_samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            recognize_lines(frame, boxes, engine_name)
+            case_samples.append((time.perf_counter() - started) * 1000.0)
+        samples.extend(case_samples)
+
+        case = {"p50_ms": summarize(case_samples)["p50_ms"], "text": text}
+        if expected is not None:
+            case["similarity"] = round(similarity(text, expected), 3)
+            scores.append(case["similarity"])
+        report["cases"][name] = case
+
+    report["latency"] = summarize(samples)
+    if scores:
+        report["mean_similarity"] = round(sum(scores) / len(scores), 3)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engines', default=",".join(OCR_ENGINES), help="Motores separados por comas")
+    parser.add_argument('--fixtures', help="Directorio con capturas reales (y su texto en <captura>.txt)")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    cases = build_cases(args.fixtures)
+    engines = {}
+    for engine_name in [name.strip() for name in args.engines.split(",") if name.strip()]:
+        try:
+            engines[engine_name] = run_engine(engine_name, cases, args.repeats)
+        except Exception as e:
+            engines[engine_name] = {"error": str(e)}
+
+    dump_json({"cases": len(cases), "repeats": args.repeats, "engines": engines}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Informe del tiempo de importación del arranque (equivalente a -X importtime).
+
+Importa en un proceso limpio los módulos que se cargan antes de mostrar la ventana
+y comprueba que las pilas pesadas (OCR, audio, traducción) no se cargan todavía.
+Termina con código 1 si alguna se importa o si se supera el presupuesto.
+
+Uso:
+    python -m benchmarks.bench_import_time [--budget-ms 150] [--top 15] [--output informe.json]
+"""
+import argparse
+import subprocess
+import sys
+
+from benchmarks.common import dump_json
+
+# Lo que importa la ruta de arranque de la interfaz antes de root.mainloop()
+STARTUP_MODULES = [
+    "traductorocr.__main__",
+    "traductorocr.ui.design",
+    "traductorocr.core.translator",
+]
+
+# Módulos que solo deben cargarse en su primer uso (o en la precarga en segundo plano)
+LAZY_MODULES = [
+    "cv2", "numpy", "pytesseract", "PIL", "mss",
+    "vosk", "sounddevice",
+    "requests", "deep_translator", "argostranslate",
+]
+
+# Tk se carga siempre para mostrar la ventana: se importa antes y se excluye del presupuesto
+PRELOADED_MODULES = ["tkinter", "tkinter.ttk", "tkinter.font", "tkinter.simpledialog", "tkinter.colorchooser"]
+EXCLUDED_ROOTS = {"tkinter", "_tkinter"}
+
+def parse_importtime(stderr: str):
+    """Devuelve [(módulo, propio_us, acumulado_us, nivel)] de la salida de -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+        except ValueError:
+            continue  # Cabecera
+    return rows
+
+def measure(modules):
+    """Importa 'modules' con -X importtime en un intérprete nuevo"""
+    code = "; ".join(f"import {module}" for module in PRELOADED_MODULES + list(modules))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return parse_importtime(completed.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help="Tiempo máximo de importación del arranque (sin Tk)")
+    parser.add_argument('--top', type=int, default=15, help="Módulos más lentos a mostrar")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    rows = measure(STARTUP_MODULES)
+    imported = {name for name, _, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+
+    # Tiempo total = suma de los módulos de primer nivel, sin contar Tk
+    top_level = [row for row in rows if row[3] == 0]
+    total_us = sum(cumulative for name, _, cumulative, _ in top_level
+                   if name.split(".")[0] not in EXCLUDED_ROOTS)
+    slowest = sorted((row for row in rows if row[0].split(".")[0] not in EXCLUDED_ROOTS),
+                     key=lambda row: row[1], reverse=True)[:args.top]
+
+    report = {
+        "modules": STARTUP_MODULES,
+        "total_ms": round(total_us / 1000.0, 3),
+        "budget_ms": args.budget_ms,
+        "eager_heavy_modules": eager,
+        "slowest_self_ms": {name: round(self_us / 1000.0, 3) for name, self_us, _, _ in slowest},
+    }
+    dump_json(report, args.output)
+
+    if eager or report["total_ms"] > args.budget_ms:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
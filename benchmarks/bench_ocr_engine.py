@@ -0,0 +1,78 @@
+"""
+Compara el motor de Tesseract residente (API de C) con pytesseract (un proceso por captura)
+sobre los mismos fotogramas.
+
+Uso:
+    python -m benchmarks.bench_ocr_engine [--fixtures DIR] [--repeats N] [--output informe.json]
+"""
+import argparse
+import time
+
+import cv2
+
+from benchmarks.common import SAMPLE_LINES, FONT_PATH, synth_text_image, load_fixture_images, summarize, dump_json
+from traductorocr.core.config import THRESHOLD_VALUE
+from traductorocr.core.ocr_engine import TesseractEngine, PytesseractEngine
+
+def build_frames(fixtures_dir=None):
+    """Devuelve los fotogramas binarizados a comparar (sintéticos o de un directorio)"""
+    if fixtures_dir:
+        frames = load_fixture_images(fixtures_dir)
+    else:
+        frames = [
+            (f"synth_{size}px_{n}lines", synth_text_image(SAMPLE_LINES[:n], FONT_PATH, size))
+            for size in (16, 24, 36)
+            for n in (1, 3)
+        ]
+    binarized = []
+    for name, frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+        _, processed = cv2.threshold(gray, THRESHOLD_VALUE, 255, cv2.THRESH_BINARY)
+        binarized.append((name, processed))
+    return binarized
+
+def time_engine(engine, frames, repeats):
+    """Mide el tiempo de image_to_string por fotograma (tras una pasada de calentamiento)"""
+    outputs = {name: engine.image_to_string(frame) for name, frame in frames}
+    samples = []
+    for _ in range(repeats):
+        for _, frame in frames:
+            started = time.perf_counter()
+            engine.image_to_string(frame)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    return samples, outputs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', help="Directorio con capturas reales del juego")
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    frames = build_frames(args.fixtures)
+
+    started = time.perf_counter()
+    native = TesseractEngine()
+    init_ms = (time.perf_counter() - started) * 1000.0
+
+    native_samples, native_outputs = time_engine(native, frames, args.repeats)
+    subprocess_samples, subprocess_outputs = time_engine(PytesseractEngine(), frames, args.repeats)
+    native.close()
+
+    matches = sum(
+        native_outputs[name].strip() == subprocess_outputs[name].strip() for name, _ in frames
+    )
+    native_summary = summarize(native_samples)
+    subprocess_summary = summarize(subprocess_samples)
+    dump_json({
+        "frames": len(frames),
+        "repeats": args.repeats,
+        "resident_init_ms": round(init_ms, 3),
+        "resident": native_summary,
+        "pytesseract": subprocess_summary,
+        "speedup_p50": round(subprocess_summary["p50_ms"] / native_summary["p50_ms"], 2),
+        "identical_outputs": f"{matches}/{len(frames)}",
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark por etapas del pipeline OCR -> traducción.
+
+Mide por separado captura, cvtColor, umbral, escala, bloques de texto, OCR y traducción (contra el servidor
+local de pruebas) sobre imágenes sintéticas con distintas fuentes, tamaños,
+contrastes y ruido, o sobre un directorio de capturas reales.
+
+Uso:
+    python -m benchmarks.bench_pipeline [--fixtures DIR] [--repeats N]
+                                        [--output informe.json] [--baseline anterior.json]
+"""
+import argparse
+import itertools
+import json
+import time
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+from benchmarks.common import SAMPLE_LINES, FONT_PATH, synth_text_image, load_fixture_images, summarize, dump_json
+from traductorocr.core.config import OCR_AUTO_THRESHOLD, TARGET_LANGUAGE
+from traductorocr.core.ocr_engine import get_ocr_engine
+from traductorocr.core.ocr_lines import extract_lines
+from traductorocr.core.preprocessing import AutoThreshold, binarize, normalize_scale, detect_text_blocks
+from traductorocr.core.translation_backend import StubTranslationServer, StubServerBackend
+
+FONTS = [FONT_PATH, None]                      # Fuente del proyecto y la de PIL
+FONT_SIZES = [12, 18, 24, 36]
+CONTRASTS = {"alto": (235, 15), "bajo": (150, 90), "invertido": (20, 230)}
+NOISE_LEVELS = [0.0, 8.0, 20.0]
+
+STAGES = ["capture", "cvtColor", "threshold", "scale", "blocks", "ocr", "translate"]
+
+def synthetic_cases():
+    """Genera la matriz de casos sintéticos (fuente x tamaño x contraste x ruido)"""
+    cases = []
+    for font, size, (contrast, (fg, bg)), noise in itertools.product(
+            FONTS, FONT_SIZES, CONTRASTS.items(), NOISE_LEVELS):
+        name = f"{'pearl' if font else 'default'}_{size}px_{contrast}_ruido{int(noise)}"
+        image = synth_text_image(SAMPLE_LINES[:3], font, size, fg, bg, noise)
+        # Umbral manual entre el texto y el fondo (solo con OCR_AUTO_THRESHOLD = False)
+        cases.append((name, image, ((fg + bg) // 2, fg < bg)))
+    return cases
+
+class CaptureStage:
+    def __init__(self):
+        """Usa una captura de pantalla real si hay pantalla; si no, simula la copia del buffer"""
+        self.simulated = False
+        try:
+            from traductorocr.core.screen_capture import CaptureSession
+            self.session = CaptureSession()
+            self.session.grab((0, 0, 16, 16))
+        except Exception:
+            self.session = None
+            self.simulated = True
+        self._buffer = None
+
+    def run(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        if self.session is not None:
+            self.session.grab((0, 0, width, height))
+            return image
+        if self._buffer is None or self._buffer.shape != image.shape:
+            self._buffer = np.empty_like(image)
+        np.copyto(self._buffer, image)
+        return self._buffer
+
+def run_case(image, manual, capture, engine, backend, timings, empty):
+    """
+    Ejecuta el pipeline completo sobre una imagen midiendo cada etapa. Como la
+    aplicación, usa el umbral automático (OCR_AUTO_THRESHOLD) salvo que esté
+    desactivado y el caso tenga ajustes manuales (umbral, invertir).
+    Cuenta en 'empty' los fotogramas que quedan de un solo color tras el umbral.
+    """
+    started = time.perf_counter()
+    frame = capture.run(image)
+    timings["capture"].append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+    timings["cvtColor"].append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    if OCR_AUTO_THRESHOLD or manual is None:
+        threshold, invert = AutoThreshold().compute(gray)
+    else:
+        threshold, invert = manual
+    processed = binarize(gray, threshold, invert)
+    timings["threshold"].append((time.perf_counter() - started) * 1000.0)
+    if processed.min() == processed.max():
+        empty.append(1)
+
+    started = time.perf_counter()
+    processed, _ = normalize_scale(processed)
+    timings["scale"].append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    boxes = detect_text_blocks(processed)
+    timings["blocks"].append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    lines = []
+    for x, y, w, h in boxes:
+        lines += extract_lines(engine.image_to_data(processed[y:y + h, x:x + w]))
+    timings["ocr"].append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    if lines:
+        backend.translate_batch([line.text for line in lines], 'en', TARGET_LANGUAGE)
+    timings["translate"].append((time.perf_counter() - started) * 1000.0)
+
+    timings["total"].append(sum(timings[stage][-1] for stage in STAGES))
+
+def compare(report, baseline_path):
+    """Compara el p50 de cada etapa con un informe anterior (ratio > 1 = más lento)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparison = {}
+    for stage, summary in report["stages"].items():
+        before = baseline.get("stages", {}).get(stage, {}).get("p50_ms")
+        if before and summary.get("p50_ms"):
+            comparison[stage] = round(summary["p50_ms"] / before, 3)
+    return comparison
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', help="Directorio con capturas reales del juego")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0,
+                        help="Retardo simulado del servidor de traducción")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    parser.add_argument('--baseline', help="Informe JSON anterior con el que comparar")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        # Polaridad desconocida (capturas reales): siempre umbral automático
+        cases = [(name, image, None) for name, image in load_fixture_images(args.fixtures)]
+    else:
+        cases = synthetic_cases()
+
+    server = StubTranslationServer(latency_ms=args.stub_latency_ms).start()
+    backend = StubServerBackend(server.url)
+    capture = CaptureStage()
+    engine = get_ocr_engine()
+
+    timings = defaultdict(list)
+    empty = []
+    run_case(cases[0][1], cases[0][2], capture, engine, backend, defaultdict(list), [])  # Calentamiento
+    started = time.perf_counter()
+    for _ in range(args.repeats):
+        for _, image, manual in cases:
+            run_case(image, manual, capture, engine, backend, timings, empty)
+    wall_s = time.perf_counter() - started
+
+    backend.close()
+    server.stop()
+
+    report = {
+        "cases": len(cases),
+        "repeats": args.repeats,
+        "capture_simulated": capture.simulated,
+        "ocr_engine": type(engine).__name__,
+        "threshold": "auto" if OCR_AUTO_THRESHOLD else "manual",
+        "empty_frames": len(empty),  # Sin texto tras el umbral: el caso no mide OCR de texto
+        "frames_per_s": round(len(timings["total"]) / wall_s, 2) if wall_s > 0 else None,
+        "stages": {stage: summarize(values) for stage, values in timings.items()},
+    }
+    if args.baseline:
+        report["vs_baseline_p50"] = compare(report, args.baseline)
+    dump_json(report, args.output)
+
+if __name__ == "__main__":
+    main()
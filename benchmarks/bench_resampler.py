@@ -0,0 +1,135 @@
+"""
+Comprueba el remuestreador en streaming hacia la tasa del reconocedor de voz.
+
+Pasa audio de tasa conocida (WAV indicados o señales sintéticas a 16/22.05/44.1/48 kHz)
+trama a trama por StreamingResampler y comprueba que la salida tiene la tasa
+esperada y conserva el tono. Si Vosk y el modelo están disponibles, mide además
+el tiempo de CPU del reconocedor alimentado a la tasa nativa frente al audio
+remuestreado. Termina con código 1 si alguna tasa de salida no es la esperada.
+
+Uso:
+    python -m benchmarks.bench_resampler [--wav a.wav b.wav] [--seconds 5] [--output informe.json]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize, dump_json
+from traductorocr.core.audio_sources import read_audio_file
+from traductorocr.core.config import SPEECH_SAMPLERATE, AUDIO_FRAME_SECONDS
+from traductorocr.core.resampler import StreamingResampler
+
+SYNTHETIC_RATES = [16000, 22050, 44100, 48000]
+TONE_HZ = 440.0
+
+def load_audio(path):
+    """Lee un archivo de audio y lo mezcla a mono"""
+    rate, samples = read_audio_file(path)
+    return rate, samples.mean(axis=1).astype(np.int16) if samples.shape[1] > 1 else samples[:, 0]
+
+def synth_voice(rate, seconds, seed=0):
+    """Tono con armónicos y envolvente de sílabas (~4 Hz) más algo de ruido de fondo"""
+    t = np.arange(int(rate * seconds)) / rate
+    signal = sum(np.sin(2 * np.pi * TONE_HZ * k * t) / k for k in (1, 2, 3, 5))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    noise = np.random.default_rng(seed).normal(0, 0.02, t.size)
+    return (np.clip(signal * envelope * 0.3 + noise, -1, 1) * 32767).astype(np.int16)
+
+def dominant_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(samples.size)))
+    return float(np.fft.rfftfreq(samples.size, 1.0 / rate)[spectrum.argmax()])
+
+def resample_stream(rate, samples):
+    """Remuestrea en tramas del tamaño que entrega el búfer de captura"""
+    resampler = StreamingResampler(rate, SPEECH_SAMPLERATE)
+    frame_size = int(rate * AUDIO_FRAME_SECONDS)
+    chunks, samples_ms = [], []
+    for start in range(0, samples.size, frame_size):
+        started = time.perf_counter()
+        chunks.append(resampler.process(samples[start:start + frame_size]))
+        samples_ms.append((time.perf_counter() - started) * 1000.0)
+    return resampler, np.concatenate(chunks), samples_ms
+
+def load_recognizer_model():
+    """Devuelve el modelo de Vosk o el motivo por el que no está disponible"""
+    try:
+        from vosk import Model, SetLogLevel
+        from traductorocr.utils.paths import resource_path
+        from traductorocr.utils.voice_models import MODEL_DIR, verify_model
+
+        path = resource_path(MODEL_DIR)
+        if not verify_model(path, check_hashes=False):
+            return None, f"modelo incompleto en {path}"
+        SetLogLevel(-1)
+        return Model(path), None
+    except Exception as e:
+        return None, str(e)
+
+def recognizer_cpu_seconds(model, rate, samples):
+    """Tiempo de CPU de un KaldiRecognizer alimentado con 'samples' a 'rate'"""
+    from vosk import KaldiRecognizer
+
+    recognizer = KaldiRecognizer(model, rate)
+    frame_size = int(rate * AUDIO_FRAME_SECONDS)
+    started = time.process_time()
+    for start in range(0, samples.size, frame_size):
+        recognizer.AcceptWaveform(samples[start:start + frame_size].tobytes())
+    recognizer.FinalResult()
+    return time.process_time() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wav', nargs='*', default=[], help="Archivos WAV/FLAC (cualquier tasa)")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duración de las señales sintéticas")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    cases = [(path, *load_audio(path)) for path in args.wav] or [
+        (f"synth_{rate}hz", rate, synth_voice(rate, args.seconds)) for rate in SYNTHETIC_RATES
+    ]
+    model, model_error = load_recognizer_model()
+
+    report = {"output_rate": SPEECH_SAMPLERATE, "cases": {}}
+    failures = []
+    for name, rate, samples in cases:
+        resampler, output, samples_ms = resample_stream(rate, samples)
+        seconds = samples.size / rate
+        expected = resampler.expected_samples(samples.size)
+        # La salida va retrasada como mucho una trama de filtro respecto a la entrada
+        rate_ok = abs(output.size - expected) <= resampler.taps
+        case = {
+            "input_rate": rate,
+            "seconds": round(seconds, 3),
+            "output_samples": int(output.size),
+            "expected_samples": round(expected, 1),
+            "measured_output_rate": round(output.size / seconds, 1),
+            "rate_ok": rate_ok,
+            "resample_ms_per_audio_s": round(sum(samples_ms) / seconds, 3),
+            "frame": summarize(samples_ms),
+        }
+        if name.startswith("synth_"):
+            case["tone_hz_in"] = round(dominant_frequency(samples, rate), 1)
+            case["tone_hz_out"] = round(dominant_frequency(output, SPEECH_SAMPLERATE), 1)
+        if model is not None:
+            native_cpu = recognizer_cpu_seconds(model, rate, samples)
+            resampled_cpu = recognizer_cpu_seconds(model, SPEECH_SAMPLERATE, output)
+            case["recognizer_cpu_s"] = {
+                "native_rate": round(native_cpu, 3),
+                "resampled": round(resampled_cpu, 3),
+                "reduction": round(native_cpu / resampled_cpu, 2) if resampled_cpu > 0 else None,
+            }
+        if not rate_ok:
+            failures.append(name)
+        report["cases"][name] = case
+
+    if model is None:
+        report["recognizer"] = f"no disponible ({model_error})"
+    report["failures"] = failures
+    dump_json(report, args.output)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
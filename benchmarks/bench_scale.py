@@ -0,0 +1,69 @@
+"""
+Mide el efecto de la normalización de escala antes del OCR según el tamaño de la zona:
+tiempo de OCR a resolución nativa frente a normalizada (incluyendo el coste de
+redimensionar) y similitud del texto reconocido con el esperado.
+
+Uso:
+    python -m benchmarks.bench_scale [--repeats N] [--output informe.json]
+"""
+import argparse
+import difflib
+import time
+
+import cv2
+
+from benchmarks.common import SAMPLE_LINES, FONT_PATH, synth_text_image, summarize, dump_json
+from traductorocr.core.ocr_engine import get_ocr_engine
+from traductorocr.core.preprocessing import binarize, normalize_scale
+
+# Tamaños de fuente: desde texto pequeño de HUD hasta subtítulos grandes en 4K
+FONT_SIZES = [9, 12, 18, 24, 36, 56, 80, 120]
+
+def similarity(text: str, expected: str) -> float:
+    """Similitud entre 0 y 1 ignorando espacios repetidos y saltos de línea"""
+    return round(difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(expected.split())).ratio(), 3)
+
+def measure(engine, image, normalize, repeats):
+    """Devuelve tiempos (ms) y el texto reconocido con o sin normalización de escala"""
+    samples = []
+    text = ""
+    for _ in range(repeats):
+        started = time.perf_counter()
+        processed = normalize_scale(image)[0] if normalize else image
+        text = engine.image_to_string(processed)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples, text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    engine = get_ocr_engine()
+    lines = SAMPLE_LINES[:3]
+    expected = "\n".join(lines)
+    results = []
+    for size in FONT_SIZES:
+        frame = synth_text_image(lines, FONT_PATH, size)
+        binary = binarize(cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY), 80, False)
+        engine.image_to_string(binary)  # Calentamiento
+
+        native_samples, native_text = measure(engine, binary, False, args.repeats)
+        scaled_samples, scaled_text = measure(engine, binary, True, args.repeats)
+        native, scaled = summarize(native_samples), summarize(scaled_samples)
+        results.append({
+            "font_size_px": size,
+            "region": f"{binary.shape[1]}x{binary.shape[0]}",
+            "scale": round(normalize_scale(binary)[1], 3),
+            "native_p50_ms": native["p50_ms"],
+            "normalized_p50_ms": scaled["p50_ms"],
+            "saved_ms": round(native["p50_ms"] - scaled["p50_ms"], 3),
+            "native_similarity": similarity(native_text, expected),
+            "normalized_similarity": similarity(scaled_text, expected),
+        })
+
+    dump_json({"engine": type(engine).__name__, "repeats": args.repeats, "regions": results}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Comprueba la caché de bloques de texto (TextBlockDetector) en secuencias de
+fotogramas como las del modo vigilancia: los bloques devueltos deben cubrir
+siempre el texto visible (una línea que aparece, texto sobre una zona vacía...)
+y reutilizarse cuando solo cambia el texto dentro de ellos. Mide además el coste
+de la detección cacheada frente a la completa. Termina con código 1 si algún
+fotograma deja texto fuera de los bloques.
+
+Uso:
+    python -m benchmarks.bench_text_blocks [--repeats 50] [--output informe.json]
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.common import summarize, dump_json
+from traductorocr.core.preprocessing import TextBlockDetector, detect_text_blocks
+
+WIDTH, HEIGHT = 640, 240
+LINE_Y = [40, 90, 140, 190]
+
+def frame(lines):
+    """Fotograma binarizado (texto en blanco) con una línea por (fila, texto)"""
+    image = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    for row, text in lines:
+        cv2.putText(image, text, (30, LINE_Y[row]), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+    return image
+
+SEQUENCES = {
+    "linea_nueva": [
+        [(0, "Welcome back, traveler")],
+        [(0, "Welcome back, traveler")],
+        [(0, "Welcome back, traveler"), (2, "New quest: find the old key")],
+    ],
+    "vacio_a_texto": [
+        [],
+        [],
+        [(1, "The bridge is closed")],
+    ],
+    "texto_en_la_misma_linea": [
+        [(0, "You found 12 gold coins")],
+        [(0, "You found 35 iron bolts")],
+    ],
+    "texto_que_desaparece": [
+        [(0, "Press E to talk"), (3, "Objective updated")],
+        [(0, "Press E to talk")],
+        [(0, "Press E to talk"), (3, "Objective updated")],
+    ],
+}
+
+def uncovered_pixels(binary, boxes):
+    """Píxeles de texto que quedan fuera de todos los bloques"""
+    mask = binary.copy()
+    for x, y, w, h in boxes:
+        mask[y:y + h, x:x + w] = 0
+    return int(np.count_nonzero(mask))
+
+def run_sequence(frames):
+    """Pasa los fotogramas por un detector y devuelve (fallos, recálculos)"""
+    detector = TextBlockDetector()
+    failures = []
+    for index, binary in enumerate(frames):
+        boxes = detector.detect(binary)
+        missing = uncovered_pixels(binary, boxes)
+        if missing:
+            failures.append({"frame": index, "uncovered_px": missing, "boxes": boxes,
+                             "expected": detect_text_blocks(binary)})
+    return failures, detector.recomputed
+
+def time_detection(binary, repeats):
+    """Tiempos (ms) de la detección completa y de la cacheada"""
+    full, cached = [], []
+    detector = TextBlockDetector()
+    detector.detect(binary)
+    for _ in range(repeats):
+        started = time.perf_counter()
+        detect_text_blocks(binary)
+        full.append((time.perf_counter() - started) * 1000.0)
+        started = time.perf_counter()
+        detector.detect(binary)
+        cached.append((time.perf_counter() - started) * 1000.0)
+    return full, cached
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--output', help="Archivo JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    report = {"sequences": {}}
+    failed = []
+    for name, sequence in SEQUENCES.items():
+        failures, recomputed = run_sequence([frame(lines) for lines in sequence])
+        report["sequences"][name] = {"frames": len(sequence), "recomputed": recomputed, "failures": failures}
+        if failures:
+            failed.append(name)
+
+    full, cached = time_detection(frame([(0, "Welcome back, traveler"), (2, "New quest")]), args.repeats)
+    report["detect_ms"] = {"full": summarize(full), "cached": summarize(cached)}
+    report["failed"] = failed
+    dump_json(report, args.output)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Utilidades compartidas por los benchmarks: imágenes sintéticas, fixtures y estadísticas
+"""
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+SAMPLE_LINES = [
+    "Press A to continue",
+    "You found a rusty key.",
+    "The gate will not open without the seal.",
+    "Quest updated: Speak to the blacksmith",
+    "Are you sure you want to leave?",
+]
+
+FONT_PATH = os.path.join('resources', 'pearl.ttf')
+
+def synth_text_image(lines: Sequence[str], font_path: Optional[str] = None,
+                     font_size: int = 24, foreground: int = 230, background: int = 20,
+                     noise: float = 0.0, padding: int = 12, seed: int = 0) -> np.ndarray:
+    """
+    Genera una captura sintética de texto en formato BGRA (como devuelve mss).
+
+    Args:
+        lines: Líneas de texto a dibujar
+        font_path: Fuente TrueType (None = fuente por defecto de PIL)
+        font_size: Tamaño de la fuente en píxeles
+        foreground: Nivel de gris del texto
+        background: Nivel de gris del fondo
+        noise: Desviación estándar del ruido gaussiano añadido
+        padding: Margen alrededor del texto
+        seed: Semilla del generador de ruido
+    """
+    try:
+        font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default(font_size)
+    except (OSError, TypeError):
+        font = ImageFont.load_default()
+
+    line_height = int(font_size * 1.4)
+    width = max(int(font.getlength(line)) for line in lines) + 2 * padding
+    height = line_height * len(lines) + 2 * padding
+
+    image = Image.new('L', (width, height), color=background)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((padding, padding + i * line_height), line, fill=foreground, font=font)
+
+    gray = np.asarray(image, dtype=np.float32)
+    if noise > 0:
+        rng = np.random.default_rng(seed)
+        gray = gray + rng.normal(0, noise, gray.shape)
+    gray = np.clip(gray, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGRA)
+
+def load_fixture_images(directory: str) -> List[Tuple[str, np.ndarray]]:
+    """Carga las capturas reales de un directorio (PNG/JPG) en formato BGRA"""
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')):
+            continue
+        image = cv2.imread(os.path.join(directory, name), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            continue
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+        elif image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        images.append((name, image))
+    return images
+
+def summarize(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """Calcula p50/p95/p99, media y rendimiento a partir de tiempos en milisegundos"""
+    if not samples_ms:
+        return {"count": 0}
+    values = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    total_s = values.sum() / 1000.0
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "throughput_per_s": round(values.size / total_s, 2) if total_s > 0 else None,
+    }
+
+def dump_json(report: dict, output: Optional[str] = None) -> None:
+    """Imprime el informe en JSON y opcionalmente lo guarda en un archivo"""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
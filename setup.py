@@ -18,7 +18,8 @@ setup(
         "numpy>=2.2.6",
         "opencv-python>=4.12.0.88",
         "pillow>=12.0.0",
-        "pytesseract>=0.3.13"
+        "pytesseract>=0.3.13",
+        "requests>=2.32.5"
     ],
     python_requires=">=3.8",
     include_package_data=True,
@@ -1,25 +1,33 @@
 
+import argparse
+import json
+import logging
+import multiprocessing
 import os
 import sys
-import tkinter as tk
-import ttkbootstrap as ttk 
-import pytesseract
+import time
 
-from traductorocr.ui.design import TranslatorUI
-from traductorocr.core.translator import TranslatorLogic
+from traductorocr.core.translation_cache import get_translation_cache, current_translation_cache
+from traductorocr.core.scheduler import current_scheduler
+from traductorocr.core.batch_translator import current_batch_translator
 from traductorocr.core.config import *
 from traductorocr.utils.paths import resource_path
+from traductorocr.utils import profiling
 
-def setup_environment() -> str:
-
-    from traductorocr.utils.voice_models import download_vosk_model
-    download_vosk_model()
+logger = logging.getLogger(__name__)
 
+def configure_tesseract() -> None:
+    """En el ejecutable, usa el Tesseract incluido"""
     if getattr(sys, 'frozen', False):
+        import pytesseract
         tesseract_path = resource_path('Tesseract-OCR')
         pytesseract.pytesseract.tesseract_cmd = os.path.join(tesseract_path, 'tesseract.exe')
         os.environ['TESSDATA_PREFIX'] = os.path.join(tesseract_path, 'tessdata')
-        
+
+def setup_environment() -> str:
+    # El modelo de voz se verifica (o descarga) en segundo plano: ver SpeechModelLoader.provision()
+    configure_tesseract()
+    if getattr(sys, 'frozen', False):
         font_path = resource_path(os.path.join('resources', FONT_FILENAME))
         if not os.path.exists(font_path):
             messagebox.showerror("Error", f"No se encontró el archivo de fuente: {FONT_FILENAME}")
@@ -32,7 +40,74 @@ def setup_environment() -> str:
     
     return font_path
 
-def main() -> None:
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="traductorocr", description="Traductor OCR en tiempo real para juegos")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Mide los tiempos por etapa (equivale a {profiling.PROFILE_ENV}=1)")
+    parser.add_argument('--profile-output', metavar='ARCHIVO',
+                        help="Ejecuta el perfilador por muestreo y guarda el perfil al salir "
+                             "(.json = speedscope, otro = pilas colapsadas)")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMANDO')
+
+    ocr = subparsers.add_parser('ocr', help="OCR y traducción por lotes de un directorio de imágenes (sin interfaz)")
+    ocr.add_argument('--images', required=True, metavar='DIR', help="Directorio con las capturas")
+    ocr.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                     help="Procesos de OCR en paralelo (por defecto, uno por núcleo)")
+    ocr.add_argument('--recursive', '-r', action='store_true', help="Incluir subdirectorios")
+    ocr.add_argument('--output', '-o', metavar='ARCHIVO',
+                     help="Archivo JSON lines de salida (por defecto, la salida estándar)")
+    ocr.add_argument('--threshold', type=int,
+                     help="Umbral manual (0-255); sin él se usa el umbral automático")
+    ocr.add_argument('--invert', action='store_true', help="Texto oscuro sobre fondo claro (con --threshold)")
+    ocr.add_argument('--engine', choices=OCR_ENGINES, default=OCR_ENGINE,
+                     help="Motor de OCR (tesseract: rápido; easyocr: fuentes estilizadas)")
+    ocr.add_argument('--no-translate', action='store_true', help="Solo OCR, sin traducir")
+    ocr.add_argument('--target', default=TARGET_LANGUAGE, help="Idioma de destino")
+    return parser.parse_args(argv)
+
+def run_ocr_command(args: argparse.Namespace) -> int:
+    """Ejecuta el modo por lotes: una línea JSON por imagen"""
+    from traductorocr.core.batch_ocr import OcrSettings, find_images, ocr_images
+
+    configure_tesseract()
+    paths = find_images(args.images, args.recursive)
+    if not paths:
+        print(f"No se encontraron imágenes en {args.images}", file=sys.stderr)
+        return 1
+
+    if args.threshold is None:
+        settings = OcrSettings(auto=True, engine=args.engine)
+    else:
+        settings = OcrSettings(threshold=args.threshold, invert=args.invert, auto=False, engine=args.engine)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    started = time.perf_counter()
+    errors = 0
+    try:
+        for record in ocr_images(paths, max(1, args.jobs), settings,
+                                 translate=not args.no_translate, target=args.target):
+            errors += 'error' in record
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(paths)} imágenes en {elapsed:.1f} s ({len(paths) / elapsed:.2f} img/s, "
+          f"{errors} errores, {args.jobs} procesos)", file=sys.stderr)
+    if not args.no_translate:
+        cache = get_translation_cache()
+        print(f"Caché de traducciones: {cache.stats()}", file=sys.stderr)
+        cache.close()
+    return 0 if errors < len(paths) else 1
+
+def run_gui() -> None:
+    """Abre la interfaz gráfica"""
+    import ttkbootstrap as ttk
+    from traductorocr.ui.design import TranslatorUI
+    from traductorocr.core.translator import TranslatorLogic
+
     font_path = setup_environment()
     
     root = ttk.Window(themename="litera") 
@@ -43,6 +118,35 @@ def main() -> None:
     ui = TranslatorUI(root, font_path)
     TranslatorLogic(ui)
     root.mainloop()
+    
+    from traductorocr.core.speech_model import shutdown_speech_workers
+    shutdown_speech_workers()
+    log_session_metrics()
+
+def log_session_metrics() -> None:
+    """Registra las métricas de los componentes que llegaron a crearse (sin crear los demás)"""
+    cache = current_translation_cache()
+    if cache is not None:
+        logger.info("Caché de traducciones: %s", cache.stats())
+        cache.close()
+    scheduler = current_scheduler()
+    if scheduler is not None:
+        logger.info("Planificador de tareas: %s", scheduler.metrics())
+    batcher = current_batch_translator()
+    if batcher is not None:
+        logger.info("Lotes de traducción: %s", batcher.metrics())
+
+def main(argv=None) -> None:
+    # Los procesos de OCR por lotes y de reconocimiento de voz arrancan con 'spawn' (también en el ejecutable)
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_args(argv)
+    if args.profile or args.profile_output:
+        profiling.enable(args.profile_output)
+
+    if args.command == 'ocr':
+        sys.exit(run_ocr_command(args))
+    run_gui()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,124 @@
+"""
+Búfer circular de audio int16 mono preasignado: el callback de PortAudio escribe
+en él sin reservar memoria y el hilo de reconocimiento lee tramas de tamaño fijo
+"""
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+class AudioRingBuffer:
+    def __init__(self, capacity: int, frame_size: int, max_block: int = 8192):
+        """
+        Un solo escritor (callback de audio) y un solo lector (hilo de Vosk). Las
+        posiciones son contadores de muestras que solo crecen: el escritor solo
+        modifica la de escritura y el lector la de lectura, así que no hace falta
+        un candado. Si el lector no da abasto, se descartan los bloques nuevos
+        (desbordamiento) en lugar de bloquear el callback.
+
+        Args:
+            capacity: Muestras mono que caben en el búfer
+            frame_size: Muestras de cada trama que devuelve read()
+            max_block: Tamaño máximo de bloque del callback (para el área de mezcla)
+        """
+        if frame_size > capacity:
+            raise ValueError("La trama no cabe en el búfer")
+        self.capacity = capacity
+        self.frame_size = frame_size
+        self._ring = np.zeros(capacity, dtype=np.int16)
+        self._frame = np.zeros(frame_size, dtype=np.int16)
+        self._mix = np.zeros(max_block, dtype=np.int32)
+        self._write_pos = 0
+        self._read_pos = 0
+        self._data_ready = threading.Event()
+
+        self.overruns = 0           # Bloques descartados por falta de espacio
+        self.dropped_samples = 0
+        self.underruns = 0          # Lecturas que agotaron la espera sin una trama completa
+        self.status_errors = 0      # Avisos de PortAudio (input overflow...)
+
+    @property
+    def available(self) -> int:
+        """Muestras pendientes de leer"""
+        return self._write_pos - self._read_pos
+
+    def write(self, block: np.ndarray) -> bool:
+        """
+        Copia un bloque (muestras x canales, int16) mezclándolo a mono in situ.
+        Pensado para el callback de audio: no reserva memoria. Devuelve False si
+        se descartó por falta de espacio.
+        """
+        frames = block.shape[0]
+        if frames > self.capacity - self.available:
+            self.overruns += 1
+            self.dropped_samples += frames
+            return False
+
+        if block.ndim == 1 or block.shape[1] == 1:
+            mono = block.reshape(frames)
+        else:
+            if frames > self._mix.shape[0]:
+                self._mix = np.zeros(frames, dtype=np.int32)  # Solo si el driver cambia de bloque
+            mono = self._mix[:frames]
+            np.sum(block, axis=1, dtype=np.int32, out=mono)
+            np.floor_divide(mono, block.shape[1], out=mono)
+
+        start = self._write_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        np.copyto(self._ring[start:start + first], mono[:first], casting='unsafe')
+        if first < frames:
+            np.copyto(self._ring[:frames - first], mono[first:], casting='unsafe')
+        self._write_pos += frames
+        if self.available >= self.frame_size:
+            self._data_ready.set()
+        return True
+
+    def read(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Devuelve la siguiente trama de 'frame_size' muestras o None si no llega a
+        tiempo. El array se reutiliza en la siguiente lectura: copiarlo (o
+        convertirlo a bytes) si se necesita conservarlo.
+        """
+        if self.available < self.frame_size:
+            self._data_ready.clear()
+            # Volver a comprobar: el escritor pudo completar la trama antes del clear()
+            if self.available < self.frame_size and not self._data_ready.wait(timeout):
+                self.underruns += 1
+                return None
+
+        start = self._read_pos % self.capacity
+        first = min(self.frame_size, self.capacity - start)
+        self._frame[:first] = self._ring[start:start + first]
+        if first < self.frame_size:
+            self._frame[first:] = self._ring[:self.frame_size - first]
+        self._read_pos += self.frame_size
+        return self._frame
+
+    def drain(self) -> Optional[np.ndarray]:
+        """Devuelve (sin esperar) las muestras pendientes que no completan una trama"""
+        remaining = self.available
+        if remaining <= 0:
+            return None
+        start = self._read_pos % self.capacity
+        out = np.empty(remaining, dtype=np.int16)
+        first = min(remaining, self.capacity - start)
+        out[:first] = self._ring[start:start + first]
+        if first < remaining:
+            out[first:] = self._ring[:remaining - first]
+        self._read_pos += remaining
+        return out
+
+    def reset(self) -> None:
+        """Vacía el búfer y pone a cero los contadores (solo con la captura detenida)"""
+        self._write_pos = self._read_pos = 0
+        self._data_ready.clear()
+        self.overruns = self.dropped_samples = self.underruns = self.status_errors = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "overruns": self.overruns,
+            "dropped_samples": self.dropped_samples,
+            "underruns": self.underruns,
+            "status_errors": self.status_errors,
+            "buffered_samples": self.available,
+        }
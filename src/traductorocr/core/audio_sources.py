@@ -0,0 +1,78 @@
+"""
+Fuentes de audio alternativas al micrófono: reproducción de archivos WAV/FLAC
+por el mismo camino captura -> Vosk -> traducción (pruebas y benchmarks sin
+hardware de audio)
+"""
+import os
+import time
+import wave
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from traductorocr.core.audio_buffer import AudioRingBuffer
+
+def read_audio_file(path: str) -> Tuple[int, np.ndarray]:
+    """
+    Lee un archivo de audio y devuelve (tasa, muestras int16 de forma muestras x canales).
+    Los WAV de 16 bits se leen con la biblioteca estándar; FLAC y el resto de
+    formatos necesitan 'soundfile'.
+    """
+    if path.lower().endswith('.wav'):
+        with wave.open(path, 'rb') as f:
+            if f.getsampwidth() == 2:
+                channels = f.getnchannels()
+                samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+                return f.getframerate(), samples.reshape(-1, channels)
+    try:
+        import soundfile
+    except ImportError:
+        raise RuntimeError(f"Para leer {os.path.basename(path)} hace falta 'soundfile' (pip install soundfile)")
+    samples, rate = soundfile.read(path, dtype='int16', always_2d=True)
+    return rate, samples
+
+class FileAudioSource:
+    def __init__(self, path: str, realtime: bool = True, blocksize: int = 2048):
+        """
+        Reproduce un archivo llamando al mismo callback que sd.InputStream.
+
+        Args:
+            path: Archivo WAV o FLAC
+            realtime: True = al ritmo real del audio; False = lo más rápido posible
+                (esperando a que el búfer de captura tenga sitio, sin perder bloques)
+            blocksize: Muestras por bloque entregado al callback
+        """
+        self.path = path
+        self.realtime = realtime
+        self.blocksize = blocksize
+        self.samplerate, self.samples = read_audio_file(path)
+        self.channels = self.samples.shape[1]
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def duration(self) -> float:
+        """Duración del archivo en segundos"""
+        return self.samples.shape[0] / self.samplerate
+
+    def run(self, callback: Callable, is_running: Callable[[], bool],
+            buffer: Optional[AudioRingBuffer] = None) -> None:
+        """Entrega el archivo bloque a bloque a 'callback(indata, frames, time, status)'"""
+        started = time.perf_counter()
+        total = self.samples.shape[0]
+        for start in range(0, total, self.blocksize):
+            if not is_running():
+                return
+            block = self.samples[start:start + self.blocksize]
+            if self.realtime:
+                # Como un dispositivo: el bloque está disponible cuando termina de "sonar"
+                delay = started + (start + block.shape[0]) / self.samplerate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            elif buffer is not None:
+                # Contrapresión: el lector marca el ritmo
+                while buffer.capacity - buffer.available < block.shape[0] and is_running():
+                    time.sleep(0.001)
+            callback(block, block.shape[0], None, None)
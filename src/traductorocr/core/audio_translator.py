@@ -1,43 +1,68 @@
 """
 Módulo para la captura y traducción de audio
 """
-import os
-import json
 import threading
-import queue
-import time
-from vosk import Model, KaldiRecognizer
-import sounddevice as sd
 import numpy as np
-from deep_translator import GoogleTranslator
-from typing import Callable, Optional
-from traductorocr.utils.paths import resource_path
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from traductorocr.core.config import (
+    AUDIO_RING_SECONDS,
+    AUDIO_FRAME_SECONDS,
+    AUDIO_MAX_SOURCES,
+    SPEECH_SAMPLERATE,
+    VAD_ENABLED
+)
+from traductorocr.core.audio_buffer import AudioRingBuffer
+from traductorocr.core.audio_sources import FileAudioSource
+from traductorocr.core.resampler import StreamingResampler
+from traductorocr.core.vad import VoiceActivityGate
+from traductorocr.core.subtitle_stream import SubtitleStream
+from traductorocr.core.speech_model import SpeechModelLoader, get_speech_model_loader
+from traductorocr.core.speech_workers import SpeechWorkerError
+from traductorocr.core.translation_cache import get_translation_cache
+from traductorocr.core.scheduler import get_scheduler
+from traductorocr.core.batch_translator import get_batch_translator
+from traductorocr.utils.profiling import stage_timer
+
+if TYPE_CHECKING:
+    import sounddevice as sd
 
 class AudioTranslator:
     
     
-    def _translate_text(self, text: str):
-        """Función helper para traducir y enviar a la UI"""
+    def _translate_text(self, text: str) -> str:
+        """Función helper para traducir (el planificador entrega el resultado a la UI)"""
         try:
-            print(f"Texto reconocido (final): {text}")
-            translation = self.translator.translate(text)
-            # ¡SOLO ENVIAMOS LA TRADUCCIÓN!
-            self.on_translation(translation)
+            print(f"Texto reconocido: {text}")
+            with stage_timer('audio.translate'):
+                return self.translation_cache.translate(
+                    text, 'en', 'es', lambda pending: self.batcher.translate(pending, 'en', 'es')
+                )
         except Exception as e:
             print(f"Error en traducción: {e}")
-            self.on_translation(f"Error al traducir: {e}")
-    
+            return f"Error al traducir: {e}"
+
     
-    def __init__(self, on_translation: Callable[[str], None], on_error: Callable[[str], None]):
+    def __init__(self, on_translation: Callable[[str], None], on_error: Callable[[str], None],
+                 name: str = 'audio', model_loader: Optional[SpeechModelLoader] = None):
         """
         Inicializa el traductor de audio.
         
         Args:
             on_translation: Callback para cuando hay una nueva traducción
             on_error: Callback para cuando ocurre un error
+            name: Nombre de la fuente (y canal del planificador de sus traducciones)
+            model_loader: Cargador del modelo de voz (por defecto, el compartido)
         """
-        self.translator = GoogleTranslator(source='en', target='es')
-        self.audio_queue = queue.Queue()
+        self.name = name
+        self.batcher = get_batch_translator()
+        self.translation_cache = get_translation_cache()
+        self.scheduler = get_scheduler()
+        self.scheduler.add_channel(name, latest_wins=False)
+        self.model_loader = model_loader or get_speech_model_loader()
+        self.recognizer = None  # LocalRecognizer o RemoteRecognizer (proceso de reconocimiento)
+        self.audio_buffer: Optional[AudioRingBuffer] = None  # Se crea al iniciar la captura
+        self.resampler: Optional[StreamingResampler] = None
+        self.vad = VoiceActivityGate() if VAD_ENABLED else None
         self.is_capturing = False
         self.capture_thread = None
         self.translation_thread = None
@@ -45,19 +70,27 @@ class AudioTranslator:
         self.on_error = on_error
         
         # Configuración de audio
-        self.samplerate = 16000
+        self.samplerate = SPEECH_SAMPLERATE  # Tasa del dispositivo (se remuestrea para Vosk)
         self.channels = 1
         self.dtype = np.int16
         self.device = None  # Dispositivo de audio seleccionado
+        self.source: Optional[FileAudioSource] = None  # Archivo a reproducir en lugar del dispositivo
+        self.source_done = threading.Event()      # La fuente se agotó (fin del archivo)
+        self.finished = threading.Event()         # Se procesó todo el audio de la fuente
+        self.is_virtual_device = False
         
-        self.last_partial_text = ""
-        self.last_partial_time = 0
-        self.debounce_time = 0.5  # 500ms de "calma" antes de traducir
-        # --- FIN DE LO AÑADIDO ---
+        # Subtítulos incrementales: solo se traduce el trozo estable nuevo de cada parcial
+        self.subtitles = SubtitleStream(self._translate_text, on_translation, self.scheduler, name)
+
+    @property
+    def is_configured(self) -> bool:
+        """Hay un dispositivo o un archivo del que capturar"""
+        return self.device is not None or self.source is not None
         
     def get_audio_devices(self):
         """Obtiene la lista de dispositivos de audio disponibles"""
         try:
+            import sounddevice as sd
             hostapis = sd.query_hostapis()
             devices = sd.query_devices()
             input_devices = []
@@ -104,9 +137,12 @@ class AudioTranslator:
     def set_audio_device(self, device_id: int) -> None:
         """Establece el dispositivo de audio a usar"""
         try:
+            # sounddevice (PortAudio) solo se carga con un dispositivo real: la reproducción de archivos no lo necesita
+            import sounddevice as sd
             # Obtener información del dispositivo
             device_info = sd.query_devices(device_id)
             self.device = device_id
+            self.source = None
             
             # Determinar configuración basada en el dispositivo
             device_name = device_info['name'].lower()
@@ -128,16 +164,8 @@ class AudioTranslator:
                 
             print(f"Dispositivo configurado: {device_info['name']} @ {self.samplerate}Hz")
             
-            # Cargar el modelo de reconocimiento de voz
-            model_path = resource_path('vosk-model-small-en-us')
-            if not os.path.exists(model_path):
-                self.on_error("Modelo de voz no encontrado")
-                return
-            
-            # Inicializar el modelo solo si no existe o si cambió la tasa de muestreo
-            if not hasattr(self, 'model') or not hasattr(self, 'recognizer'):
-                self.model = Model(model_path)
-                self.recognizer = KaldiRecognizer(self.model, self.samplerate)
+            # Cargar y calentar el modelo en segundo plano (no bloquea la interfaz)
+            self.model_loader.load()
             
             # Probar el dispositivo
             test_duration = 0.1  # 100ms de prueba
@@ -155,11 +183,44 @@ class AudioTranslator:
             self.on_error(f"Error al configurar dispositivo de audio: {str(e)}")
             self.device = None
         
+    def set_replay_file(self, path: str, realtime: bool = True) -> None:
+        """
+        Usa un archivo WAV/FLAC como fuente en lugar del dispositivo, por el mismo
+        camino búfer -> remuestreo -> detector de voz -> Vosk -> traducción.
+        Con realtime=False se procesa lo más rápido posible; 'finished' se activa
+        al terminar.
+        """
+        self.source = FileAudioSource(path, realtime=realtime)
+        self.samplerate = self.source.samplerate
+        self.channels = self.source.channels
+        self.is_virtual_device = False
+        print(f"Reproduciendo {self.source.name} @ {self.samplerate}Hz ({self.source.duration:.1f} s)")
+        self.model_loader.load()
+
     def start_capture(self) -> None:
-        """Inicia la captura de audio"""
+        """Inicia la captura de audio (el modelo de voz debe estar listo)"""
         if self.is_capturing:
             return
-            
+        if not self.model_loader.ready.is_set():
+            raise RuntimeError("El modelo de voz aún se está cargando")
+        # Una captura anterior terminada por error (o fin de archivo) aún puede tener su reconocedor
+        self.stop_capture()
+        
+        # El reconocedor trabaja siempre a SPEECH_SAMPLERATE: el audio del dispositivo
+        # (44.1/48 kHz) se remuestrea antes de entregárselo. Sus resultados pueden
+        # llegar desde otro hilo (proceso de reconocimiento)
+        self.recognizer = self.model_loader.open_recognizer(self.subtitles.update, self._finish_utterance)
+        self.resampler = StreamingResampler(self.samplerate, SPEECH_SAMPLERATE)
+        if self.vad is not None:
+            self.vad.reset()
+        # Búfer preasignado para la tasa del dispositivo: el callback no reserva memoria
+        self.audio_buffer = AudioRingBuffer(
+            capacity=int(self.samplerate * AUDIO_RING_SECONDS),
+            frame_size=int(self.samplerate * AUDIO_FRAME_SECONDS),
+            max_block=self._blocksize()
+        )
+        self.source_done.clear()
+        self.finished.clear()
         self.is_capturing = True
         self.capture_thread = threading.Thread(target=self._capture_audio)
         self.translation_thread = threading.Thread(target=self._process_audio)
@@ -169,20 +230,49 @@ class AudioTranslator:
         self.translation_thread.start()
         
     def stop_capture(self) -> None:
-        """Detiene la captura de audio"""
+        """
+        Detiene la captura de audio y libera el reconocedor. Se puede llamar
+        aunque la captura ya haya terminado sola (por un error o al acabar el
+        archivo) o nunca se haya iniciado.
+        """
         self.is_capturing = False
         if self.capture_thread:
             self.capture_thread.join()
+            self.capture_thread = None
         if self.translation_thread:
             self.translation_thread.join()
+            self.translation_thread = None
+        if self.recognizer is None:
+            return  # Ya detenida
+        print(f"Reconocedor de {self.name}: {self.recognizer.stats()}")
+        self.recognizer.close()
+        self.recognizer = None
+        if self.audio_buffer is not None:
+            print(f"Estadísticas del búfer de audio: {self.buffer_stats()}")
+        if self.vad is not None:
+            print(f"Detector de voz: {self.vad.stats()}")
+        print(f"Subtítulos: {self.subtitles.stats()}")
+
+    def buffer_stats(self) -> Dict[str, int]:
+        """Desbordamientos y vacíos del búfer de audio de la última captura"""
+        return self.audio_buffer.stats() if self.audio_buffer is not None else {}
+
+    def _blocksize(self) -> int:
+        if self.source is not None:
+            return self.source.blocksize
+        return 4096 if self.channels == 2 else 2048  # Buffer más grande para audio estéreo
             
     def _capture_audio(self) -> None:
         """Captura el audio del sistema"""
+        if self.source is not None:
+            self._replay_source()
+            return
         if self.device is None:
             self.on_error("No hay dispositivo de audio seleccionado")
             return
             
         try:
+            import sounddevice as sd
             device_info = sd.query_devices(self.device)
             print(f"Iniciando captura de audio desde: {device_info['name']}")
             
@@ -191,7 +281,7 @@ class AudioTranslator:
                 'channels': self.channels,
                 'samplerate': self.samplerate,
                 'dtype': self.dtype,
-                'blocksize': 4096 if self.channels == 2 else 2048,  # Buffer más grande para audio estéreo
+                'blocksize': self._blocksize(),
                 'callback': self._audio_callback
             }
             
@@ -211,124 +301,135 @@ class AudioTranslator:
             self.on_error(f"Error en captura de audio: {str(e)}")
             self.is_capturing = False
             
+    def _replay_source(self) -> None:
+        """Entrega el archivo al callback como si fuera el dispositivo"""
+        try:
+            self.source.run(self._audio_callback, lambda: self.is_capturing, self.audio_buffer)
+        except Exception as e:
+            print(f"Error reproduciendo {self.source.name}: {e}")
+            self.on_error(f"Error reproduciendo {self.source.name}: {str(e)}")
+        finally:
+            self.source_done.set()
+
     def _audio_callback(self, indata: np.ndarray, frames: int, 
-                        time: Optional[dict], status: Optional[sd.CallbackFlags]) -> None:
+                        time: Optional[dict], status: Optional["sd.CallbackFlags"]) -> None:
         """Callback para procesar el audio capturado"""
+        with stage_timer('audio.callback'):
+            self._handle_audio_block(indata, status)
+
+    def _handle_audio_block(self, indata: np.ndarray, status: Optional["sd.CallbackFlags"]) -> None:
+        """Mezcla el bloque a mono dentro del búfer circular (sin reservar memoria ni bloquear)"""
         if status:
-            print(f"Error de estado en callback: {status}")
-            return
-        
-        try:
-            if indata is not None and np.any(indata):
-                # (Tu lógica de depuración de audio crudo)
-                audio_level = np.max(np.abs(indata))
-                if audio_level > 500:
-                    print(f"Nivel de audio crudo detectado: {audio_level}")
-                
-                processed_data = indata
-                
-                # Convertir a mono SI ES ESTÉREO
-                if processed_data.shape[1] == 2:
-                    # Convertir a float, promediar, y volver a int16
-                    processed_data_float = processed_data.astype(np.float32)
-                    mono_float = np.mean(processed_data_float, axis=1)
-                    processed_data = mono_float.astype(np.int16)
-                
-                # Aplanar el array
-                processed_data = processed_data.flatten()
-                
-                # Pre-procesar audio (si es virtual)
-                if hasattr(self, 'is_virtual_device') and self.is_virtual_device:
-                    processed_data = self._preprocess_virtual_audio(processed_data)
-                
-                # Poner BYTES en la cola para procesamiento
-                self.audio_queue.put(processed_data.tobytes())
-        except Exception as e:
-            print(f"Error en callback de audio: {e}")
+            # Un aviso de PortAudio (p. ej. input overflow) no invalida el bloque
+            self.audio_buffer.status_errors += 1
+        self.audio_buffer.write(indata)
             
-    def _preprocess_virtual_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Pre-procesa el audio de dispositivos virtuales (ahora en int16)"""
-        try:
-            # Aplicar un umbral de ruido (ej: ~1% del max int16)
-            noise_threshold = 327
-            audio_data[np.abs(audio_data) < noise_threshold] = 0
-            return audio_data
-        except Exception as e:
-            print(f"Error en pre-procesamiento de audio: {e}")
-            return audio_data
-        
     def _process_audio(self) -> None:
-        """Procesa y traduce el audio capturado en tiempo real con 'debounce'"""
+        """Procesa y traduce el audio capturado en tiempo real (subtítulos incrementales)"""
         
         while self.is_capturing:
             try:
-                # 1. Obtener bytes de audio de la cola
-                audio_bytes = self.audio_queue.get(timeout=0.1) # Timeout corto
-                
-                # 2. Alimentar el trozo a Vosk
-                if self.recognizer.AcceptWaveform(audio_bytes):
-                    # A. Vosk detectó un resultado FINAL (una pausa larga)
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get('text', '').strip()
-                    if text:
-                        # Es un resultado final, traducir de inmediato
-                        self._translate_text(text)
-                    self.last_partial_text = "" # Limpiar el borrador
+                # 1. Leer una trama del búfer circular (timeout corto)
+                frame = self.audio_buffer.read(timeout=0.1)
+                if frame is not None:
+                    self._process_frame(frame)
+                elif self.source_done.is_set():
+                    # Fin del archivo: procesar lo que queda y cerrar la última frase
+                    remainder = self.audio_buffer.drain()
+                    if remainder is not None:
+                        self._process_frame(remainder)
+                    self.recognizer.finish(wait=True)
+                    self.is_capturing = False
                 else:
-                    # B. Vosk tiene un resultado PARCIAL (borrador)
-                    partial_result = json.loads(self.recognizer.PartialResult())
-                    partial_text = partial_result.get('partial', '').strip()
-                    
-                    if partial_text and partial_text != self.last_partial_text:
-                        # El texto parcial ha cambiado. Actualizarlo y registrar la hora.
-                        self.last_partial_text = partial_text
-                        self.last_partial_time = time.time()
-            
-            except queue.Empty:
-                # La cola está vacía (pausa corta o silencio).
-                # Este es el lugar perfecto para comprobar nuestro "debounce".
-                current_time = time.time()
-                if (self.last_partial_text and 
-                    (current_time - self.last_partial_time > self.debounce_time)):
-                    
-                    # Ha pasado 0.5s sin cambios. Traducir este "borrador estable".
-                    text_to_translate = self.last_partial_text
-                    
-                    # ¡Importante! Reiniciar el texto parcial para no volver a traducirlo
-                    self.last_partial_text = "" # Marcar como "traducido"
-                    
-                    # Llamar a la traducción EN UN HILO NUEVO
-                    # para no bloquear este bucle de procesamiento de audio.
-                    threading.Thread(target=self._translate_text, args=(text_to_translate,), daemon=True).start()
-                else:
-                    # No hay nada que hacer, solo es silencio.
-                    pass
-            
+                    self.subtitles.tick()
+
+            except SpeechWorkerError as e:
+                print(f"Error en el reconocimiento de voz: {e}")
+                self.on_error(f"Error en el reconocimiento de voz: {str(e)}")
+                self.is_capturing = False
             except Exception as e:
                 print(f"Error en procesamiento de audio: {e}")
                 import traceback
                 print(traceback.format_exc())
-                self.last_partial_text = "" # Reset en caso de error
-            
-        #finally:
-            # Al detener la captura, procesar lo que quede
-            #if not self.is_capturing:
-              #  final_result = json.loads(self.recognizer.FinalResult())
-               # text = final_result.get('text', '').strip()
-               # if text:
-                #    self._translate_text(text)
-                
-    def _recognize_speech(self, audio_data: np.ndarray) -> Optional[str]:
-        """Convierte el audio en texto usando reconocimiento de voz de Vosk"""
-        try:
-            # Convertir el audio a formato correcto para Vosk
-            audio_data = (audio_data * 32768).astype('int16')
-            
-            if self.recognizer.AcceptWaveform(audio_data.tobytes()):
-                result = json.loads(self.recognizer.Result())
-                if result.get('text'):
-                    return result['text']
-            return None
-        except Exception as e:
-            self.on_error(f"Error en reconocimiento de voz: {str(e)}")
-            return None
\ No newline at end of file
+        self.finished.set()
+
+    def _process_frame(self, frame: np.ndarray) -> None:
+        # 2. Remuestrear a la tasa del reconocedor
+        with stage_timer('audio.resample'):
+            speech = self.resampler.process(frame)
+        
+        # 3. Saltar el silencio y la música: solo los tramos con voz llegan a Vosk
+        if self.vad is None:
+            self._accept_audio(speech)
+            return
+        with stage_timer('audio.vad'):
+            gate = self.vad.process(speech)
+        if gate.audio is not None:
+            self._accept_audio(gate.audio)
+        if gate.ended:
+            # Vosk ya no verá la pausa: cerrar aquí la frase
+            self.recognizer.finish()
+        elif gate.audio is None:
+            self.subtitles.tick()
+
+    def _accept_audio(self, speech: np.ndarray) -> None:
+        """
+        Alimenta el audio a Vosk: los resultados PARCIALES (borrador) confirman lo
+        que ya es estable y los FINALES (una pausa larga) cierran la frase
+        """
+        with stage_timer('audio.accept_waveform'):
+            self.recognizer.accept(speech)
+
+    def _finish_utterance(self, text: str) -> None:
+        """Resultado final: traducir lo que quede sin confirmar (sin bloquear este bucle)"""
+        self.subtitles.finish(text)
+
+class AudioSourceGroup:
+    def __init__(self, on_translation: Callable[[int, str], None], on_error: Callable[[int, str], None],
+                 max_sources: int = AUDIO_MAX_SOURCES, model_loader: Optional[SpeechModelLoader] = None):
+        """
+        Varias fuentes de audio simultáneas (p. ej. el audio del juego y el chat
+        de voz), cada una con su captura, su reconocedor y sus subtítulos. Los
+        reconocedores se reparten entre los procesos de reconocimiento (uno por fuente).
+
+        Args:
+            on_translation: Callback (índice de la fuente, subtítulo)
+            on_error: Callback (índice de la fuente, error)
+            max_sources: Número máximo de fuentes
+            model_loader: Cargador del modelo de voz (por defecto, el compartido)
+        """
+        self.on_translation = on_translation
+        self.on_error = on_error
+        self.max_sources = max_sources
+        self.model_loader = model_loader
+        self.sources: Dict[int, AudioTranslator] = {}
+
+    def source(self, index: int) -> AudioTranslator:
+        """Devuelve la fuente 'index' (se crea en el primer uso)"""
+        if index not in self.sources:
+            if not 0 <= index < self.max_sources:
+                raise ValueError(f"Solo se admiten {self.max_sources} fuentes de audio")
+            # La primera fuente conserva el canal 'audio' del planificador
+            self.sources[index] = AudioTranslator(
+                on_translation=lambda text, index=index: self.on_translation(index, text),
+                on_error=lambda error, index=index: self.on_error(index, error),
+                name='audio' if index == 0 else f'audio{index + 1}',
+                model_loader=self.model_loader
+            )
+        return self.sources[index]
+
+    @property
+    def is_capturing(self) -> bool:
+        return any(source.is_capturing for source in self.sources.values())
+
+    def start_all(self) -> int:
+        """Inicia la captura de las fuentes configuradas y devuelve cuántas capturan"""
+        for source in self.sources.values():
+            if source.is_configured:
+                source.start_capture()
+        return sum(source.is_capturing for source in self.sources.values())
+
+    def stop_all(self) -> None:
+        """Detiene todas las fuentes y libera sus reconocedores (también las que se pararon solas)"""
+        for source in self.sources.values():
+            source.stop_capture()
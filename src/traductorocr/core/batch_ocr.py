@@ -0,0 +1,131 @@
+"""
+OCR por lotes de archivos de imagen (p. ej. volcados de capturas de un juego)
+repartido en un pool de procesos, con traducción agrupada en el proceso principal
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import cv2
+
+from traductorocr.core.config import (
+    THRESHOLD_VALUE,
+    OCR_AUTO_THRESHOLD,
+    OCR_ENGINE,
+    TARGET_LANGUAGE,
+    TRANSLATION_POOL_SIZE
+)
+from traductorocr.core.pipeline import recognize, translate_texts
+from traductorocr.core.regions import OcrRegion
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp', '.tif', '.tiff')
+
+class OcrSettings(NamedTuple):
+    threshold: int = THRESHOLD_VALUE
+    invert: bool = False
+    auto: bool = OCR_AUTO_THRESHOLD
+    engine: str = OCR_ENGINE
+
+def find_images(directory: str, recursive: bool = False) -> List[str]:
+    """Lista las imágenes del directorio en orden alfabético"""
+    paths = []
+    if recursive:
+        for root, _, files in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in files)
+    else:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(path for path in paths if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path))
+
+_worker_settings = OcrSettings()
+
+def _use_settings(settings: OcrSettings) -> None:
+    global _worker_settings
+    _worker_settings = settings
+
+def _init_worker(settings: OcrSettings) -> None:
+    """
+    Inicializa cada proceso del pool: un hilo por proceso para no sobresuscribir
+    los núcleos. Solo en los procesos del pool; el proceso que llama conserva su
+    configuración de hilos.
+    """
+    _use_settings(settings)
+    os.environ['OMP_THREAD_LIMIT'] = '1'  # Tesseract (antes de crear el motor)
+    cv2.setNumThreads(1)
+
+def ocr_file(path: str, settings: Optional[OcrSettings] = None) -> Dict:
+    """Hace OCR de un archivo y devuelve un registro serializable en JSON"""
+    settings = settings or _worker_settings
+    started = time.perf_counter()
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is None:
+        return {"image": path, "error": "No se pudo leer la imagen"}
+    try:
+        region = OcrRegion(os.path.basename(path), (0, 0, image.shape[1], image.shape[0]), *settings)
+        lines = recognize(image, region)
+    except Exception as e:
+        return {"image": path, "error": str(e)}
+    return {
+        "image": path,
+        "width": image.shape[1],
+        "height": image.shape[0],
+        "lines": [line._asdict() for line in lines],
+        "ocr_ms": round((time.perf_counter() - started) * 1000.0, 3),
+    }
+
+def translate_record(record: Dict, source: str = 'en', target: str = TARGET_LANGUAGE) -> Dict:
+    """Añade la traducción de cada línea al registro (todas las líneas en un lote)"""
+    lines = record.get("lines")
+    if not lines:
+        return record
+    try:
+        translations = translate_texts([line["text"] for line in lines], source, target)
+    except Exception as e:
+        record["translation_error"] = str(e)
+        return record
+    for line, translation in zip(lines, translations):
+        line["translation"] = translation
+    return record
+
+def _completed(record: Dict) -> Future:
+    future: Future = Future()
+    future.set_result(record)
+    return future
+
+def ocr_images(paths: Sequence[str], jobs: int = 1, settings: OcrSettings = OcrSettings(),
+               translate: bool = True, source: str = 'en', target: str = TARGET_LANGUAGE) -> Iterator[Dict]:
+    """
+    Procesa las imágenes en 'jobs' procesos (el OCR es CPU) y traduce en el proceso
+    principal (es E/S: varias imágenes comparten caché y lotes de traducción).
+    Devuelve los registros en el mismo orden que 'paths'.
+    """
+    translator = ThreadPoolExecutor(max_workers=TRANSLATION_POOL_SIZE, thread_name_prefix="batch-ocr") \
+        if translate else None
+    pending: deque = deque()
+
+    def collect(record: Dict) -> Future:
+        return translator.submit(translate_record, record, source, target) if translator else _completed(record)
+
+    try:
+        if jobs <= 1:
+            _use_settings(settings)
+            records = (ocr_file(path, settings) for path in paths)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(settings,))
+            records = pool.map(ocr_file, paths, chunksize=1)
+
+        try:
+            for record in records:
+                pending.append(collect(record))
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    finally:
+        if translator is not None:
+            translator.shutdown(wait=False)
@@ -0,0 +1,174 @@
+"""
+Agrupación de traducciones: junta los textos que llegan en una ventana corta y
+los envía en una sola petición al traductor
+"""
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from traductorocr.core.config import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_MAX_CHARS
+
+# Separador entre segmentos: una línea con un marcador que el traductor no modifica
+SEGMENT_DELIMITER = "\n|||\n"
+_DELIMITER_RE = re.compile(r'\s*\|\s*\|\s*\|\s*')
+
+TranslateMany = Callable[[List[str], str, str], List[str]]
+
+def pack_segments(texts: Sequence[str]) -> str:
+    """Une varios segmentos en un solo texto con separadores seguros"""
+    return SEGMENT_DELIMITER.join(texts)
+
+def unpack_segments(text: str, expected: int) -> Optional[List[str]]:
+    """Separa la respuesta del traductor; devuelve None si no coincide el número de segmentos"""
+    parts = [part.strip() for part in _DELIMITER_RE.split(text or "")]
+    return parts if len(parts) == expected else None
+
+def translate_packed(translate_one: Callable[[str], str], texts: List[str],
+                     max_chars: int = BATCH_MAX_CHARS) -> List[str]:
+    """
+    Traduce una lista de segmentos con el menor número de peticiones posible,
+    respetando el límite de caracteres por petición. Si el traductor altera los
+    separadores, traduce ese grupo segmento a segmento.
+    """
+    results: List[str] = []
+    group: List[str] = []
+    group_chars = 0
+
+    def flush():
+        if not group:
+            return
+        if len(group) == 1:
+            results.append(translate_one(group[0]))
+            return
+        parts = unpack_segments(translate_one(pack_segments(group)), len(group))
+        if parts is None:
+            parts = [translate_one(text) for text in group]
+        results.extend(parts)
+
+    for text in texts:
+        size = len(text) + len(SEGMENT_DELIMITER)
+        if group and group_chars + size > max_chars:
+            flush()
+            group, group_chars = [], 0
+        group.append(text)
+        group_chars += size
+    flush()
+    return results
+
+class BatchTranslator:
+    def __init__(self, translate_many: TranslateMany,
+                 max_batch_size: int = BATCH_MAX_SIZE,
+                 max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        """
+        Inicializa el agrupador.
+
+        Args:
+            translate_many: Función que traduce una lista de textos (source, target) en una
+                petición, normalmente TranslationBackend.translate_batch
+            max_batch_size: Máximo de segmentos por petición
+            max_wait_ms: Tiempo máximo que espera un segmento antes de enviarse
+        """
+        self.translate_many = translate_many
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, Future]]] = {}
+        self._oldest: Optional[float] = None
+        self._cond = threading.Condition()
+        self.batches_sent = 0
+        self.segments_sent = 0
+
+        self._thread = threading.Thread(target=self._run, name="batch-translator", daemon=True)
+        self._thread.start()
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """Traduce un texto; bloquea hasta que su lote haya sido traducido"""
+        return self.submit(text, source, target).result()
+
+    def submit(self, text: str, source: str, target: str) -> Future:
+        """Encola un texto y devuelve un Future con su traducción"""
+        future: Future = Future()
+        with self._cond:
+            if self._oldest is None:
+                self._oldest = time.perf_counter()
+            self._pending.setdefault((source, target), []).append((text, future))
+            self._cond.notify()
+        return future
+
+    def _is_full(self) -> bool:
+        return any(len(items) >= self.max_batch_size for items in self._pending.values())
+
+    def _take_batches(self) -> List[Tuple[Tuple[str, str], List[Tuple[str, Future]]]]:
+        """Saca hasta 'max_batch_size' segmentos de cada par de idiomas"""
+        batches = []
+        for key in list(self._pending):
+            items = self._pending[key]
+            batches.append((key, items[:self.max_batch_size]))
+            if len(items) > self.max_batch_size:
+                self._pending[key] = items[self.max_batch_size:]
+            else:
+                del self._pending[key]
+        # Lo que quede se envía en la siguiente vuelta sin esperar
+        self._oldest = time.perf_counter() - self.max_wait if self._pending else None
+        return batches
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = self._oldest + self.max_wait
+                while not self._is_full():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batches = self._take_batches()
+
+            for (source, target), items in batches:
+                self._send(source, target, items)
+
+    def _send(self, source: str, target: str, items: List[Tuple[str, Future]]) -> None:
+        """Envía un lote (sin duplicados) y reparte las traducciones a cada llamador"""
+        unique = list(dict.fromkeys(text for text, _ in items))
+        try:
+            translations = self.translate_many(unique, source, target)
+            if len(translations) != len(unique):
+                raise RuntimeError("El traductor devolvió un número distinto de segmentos")
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique, translations))
+        for text, future in items:
+            future.set_result(by_text[text])
+        self.batches_sent += 1
+        self.segments_sent += len(unique)
+
+    def metrics(self) -> Dict[str, float]:
+        """Devuelve el número de lotes enviados y el tamaño medio de lote"""
+        return {
+            "batches": self.batches_sent,
+            "segments": self.segments_sent,
+            "mean_batch_size": round(self.segments_sent / self.batches_sent, 2) if self.batches_sent else 0.0,
+        }
+
+_shared_batcher: Optional[BatchTranslator] = None
+_shared_lock = threading.Lock()
+
+def get_batch_translator() -> BatchTranslator:
+    """Devuelve el agrupador compartido por OCR, traducción inversa y audio (sobre el backend configurado)"""
+    global _shared_batcher
+    with _shared_lock:
+        if _shared_batcher is None:
+            from traductorocr.core.translation_backend import get_translation_backend
+            _shared_batcher = BatchTranslator(get_translation_backend().translate_batch)
+        return _shared_batcher
+
+def current_batch_translator() -> Optional[BatchTranslator]:
+    """Devuelve el agrupador compartido solo si ya se creó (sin crear el backend)"""
+    with _shared_lock:
+        return _shared_batcher
@@ -0,0 +1,75 @@
+"""
+Detección de cambios entre capturas para el modo vigilancia
+"""
+from typing import Optional
+import numpy as np
+
+from traductorocr.core.config import (
+    WATCH_DOWNSAMPLE,
+    WATCH_PIXEL_DELTA,
+    WATCH_CHANGE_RATIO
+)
+
+class FrameChangeDetector:
+    def __init__(self, downsample: int = WATCH_DOWNSAMPLE,
+                 pixel_delta: int = WATCH_PIXEL_DELTA,
+                 change_ratio: float = WATCH_CHANGE_RATIO):
+        """
+        Compara capturas sucesivas usando una versión reducida en grises.
+
+        Args:
+            downsample: Paso de submuestreo (1 de cada N píxeles por eje)
+            pixel_delta: Diferencia mínima de gris para contar un píxel como cambiado
+            change_ratio: Fracción de píxeles cambiados para considerar la zona distinta
+        """
+        self.downsample = max(1, int(downsample))
+        self.pixel_delta = pixel_delta
+        self.change_ratio = change_ratio
+
+        self.reference: Optional[np.ndarray] = None  # Última firma procesada
+        self.previous: Optional[np.ndarray] = None   # Firma de la captura anterior
+
+    def signature(self, frame: np.ndarray) -> np.ndarray:
+        """Calcula una firma en grises submuestreada (vistas sin copiar la imagen completa)"""
+        step = self.downsample
+        if frame.ndim == 2:
+            return frame[::step, ::step].astype(np.int16)
+
+        # Aproximación de luminancia (B + 2G + R) / 4 sobre la vista submuestreada
+        small = frame[::step, ::step]
+        luma = small[..., 0].astype(np.int16)
+        luma += small[..., 1]
+        luma += small[..., 1]
+        luma += small[..., 2]
+        luma >>= 2
+        return luma
+
+    def changed_ratio(self, a: np.ndarray, b: Optional[np.ndarray]) -> float:
+        """Fracción de píxeles que difieren más de 'pixel_delta' entre dos firmas"""
+        if b is None or a.shape != b.shape:
+            return 1.0
+        return float(np.count_nonzero(np.abs(a - b) > self.pixel_delta)) / a.size
+
+    def check(self, frame: np.ndarray) -> bool:
+        """
+        Devuelve True si la zona cambió respecto a la última captura procesada
+        y ya se estabilizó (no sigue cambiando respecto a la captura anterior).
+        """
+        current = self.signature(frame)
+        is_stable = self.changed_ratio(current, self.previous) <= self.change_ratio
+        self.previous = current
+
+        if not is_stable:
+            # El texto todavía se está escribiendo/animando; esperar
+            return False
+
+        if self.changed_ratio(current, self.reference) <= self.change_ratio:
+            return False
+
+        self.reference = current
+        return True
+
+    def reset(self) -> None:
+        """Olvida las firmas guardadas (la próxima captura estable se procesará)"""
+        self.reference = None
+        self.previous = None
@@ -1,4 +1,4 @@
-
+import os
 
 # Configuración de la ventana
 DEFAULT_WINDOW_WIDTH = 350
@@ -15,7 +15,84 @@ DEFAULT_FONT_SIZE = 11
 TARGET_LANGUAGE = 'es'
 INVERSE_TARGET_LANGUAGE = 'en'
 THRESHOLD_VALUE = 80
+OCR_AUTO_THRESHOLD = True        # Umbral (Otsu) y polaridad automáticos por fotograma
+AUTO_THRESHOLD_SUBSAMPLE = 2     # Submuestreo para el histograma
+AUTO_THRESHOLD_HIST_TOLERANCE = 0.05  # Desplazamiento del histograma que obliga a recalcular
+OCR_SCALE_NORMALIZATION = True   # Redimensionar la zona según la altura del texto
+SCALE_TARGET_TEXT_HEIGHT = 16    # Altura típica de letra objetivo (≈ altura x, en px)
+SCALE_MIN = 0.25                 # Reducción máxima
+SCALE_MAX = 4.0                  # Ampliación máxima
+SCALE_TOLERANCE = 0.15           # No redimensionar si la escala está a menos de un 15% de 1
+OCR_TEXT_BLOCKS = True           # Detectar bloques de texto y hacer OCR solo sobre ellos
+TEXT_BLOCK_KERNEL = (25, 9)      # Dilatación (ancho, alto) para unir letras en bloques
+TEXT_BLOCK_MIN_AREA = 60         # Área mínima de un bloque (px, tras normalizar escala)
+TEXT_BLOCK_PADDING = 6           # Margen alrededor de cada bloque
+TEXT_BLOCK_FULL_RATIO = 0.7      # Si los bloques cubren más que esto, OCR de la zona completa
+TEXT_BLOCK_LAYOUT_TOLERANCE = 32  # Cambio de una celda 8x8 (0-255) fuera de los bloques que los invalida
+OCR_BLOCK_WORKERS = 2            # Hilos para el OCR en paralelo de varios bloques
+# Motor de OCR por defecto: 'tesseract' (rápido, texto de HUD) o 'easyocr' (fuentes estilizadas)
+OCR_ENGINES = ['tesseract', 'easyocr']  # Motores disponibles
+OCR_ENGINE = os.environ.get('TRADUCTOROCR_OCR_ENGINE', 'tesseract')
+EASYOCR_THREADS = 2              # Hilos de CPU para torch (EasyOCR)
+EASYOCR_GPU = False
 POPUP_WRAP_LENGTH = 330
 
+# Configuración del modo vigilancia (captura continua)
+WATCH_INTERVAL_MS = 250      # Intervalo entre capturas
+WATCH_DOWNSAMPLE = 4         # Submuestreo para la detección de cambios
+WATCH_PIXEL_DELTA = 24       # Diferencia de gris para contar un píxel como cambiado
+WATCH_CHANGE_RATIO = 0.01    # Fracción de píxeles cambiados para volver a traducir
+REGION_WORKERS = 2           # Hilos para procesar en paralelo las zonas con nombre que cambian
+
+# Backend de traducción: 'google', 'deep_translator', 'offline', 'dictionary', 'argos' o 'stub'
+TRANSLATION_BACKEND = os.environ.get('TRADUCTOROCR_BACKEND', 'google')
+TRANSLATION_POOL_SIZE = 4        # Conexiones HTTP reutilizadas (keep-alive)
+TRANSLATION_TIMEOUT = 5.0        # Segundos por petición
+STUB_SERVER_URL = os.environ.get('TRADUCTOROCR_STUB_URL', 'http://127.0.0.1:8765')
+OFFLINE_GLOSSARY_FILE = "glossary.json"
+
+# Configuración de la caché de traducciones
+TRANSLATION_CACHE_FILE = "translation_cache.sqlite3"
+TRANSLATION_CACHE_SIZE = 5000    # Entradas máximas en memoria (LRU)
+TRANSLATION_CACHE_WARM = 2000    # Entradas recientes precargadas al iniciar
+
+# Configuración del planificador de tareas
+SCHEDULER_WORKERS = 3            # Hilos compartidos por OCR, traducción inversa y audio
+
+# Configuración del agrupador de traducciones (varios segmentos por petición)
+BATCH_MAX_SIZE = 16              # Segmentos máximos por petición
+BATCH_MAX_WAIT_MS = 25           # Espera máxima para completar un lote
+BATCH_MAX_CHARS = 4500           # Límite de caracteres por petición
+
+# Configuración del reconocimiento de voz (Vosk)
+SPEECH_SAMPLERATE = 16000        # Tasa del reconocedor
+SPEECH_WARMUP_SECONDS = 0.5      # Silencio con el que se calienta el modelo tras cargarlo
+AUDIO_RING_SECONDS = 4.0         # Capacidad del búfer circular entre el callback y Vosk
+AUDIO_FRAME_SECONDS = 0.1        # Trama que se entrega al reconocedor
+RESAMPLER_TAPS = 32              # Coeficientes por fase del remuestreador a SPEECH_SAMPLERATE
+AUDIO_MAX_SOURCES = 4            # Fuentes de audio simultáneas, cada una con su reconocedor y sus subtítulos
+SPEECH_WORKER_PROCESSES = AUDIO_MAX_SOURCES  # Máximo de procesos de reconocimiento: uno por fuente activa hasta este límite
+                                 # y el número de núcleos, cada uno con su copia del modelo (0 = en el proceso de la interfaz)
+
+# Detector de actividad de voz: solo se decodifican los tramos con voz
+VAD_ENABLED = True
+VAD_SUBFRAME_MS = 20             # Duración de cada decisión voz/no voz
+VAD_THRESHOLD_DB = 9.0           # Margen sobre el ruido de fondo para considerar voz
+VAD_ZCR_MAX = 0.3                # Cruces por cero máximos (fracción) de una subtrama con voz
+VAD_HANGOVER_MS = 400            # La puerta sigue abierta este tiempo tras la última voz
+VAD_PREROLL_MS = 200             # Audio previo que se entrega al detectar voz
+VAD_FLOOR_RISE = 0.01            # Adaptación del ruido de fondo al subir (por subtrama, ~2 s)
+VAD_FLOOR_FALL = 0.3             # Adaptación del ruido de fondo al bajar
+VAD_MIN_FLOOR_DB = -70.0         # Ruido de fondo mínimo (dBFS)
+VAD_INITIAL_FLOOR_DB = -45.0     # Ruido de fondo máximo al empezar (sin historial)
+
+# Subtítulos incrementales: se traducen los trozos estables del resultado parcial
+SUBTITLE_MIN_WORDS = 3           # Palabras estables mínimas para confirmar un trozo
+SUBTITLE_STABLE_MS = 500         # Parcial sin cambios durante este tiempo = estable entero
+
+# Arranque: las pilas de OCR y traducción se precargan en segundo plano tras mostrar la ventana
+PRELOAD_IN_BACKGROUND = True
+PRELOAD_DELAY_MS = 300
+
 # Configuración de archivos
 FONT_FILENAME = "pearl.ttf"
\ No newline at end of file
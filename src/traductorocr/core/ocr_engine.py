@@ -0,0 +1,319 @@
+"""
+Motores de OCR persistentes: Tesseract cargado en memoria una sola vez y,
+opcionalmente, un lector de EasyOCR (CPU) que se mantiene caliente
+"""
+import ctypes
+import ctypes.util
+import glob
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytesseract
+
+from traductorocr.core.config import OCR_ENGINE, EASYOCR_THREADS, EASYOCR_GPU
+
+# Columnas del formato TSV de Tesseract (mismas claves que pytesseract.Output.DICT)
+TSV_COLUMNS = [
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text'
+]
+
+PSM_AUTO = 3  # Modo de segmentación por defecto de Tesseract (igual que pytesseract)
+
+# Códigos de idioma de Tesseract -> EasyOCR
+EASYOCR_LANGS = {'eng': 'en', 'spa': 'es', 'fra': 'fr', 'deu': 'de', 'ita': 'it', 'por': 'pt',
+                 'jpn': 'ja', 'kor': 'ko', 'chi_sim': 'ch_sim', 'chi_tra': 'ch_tra', 'rus': 'ru'}
+
+def parse_tsv(tsv: str) -> Dict[str, list]:
+    """Convierte la salida TSV de Tesseract en un diccionario de columnas"""
+    data: Dict[str, list] = {column: [] for column in TSV_COLUMNS}
+    for row in tsv.splitlines():
+        fields = row.split('\t', len(TSV_COLUMNS) - 1)
+        if len(fields) < len(TSV_COLUMNS) - 1 or fields[0] == 'level':
+            continue  # Cabecera o línea incompleta
+        if len(fields) == len(TSV_COLUMNS) - 1:
+            fields.append('')
+        for column, value in zip(TSV_COLUMNS, fields):
+            if column == 'text':
+                data[column].append(value)
+            elif column == 'conf':
+                data[column].append(float(value))
+            else:
+                data[column].append(int(value))
+    return data
+
+def _find_tesseract_library() -> Optional[str]:
+    """Busca la librería compartida de Tesseract (junto al ejecutable o en el sistema)"""
+    candidates: List[str] = []
+
+    tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+    if tesseract_cmd and os.path.dirname(tesseract_cmd):
+        candidates += sorted(glob.glob(os.path.join(os.path.dirname(tesseract_cmd), 'libtesseract*.dll')))
+
+    found = ctypes.util.find_library('tesseract') or ctypes.util.find_library('libtesseract-5')
+    if found:
+        candidates.append(found)
+    candidates += ['libtesseract.so.5', 'libtesseract.so.4', 'libtesseract.dylib']
+
+    for candidate in candidates:
+        try:
+            ctypes.CDLL(candidate)
+            return candidate
+        except OSError:
+            continue
+    return None
+
+_library = None
+_library_lock = threading.Lock()
+
+def _load_library():
+    """Carga libtesseract una vez por proceso y declara las firmas de la API de C"""
+    global _library
+    with _library_lock:
+        if _library is not None:
+            return _library
+
+        path = _find_tesseract_library()
+        if path is None:
+            raise OSError("No se encontró libtesseract")
+
+        lib = ctypes.CDLL(path)
+        handle = ctypes.c_void_p
+        lib.TessBaseAPICreate.restype = handle
+        lib.TessBaseAPIInit3.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPISetPageSegMode.argtypes = [handle, ctypes.c_int]
+        lib.TessBaseAPISetImage.argtypes = [
+            handle, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int
+        ]
+        lib.TessBaseAPISetSourceResolution.argtypes = [handle, ctypes.c_int]
+        lib.TessBaseAPIRecognize.argtypes = [handle, ctypes.c_void_p]
+        lib.TessBaseAPIRecognize.restype = ctypes.c_int
+        lib.TessBaseAPIGetUTF8Text.argtypes = [handle]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetTsvText.argtypes = [handle, ctypes.c_int]
+        lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIClear.argtypes = [handle]
+        lib.TessBaseAPIEnd.argtypes = [handle]
+        lib.TessBaseAPIDelete.argtypes = [handle]
+
+        _library = lib
+        return lib
+
+class OcrEngine:
+    """Interfaz común de los motores de OCR (mismo formato de salida que pytesseract)"""
+    name = "base"
+
+    def image_to_string(self, image: np.ndarray) -> str:
+        raise NotImplementedError
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        """Columnas TSV_COLUMNS con una fila por palabra (nivel 5)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class TesseractEngine(OcrEngine):
+    name = "tesseract"
+
+    def __init__(self, lang: str = 'eng', psm: int = PSM_AUTO):
+        """
+        Instancia residente de Tesseract usando su API de C.
+        Carga 'eng.traineddata' una sola vez y la reutiliza en cada captura.
+
+        Args:
+            lang: Idioma(s) de Tesseract
+            psm: Modo de segmentación de página
+        """
+        self.lang = lang
+        self._lib = _load_library()
+        self._api = self._lib.TessBaseAPICreate()
+
+        datapath = os.environ.get('TESSDATA_PREFIX')
+        if self._lib.TessBaseAPIInit3(
+            self._api,
+            datapath.encode('utf-8') if datapath else None,
+            lang.encode('utf-8')
+        ) != 0:
+            self._lib.TessBaseAPIDelete(self._api)
+            self._api = None
+            raise RuntimeError(f"No se pudo inicializar Tesseract con el idioma '{lang}'")
+        self._lib.TessBaseAPISetPageSegMode(self._api, psm)
+        # La API no es reentrante: cada instancia procesa una imagen a la vez
+        self._lock = threading.Lock()
+
+    def _recognize(self, image: np.ndarray) -> None:
+        """Pasa el buffer de numpy directamente a Tesseract (sin archivos temporales)"""
+        if image.dtype != np.uint8:
+            image = image.astype(np.uint8)
+        if image.ndim == 3:
+            # BGR/BGRA -> RGB, que es lo que espera Tesseract para 3 bytes por píxel
+            image = image[..., 2::-1]
+        image = np.ascontiguousarray(image)
+
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        self._lib.TessBaseAPISetImage(
+            self._api, image.ctypes.data_as(ctypes.c_void_p),
+            width, height, bytes_per_pixel, image.strides[0]
+        )
+        self._lib.TessBaseAPISetSourceResolution(self._api, 70)
+        if self._lib.TessBaseAPIRecognize(self._api, None) != 0:
+            raise RuntimeError("Tesseract no pudo reconocer la imagen")
+
+    def _take_text(self, pointer: Optional[int]) -> str:
+        """Copia y libera una cadena devuelta por la API de C"""
+        if not pointer:
+            return ""
+        try:
+            return ctypes.string_at(pointer).decode('utf-8', errors='replace')
+        finally:
+            self._lib.TessDeleteText(pointer)
+
+    def image_to_string(self, image: np.ndarray) -> str:
+        """Equivalente a pytesseract.image_to_string"""
+        with self._lock:
+            self._recognize(image)
+            text = self._take_text(self._lib.TessBaseAPIGetUTF8Text(self._api))
+            self._lib.TessBaseAPIClear(self._api)
+        return text
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        """Equivalente a pytesseract.image_to_data(..., output_type=Output.DICT)"""
+        with self._lock:
+            self._recognize(image)
+            tsv = self._take_text(self._lib.TessBaseAPIGetTsvText(self._api, 0))
+            self._lib.TessBaseAPIClear(self._api)
+        return parse_tsv(tsv)
+
+    def close(self) -> None:
+        """Libera la instancia de Tesseract"""
+        if self._api:
+            self._lib.TessBaseAPIEnd(self._api)
+            self._lib.TessBaseAPIDelete(self._api)
+            self._api = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class PytesseractEngine(OcrEngine):
+    name = "tesseract"
+
+    def __init__(self, lang: str = 'eng'):
+        """Motor de respaldo: lanza un proceso de tesseract por captura (pytesseract)"""
+        self.lang = lang
+
+    def image_to_string(self, image: np.ndarray) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        return pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+
+class EasyOcrEngine(OcrEngine):
+    name = "easyocr"
+
+    def __init__(self, lang: str = 'eng', threads: int = EASYOCR_THREADS, gpu: bool = EASYOCR_GPU):
+        """
+        Lector de EasyOCR creado una sola vez por proceso y calentado con una imagen
+        vacía (la primera inferencia de torch es mucho más lenta). Más robusto que
+        Tesseract con fuentes estilizadas, pero más lento en texto de HUD.
+
+        Args:
+            lang: Idioma(s) en formato de Tesseract ('eng', 'eng+spa')
+            threads: Hilos de CPU para torch (0 = los que elija torch)
+            gpu: Usar la GPU si está disponible
+        """
+        import torch
+        import easyocr
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.lang = lang
+        self._reader = easyocr.Reader(
+            [EASYOCR_LANGS.get(code, code) for code in lang.split('+')],
+            gpu=gpu, verbose=False
+        )
+        # El modelo se comparte entre hilos: una inferencia a la vez
+        self._lock = threading.Lock()
+        self._read(np.zeros((32, 128), dtype=np.uint8))
+
+    def _read(self, image: np.ndarray) -> list:
+        """Devuelve [(caja, texto, confianza 0-1)] de readtext"""
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = image[..., :3]
+        with self._lock:
+            return self._reader.readtext(np.ascontiguousarray(image), paragraph=False)
+
+    def image_to_string(self, image: np.ndarray) -> str:
+        return "\n".join(text for _, text, _ in self._read(image))
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        """Cada resultado de EasyOCR es una línea: se devuelve como una palabra en su propio bloque"""
+        data: Dict[str, list] = {column: [] for column in TSV_COLUMNS}
+        for i, (box, text, conf) in enumerate(self._read(image)):
+            xs = [point[0] for point in box]
+            ys = [point[1] for point in box]
+            left, top = int(min(xs)), int(min(ys))
+            row = {
+                'level': 5, 'page_num': 1, 'block_num': i + 1, 'par_num': 1, 'line_num': 1, 'word_num': 1,
+                'left': left, 'top': top, 'width': int(max(xs)) - left, 'height': int(max(ys)) - top,
+                'conf': float(conf) * 100.0, 'text': text,
+            }
+            for column in TSV_COLUMNS:
+                data[column].append(row[column])
+        return data
+
+_thread_engines = threading.local()
+_native_available = True
+_easyocr_available = True
+_shared_engines: Dict[tuple, OcrEngine] = {}
+_shared_lock = threading.Lock()
+
+def _get_easyocr_engine(lang: str) -> OcrEngine:
+    """EasyOCR: un único lector por proceso e idioma, compartido por todos los hilos"""
+    key = ('easyocr', lang)
+    with _shared_lock:
+        engine = _shared_engines.get(key)
+        if engine is None:
+            engine = _shared_engines[key] = EasyOcrEngine(lang)
+        return engine
+
+def get_ocr_engine(lang: str = 'eng', engine_name: Optional[str] = None) -> OcrEngine:
+    """
+    Devuelve el motor de OCR indicado ('tesseract' o 'easyocr'; por defecto OCR_ENGINE).
+    Tesseract: uno por hilo, ya que su API no es segura entre hilos; si libtesseract
+    no está disponible, usa pytesseract. Si EasyOCR no está instalado, usa Tesseract.
+    """
+    global _native_available, _easyocr_available
+    engine_name = engine_name or OCR_ENGINE
+    if engine_name == 'easyocr' and _easyocr_available:
+        try:
+            return _get_easyocr_engine(lang)
+        except Exception as e:
+            # No instalado o sin modelos descargados: no volver a intentarlo en cada captura
+            print(f"EasyOCR no disponible, usando Tesseract: {e}")
+            _easyocr_available = False
+
+    engines = getattr(_thread_engines, 'engines', None)
+    if engines is None:
+        engines = _thread_engines.engines = {}
+
+    engine = engines.get(lang)
+    if engine is None:
+        if _native_available:
+            try:
+                engine = TesseractEngine(lang)
+            except (OSError, RuntimeError, AttributeError) as e:
+                print(f"Tesseract residente no disponible, usando pytesseract: {e}")
+                _native_available = False
+        if engine is None:
+            engine = PytesseractEngine(lang)
+        engines[lang] = engine
+    return engine
@@ -0,0 +1,117 @@
+"""
+Resultados de OCR por línea y traducción incremental de las líneas que cambian
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from traductorocr.core.config import OCR_BLOCK_WORKERS
+from traductorocr.core.ocr_engine import get_ocr_engine
+from traductorocr.core.translation_cache import normalize_text
+
+WORD_LEVEL = 5  # Nivel de palabra en la salida image_to_data de Tesseract
+
+class OcrLine(NamedTuple):
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    conf: float
+
+def extract_lines(data: Dict[str, list], min_conf: float = 0.0) -> List[OcrLine]:
+    """
+    Agrupa las palabras de image_to_data en líneas con su rectángulo envolvente,
+    en el orden de lectura de Tesseract.
+    """
+    grouped: Dict[tuple, list] = {}
+    for i, text in enumerate(data['text']):
+        if data['level'][i] != WORD_LEVEL or not text.strip():
+            continue
+        if float(data['conf'][i]) < min_conf:
+            continue
+        key = (data['page_num'][i], data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        grouped.setdefault(key, []).append(i)
+
+    lines = []
+    for indices in grouped.values():
+        left = min(data['left'][i] for i in indices)
+        top = min(data['top'][i] for i in indices)
+        right = max(data['left'][i] + data['width'][i] for i in indices)
+        bottom = max(data['top'][i] + data['height'][i] for i in indices)
+        conf = sum(float(data['conf'][i]) for i in indices) / len(indices)
+        text = " ".join(data['text'][i].strip() for i in indices)
+        lines.append(OcrLine(text, left, top, right - left, bottom - top, conf))
+    return lines
+
+def scale_lines(lines: Sequence[OcrLine], scale: float) -> List[OcrLine]:
+    """Devuelve los rectángulos en coordenadas de la captura original (deshace la escala)"""
+    if scale == 1.0:
+        return list(lines)
+    return [
+        line._replace(
+            left=int(round(line.left / scale)),
+            top=int(round(line.top / scale)),
+            width=int(round(line.width / scale)),
+            height=int(round(line.height / scale))
+        )
+        for line in lines
+    ]
+
+_block_pool: Optional[ThreadPoolExecutor] = None
+
+def _ocr_block(image: np.ndarray, box: Tuple[int, int, int, int],
+               engine_name: Optional[str] = None) -> List[OcrLine]:
+    """OCR de un bloque (vista sin copia) con rectángulos en coordenadas de la imagen"""
+    x, y, w, h = box
+    lines = extract_lines(get_ocr_engine(engine_name=engine_name).image_to_data(image[y:y + h, x:x + w]))
+    return [line._replace(left=line.left + x, top=line.top + y) for line in lines]
+
+def recognize_lines(image: np.ndarray, boxes: Sequence[Tuple[int, int, int, int]],
+                    engine_name: Optional[str] = None) -> List[OcrLine]:
+    """
+    Hace OCR solo de los bloques indicados (en paralelo si hay varios; cada hilo
+    usa su propio motor residente) y devuelve las líneas en orden de lectura.
+    'engine_name' elige el motor ('tesseract', 'easyocr'; por defecto OCR_ENGINE).
+    """
+    global _block_pool
+    if not boxes:
+        return []
+    if len(boxes) == 1 or OCR_BLOCK_WORKERS <= 1:
+        results = [_ocr_block(image, box, engine_name) for box in boxes]
+    else:
+        if _block_pool is None:
+            _block_pool = ThreadPoolExecutor(max_workers=OCR_BLOCK_WORKERS, thread_name_prefix="ocr-block")
+        results = list(_block_pool.map(lambda box: _ocr_block(image, box, engine_name), boxes))
+    return [line for block_lines in results for line in block_lines]
+
+class LineTranslator:
+    def __init__(self):
+        """Recuerda las líneas del fotograma anterior y sus traducciones"""
+        self.previous: Dict[str, str] = {}
+
+    def translate(self, lines: Sequence[str],
+                  translate_func: Callable[[List[str]], List[str]]) -> List[str]:
+        """
+        Traduce solo las líneas nuevas o modificadas y reutiliza las demás.
+
+        Args:
+            lines: Textos de las líneas del fotograma actual
+            translate_func: Traduce una lista de líneas (una traducción por línea,
+                p. ej. pipeline.translate_texts: caché y lotes por línea)
+        """
+        keys = [normalize_text(line) for line in lines]
+        pending = [key for key in dict.fromkeys(keys) if key not in self.previous]
+
+        translated: Dict[str, str] = {}
+        if pending:
+            translated.update(zip(pending, (text or "" for text in translate_func(pending))))
+
+        current = {key: translated[key] if key in translated else self.previous[key] for key in keys}
+        self.previous = current
+        return [current[key] for key in keys]
+
+    def reset(self) -> None:
+        """Olvida las líneas del fotograma anterior"""
+        self.previous = {}
@@ -0,0 +1,128 @@
+"""
+Pipeline captura -> preprocesado -> OCR -> traducción sin dependencias de la interfaz.
+Lo usan la interfaz Tk, el modo por lotes de la línea de comandos y los benchmarks.
+"""
+from typing import List, NamedTuple, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from traductorocr.core.config import (
+    TARGET_LANGUAGE,
+    OCR_SCALE_NORMALIZATION,
+    OCR_TEXT_BLOCKS
+)
+from traductorocr.core.ocr_lines import OcrLine, recognize_lines, scale_lines
+from traductorocr.core.preprocessing import binarize, normalize_scale
+from traductorocr.core.regions import OcrRegion
+from traductorocr.core.screen_capture import get_capture_session
+from traductorocr.core.translation_cache import get_translation_cache
+from traductorocr.core.batch_translator import get_batch_translator
+from traductorocr.utils.profiling import stage_timer
+
+class PipelineResult(NamedTuple):
+    lines: List[OcrLine]
+    translations: List[str]
+
+    @property
+    def text(self) -> str:
+        """Texto traducido (o el reconocido si no se tradujo), una línea por renglón"""
+        return "\n".join(self.translations if self.translations else [line.text for line in self.lines])
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """Convierte a grises una captura BGRA, una imagen BGR de disco o una imagen ya en grises"""
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+def capture_region(region: OcrRegion) -> np.ndarray:
+    """
+    Captura la zona con la sesión del hilo actual.
+    El array se reutiliza en la siguiente captura: copiarlo si se necesita conservarlo.
+    """
+    with stage_timer('ocr.capture'):
+        return get_capture_session().grab(region.box)
+
+def recognize(image: np.ndarray, region: OcrRegion) -> List[OcrLine]:
+    """Preprocesa la imagen con los ajustes de la zona y devuelve las líneas reconocidas"""
+    with stage_timer('ocr.cvtColor'):
+        gray_img = to_gray(image)
+
+    with stage_timer('ocr.threshold'):
+        if region.auto:
+            # Umbral y polaridad calculados por fotograma (cacheados mientras no cambie el histograma)
+            threshold, invert = region.auto_threshold.compute(gray_img)
+        else:
+            threshold, invert = region.settings()
+        processed_img = binarize(gray_img, threshold, invert)
+
+    scale = 1.0
+    if OCR_SCALE_NORMALIZATION:
+        with stage_timer('ocr.scale'):
+            processed_img, scale = normalize_scale(processed_img)
+
+    # Recortar el fondo: OCR solo de los bloques de texto (cacheados mientras no cambie la disposición)
+    if OCR_TEXT_BLOCKS:
+        with stage_timer('ocr.blocks'):
+            boxes = region.block_detector.detect(processed_img)
+    else:
+        boxes = [(0, 0, processed_img.shape[1], processed_img.shape[0])]
+
+    # OCR por líneas (motor residente: no lanza un proceso por captura)
+    with stage_timer('ocr.tesseract'):
+        return scale_lines(recognize_lines(processed_img, boxes, region.engine), scale)
+
+def translate_text(text: str, source: str, target: str) -> str:
+    """Traduce consultando primero la caché; los fallos se agrupan en lotes"""
+    batcher = get_batch_translator()
+    return get_translation_cache().translate(
+        text, source, target,
+        lambda pending: batcher.translate(pending, source, target)
+    )
+
+def translate_texts(texts: Sequence[str], source: str = 'en', target: str = TARGET_LANGUAGE) -> List[str]:
+    """
+    Traduce varios textos a la vez: los que no están en la caché se encolan juntos
+    en el agrupador para que viajen en el menor número de peticiones.
+    """
+    cache = get_translation_cache()
+    batcher = get_batch_translator()
+    results: List[Optional[str]] = [cache.get(text, source, target) for text in texts]
+    futures = {i: batcher.submit(text, source, target)
+               for i, (text, cached) in enumerate(zip(texts, results)) if cached is None}
+    for i, future in futures.items():
+        translation = future.result()
+        if translation:
+            cache.put(texts[i], source, target, translation)
+        results[i] = translation or ""
+    return results
+
+def translate_lines(lines: Sequence[OcrLine], region: OcrRegion,
+                    source: str = 'en', target: str = TARGET_LANGUAGE) -> List[str]:
+    """Traduce solo las líneas nuevas o modificadas respecto al fotograma anterior de la zona"""
+    with stage_timer('ocr.translate'):
+        return region.line_translator.translate(
+            [line.text for line in lines],
+            lambda pending: translate_texts(pending, source, target)
+        )
+
+def process_image(image: np.ndarray, region: Optional[OcrRegion] = None, translate: bool = True,
+                  source: str = 'en', target: str = TARGET_LANGUAGE) -> PipelineResult:
+    """
+    Ejecuta el pipeline completo sobre una imagen (captura BGRA, imagen BGR o grises).
+
+    Args:
+        image: Imagen a procesar
+        region: Zona cuyos ajustes y estado se usan; si no se indica, una zona nueva
+            con los ajustes por defecto que cubre toda la imagen
+        translate: Si es False solo se hace OCR
+        source: Idioma del texto
+        target: Idioma de destino
+    """
+    if region is None:
+        region = OcrRegion("imagen", (0, 0, image.shape[1], image.shape[0]))
+    lines = recognize(image, region)
+    if not lines or not translate:
+        return PipelineResult(lines, [])
+    return PipelineResult(lines, translate_lines(lines, region, source, target))
@@ -0,0 +1,217 @@
+"""
+Preprocesado de la imagen antes del OCR
+"""
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from traductorocr.core.config import (
+    AUTO_THRESHOLD_HIST_TOLERANCE,
+    AUTO_THRESHOLD_SUBSAMPLE,
+    SCALE_TARGET_TEXT_HEIGHT,
+    SCALE_MIN,
+    SCALE_MAX,
+    SCALE_TOLERANCE,
+    TEXT_BLOCK_KERNEL,
+    TEXT_BLOCK_MIN_AREA,
+    TEXT_BLOCK_PADDING,
+    TEXT_BLOCK_FULL_RATIO,
+    TEXT_BLOCK_LAYOUT_TOLERANCE
+)
+
+Box = Tuple[int, int, int, int]  # (x, y, ancho, alto)
+
+def gray_histogram(gray: np.ndarray, subsample: int = AUTO_THRESHOLD_SUBSAMPLE) -> np.ndarray:
+    """Histograma normalizado de 256 niveles (sobre una vista submuestreada)"""
+    view = gray[::subsample, ::subsample] if subsample > 1 else gray
+    hist = np.bincount(view.ravel(), minlength=256).astype(np.float64)
+    return hist / max(1.0, hist.sum())
+
+def otsu_threshold(hist: np.ndarray) -> int:
+    """Umbral de Otsu calculado de forma vectorizada sobre un histograma normalizado"""
+    levels = np.arange(256, dtype=np.float64)
+    weight_bg = np.cumsum(hist)
+    weight_fg = 1.0 - weight_bg
+    cumulative_mean = np.cumsum(hist * levels)
+    total_mean = cumulative_mean[-1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_bg = cumulative_mean / weight_bg
+        mean_fg = (total_mean - cumulative_mean) / weight_fg
+        between_variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    between_variance[~np.isfinite(between_variance)] = 0.0
+    return int(np.argmax(between_variance))
+
+def detect_dark_text(hist: np.ndarray, threshold: int) -> bool:
+    """
+    Detecta la polaridad: el texto ocupa menos píxeles que el fondo, así que si la
+    mayoría está por encima del umbral el fondo es claro y el texto oscuro.
+    """
+    return float(hist[threshold + 1:].sum()) > 0.5
+
+def binarize(gray: np.ndarray, threshold: int, invert: bool) -> np.ndarray:
+    """Aplica el umbral (el texto queda en blanco sobre negro en ambos casos)"""
+    thresh_mode = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+    _, processed = cv2.threshold(gray, threshold, 255, thresh_mode)
+    return processed
+
+def estimate_text_height(binary: np.ndarray) -> Optional[float]:
+    """
+    Estima la altura típica del texto (mediana de la altura de los componentes
+    conexos blancos). En imágenes grandes se analiza una versión reducida a la mitad.
+    """
+    factor = 2 if binary.shape[0] * binary.shape[1] > 500_000 else 1
+    view = binary[::factor, ::factor] if factor > 1 else binary
+    count, _, stats, _ = cv2.connectedComponentsWithStats(np.ascontiguousarray(view), connectivity=8)
+    if count <= 1:
+        return None
+
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    # Descartar ruido, líneas horizontales y manchas que ocupan casi toda la zona
+    valid = (areas >= 4) & (heights >= 3) & (heights < 0.9 * view.shape[0]) & (widths < 5 * heights)
+    if not np.any(valid):
+        return None
+    return float(np.median(heights[valid])) * factor
+
+def normalize_scale(binary: np.ndarray, target_height: float = SCALE_TARGET_TEXT_HEIGHT) -> Tuple[np.ndarray, float]:
+    """
+    Redimensiona la imagen binarizada para que el texto tenga la altura objetivo:
+    las zonas grandes se reducen (OCR más barato) y el texto pequeño se amplía
+    (OCR más preciso). Devuelve la imagen y la escala aplicada.
+    """
+    text_height = estimate_text_height(binary)
+    if not text_height:
+        return binary, 1.0
+
+    scale = min(SCALE_MAX, max(SCALE_MIN, target_height / text_height))
+    if abs(scale - 1.0) <= SCALE_TOLERANCE:
+        return binary, 1.0
+
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    resized = cv2.resize(binary, None, fx=scale, fy=scale, interpolation=interpolation)
+    _, resized = cv2.threshold(resized, 127, 255, cv2.THRESH_BINARY)
+    return resized, scale
+
+class AutoThreshold:
+    def __init__(self, tolerance: float = AUTO_THRESHOLD_HIST_TOLERANCE):
+        """
+        Calcula umbral y polaridad por fotograma para una zona, y reutiliza el
+        resultado mientras el histograma no se desplace.
+
+        Args:
+            tolerance: Distancia de variación total entre histogramas (0-1)
+                a partir de la cual se recalcula
+        """
+        self.tolerance = tolerance
+        self._hist: Optional[np.ndarray] = None
+        self.threshold = 0
+        self.invert = False
+        self.recomputed = 0
+
+    def compute(self, gray: np.ndarray) -> Tuple[int, bool]:
+        """Devuelve (umbral, invertir) para la imagen en grises"""
+        hist = gray_histogram(gray)
+        if self._hist is not None and 0.5 * float(np.abs(hist - self._hist).sum()) <= self.tolerance:
+            return self.threshold, self.invert
+
+        self.threshold = otsu_threshold(hist)
+        self.invert = detect_dark_text(hist, self.threshold)
+        self._hist = hist
+        self.recomputed += 1
+        return self.threshold, self.invert
+
+    def reset(self) -> None:
+        self._hist = None
+
+def _merge_boxes(boxes: List[Box]) -> List[Box]:
+    """Une los rectángulos que se solapan (tras el margen) hasta que no quede ninguno"""
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        result: List[Box] = []
+        for box in merged:
+            x, y, w, h = box
+            for i, (ox, oy, ow, oh) in enumerate(result):
+                if x < ox + ow and ox < x + w and y < oy + oh and oy < y + h:
+                    nx, ny = min(x, ox), min(y, oy)
+                    result[i] = (nx, ny, max(x + w, ox + ow) - nx, max(y + h, oy + oh) - ny)
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        merged = result
+    return merged
+
+def detect_text_blocks(binary: np.ndarray) -> List[Box]:
+    """
+    Detecta los bloques de texto de una imagen binarizada (texto en blanco):
+    dilata horizontalmente para unir letras y palabras y toma los contornos externos.
+    Pensado para ejecutarse tras normalize_scale, con una altura de letra conocida.
+    """
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, TEXT_BLOCK_KERNEL)
+    dilated = cv2.dilate(binary, kernel)
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    height, width = binary.shape[:2]
+    pad = TEXT_BLOCK_PADDING
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w * h < TEXT_BLOCK_MIN_AREA:
+            continue
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(width, x + w + pad), min(height, y + h + pad)
+        boxes.append((x0, y0, x1 - x0, y1 - y0))
+
+    boxes = _merge_boxes(boxes)
+    # Si los bloques cubren casi toda la zona, es más barato un único OCR
+    if sum(w * h for _, _, w, h in boxes) >= TEXT_BLOCK_FULL_RATIO * width * height:
+        return [(0, 0, width, height)]
+    return sorted(boxes, key=lambda box: (box[1], box[0]))
+
+class TextBlockDetector:
+    def __init__(self, tolerance: float = TEXT_BLOCK_LAYOUT_TOLERANCE):
+        """
+        Reutiliza los bloques detectados mientras no aparezca texto fuera de ellos.
+        Se compara celda a celda una miniatura de densidad de texto: si cualquier
+        celda fuera de los bloques cacheados cambia más que 'tolerance', se
+        recalculan (una línea nueva en una zona vacía cambia pocas celdas, pero
+        mucho). Los cambios dentro de los bloques (otro texto en la misma línea)
+        no los invalidan: el OCR ya cubre esa área.
+
+        Args:
+            tolerance: Cambio (0-255) de una celda de 8x8 píxeles que invalida la caché
+        """
+        self.tolerance = tolerance
+        self._layout: Optional[np.ndarray] = None
+        self._outside: Optional[np.ndarray] = None  # Celdas de la miniatura no cubiertas por los bloques
+        self._boxes: List[Box] = []
+        self.recomputed = 0
+
+    def detect(self, binary: np.ndarray) -> List[Box]:
+        """Devuelve los bloques de texto, recalculándolos solo si aparece texto fuera de ellos"""
+        # Miniatura 1/8: cada celda es la densidad de texto de un bloque de 8x8 píxeles
+        layout = cv2.resize(binary, (max(1, binary.shape[1] // 8), max(1, binary.shape[0] // 8)),
+                            interpolation=cv2.INTER_AREA)
+        if self._layout is not None and self._layout.shape == layout.shape:
+            changed = cv2.absdiff(layout, self._layout) > self.tolerance
+            if not np.any(changed & self._outside):
+                return self._boxes
+
+        self._boxes = detect_text_blocks(binary)
+        self._layout = layout
+        self._outside = np.ones(layout.shape, dtype=bool)
+        cell_h, cell_w = binary.shape[0] / layout.shape[0], binary.shape[1] / layout.shape[1]
+        for x, y, w, h in self._boxes:
+            # Celdas tocadas por el bloque (redondeando hacia fuera)
+            self._outside[int(y // cell_h):int(np.ceil((y + h) / cell_h)),
+                          int(x // cell_w):int(np.ceil((x + w) / cell_w))] = False
+        self.recomputed += 1
+        return self._boxes
+
+    def reset(self) -> None:
+        self._layout = None
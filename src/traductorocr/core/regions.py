@@ -0,0 +1,126 @@
+"""
+Zonas de OCR con nombre (subtítulos, cuadro de diálogo, descripción de objeto...)
+capturadas con una sola captura de su rectángulo envolvente
+"""
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from traductorocr.core.config import THRESHOLD_VALUE, OCR_AUTO_THRESHOLD, OCR_ENGINE
+from traductorocr.core.change_detector import FrameChangeDetector
+from traductorocr.core.ocr_lines import LineTranslator
+from traductorocr.core.preprocessing import AutoThreshold, TextBlockDetector
+
+Box = Tuple[int, int, int, int]  # (x, y, ancho, alto) en coordenadas de pantalla
+
+def normalize_box(box) -> Box:
+    """Convierte la caja de AreaSelector (floats) a enteros"""
+    return tuple(int(round(v)) for v in box)
+
+def union_box(boxes: Sequence[Box]) -> Box:
+    """Rectángulo envolvente de varias cajas"""
+    left = min(box[0] for box in boxes)
+    top = min(box[1] for box in boxes)
+    right = max(box[0] + box[2] for box in boxes)
+    bottom = max(box[1] + box[3] for box in boxes)
+    return left, top, right - left, bottom - top
+
+class OcrRegion:
+    def __init__(self, name: str, box, threshold: int = THRESHOLD_VALUE,
+                 invert: bool = False, auto: bool = OCR_AUTO_THRESHOLD, engine: str = OCR_ENGINE):
+        """
+        Zona de OCR con sus propios ajustes y el estado que se conserva entre capturas.
+
+        Args:
+            name: Nombre visible de la zona
+            box: Caja (x, y, ancho, alto) en coordenadas de pantalla
+            threshold: Umbral manual
+            invert: Texto oscuro sobre fondo claro
+            auto: Umbral y polaridad automáticos por fotograma
+            engine: Motor de OCR ('tesseract' para texto de HUD, 'easyocr' para fuentes estilizadas)
+        """
+        self.name = name
+        self.box = normalize_box(box)
+        self.threshold = threshold
+        self.invert = invert
+        self.auto = auto
+        self.engine = engine
+
+        self.auto_threshold = AutoThreshold()
+        self.block_detector = TextBlockDetector()
+        self.line_translator = LineTranslator()
+        self.change_detector = FrameChangeDetector()
+        self.last_result = ""
+
+    def settings(self) -> Tuple[int, bool]:
+        """Ajustes manuales (umbral, invertir)"""
+        return self.threshold, self.invert
+
+    def reset(self) -> None:
+        """Olvida el estado cacheado (al cambiar los ajustes o la zona)"""
+        self.auto_threshold.reset()
+        self.block_detector.reset()
+        self.line_translator.reset()
+        self.change_detector.reset()
+        self.last_result = ""
+
+    def __repr__(self) -> str:
+        return f"OcrRegion({self.name!r}, box={self.box})"
+
+class RegionSet:
+    def __init__(self):
+        """
+        Conjunto de zonas con nombre. Se captura una sola vez su rectángulo envolvente
+        y cada zona es una vista (sin copia) de esa captura, así que el coste de
+        captura no crece con el número de zonas (sí con el área del rectángulo).
+        """
+        self._regions: Dict[str, OcrRegion] = {}
+        self._lock = threading.Lock()
+
+    def add(self, region: OcrRegion) -> OcrRegion:
+        """Añade o reemplaza la zona con ese nombre"""
+        with self._lock:
+            self._regions[region.name] = region
+        return region
+
+    def remove(self, name: str) -> Optional[OcrRegion]:
+        with self._lock:
+            return self._regions.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._regions.clear()
+
+    def get(self, name: str) -> Optional[OcrRegion]:
+        return self._regions.get(name)
+
+    def regions(self) -> List[OcrRegion]:
+        """Copia de la lista de zonas (se puede modificar el conjunto mientras se recorre)"""
+        with self._lock:
+            return list(self._regions.values())
+
+    def names(self) -> List[str]:
+        return [region.name for region in self.regions()]
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def bounding_box(self, regions: Optional[Sequence[OcrRegion]] = None) -> Optional[Box]:
+        """Rectángulo que hay que capturar para cubrir todas las zonas"""
+        regions = self.regions() if regions is None else regions
+        if not regions:
+            return None
+        return union_box([region.box for region in regions])
+
+    @staticmethod
+    def slice(frame: np.ndarray, origin: Box,
+              regions: Sequence[OcrRegion]) -> Iterator[Tuple[OcrRegion, np.ndarray]]:
+        """
+        Recorta cada zona de la captura del rectángulo envolvente 'origin'.
+        Devuelve vistas de numpy: son válidas hasta la siguiente captura de la sesión.
+        """
+        ox, oy = origin[0], origin[1]
+        for region in regions:
+            x, y, w, h = region.box
+            yield region, frame[y - oy:y - oy + h, x - ox:x - ox + w]
@@ -0,0 +1,80 @@
+"""
+Remuestreo en streaming (polifásico, vectorizado con numpy) de la tasa del
+dispositivo a la del reconocedor de voz
+"""
+from math import gcd
+
+import numpy as np
+
+from traductorocr.core.config import SPEECH_SAMPLERATE, RESAMPLER_TAPS
+
+def design_polyphase_filter(up: int, down: int, taps_per_phase: int = RESAMPLER_TAPS,
+                            beta: float = 8.0) -> np.ndarray:
+    """
+    Filtro paso bajo (sinc con ventana de Kaiser) a la tasa intermedia 'up' veces
+    la de entrada, repartido en 'up' fases de 'taps_per_phase' coeficientes.
+    Devuelve una matriz (fases, coeficientes) con la ganancia ya compensada.
+    """
+    length = up * taps_per_phase
+    cutoff = 0.5 / max(up, down) * 0.92  # Un poco por debajo de Nyquist para la banda de transición
+    n = np.arange(length) - (length - 1) / 2.0
+    prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+    prototype *= up / prototype.sum()
+    # Fase p usa los coeficientes p, p + up, p + 2*up...
+    return prototype.reshape(taps_per_phase, up).T.astype(np.float32)
+
+class StreamingResampler:
+    def __init__(self, input_rate: int, output_rate: int = SPEECH_SAMPLERATE,
+                 taps_per_phase: int = RESAMPLER_TAPS):
+        """
+        Remuestrea audio mono int16 trama a trama conservando el estado entre
+        llamadas (sin cortes ni clics en los bordes de las tramas). Con tasas
+        iguales devuelve la trama tal cual.
+
+        Args:
+            input_rate: Tasa del dispositivo (44100, 48000...)
+            output_rate: Tasa de salida (la del reconocedor)
+            taps_per_phase: Coeficientes por fase (más = mejor atenuación, más CPU)
+        """
+        self.input_rate = int(input_rate)
+        self.output_rate = int(output_rate)
+        divisor = gcd(self.input_rate, self.output_rate)
+        self.up = self.output_rate // divisor
+        self.down = self.input_rate // divisor
+        self.passthrough = self.up == self.down
+        self.taps = taps_per_phase
+        if not self.passthrough:
+            self._phases = design_polyphase_filter(self.up, self.down, taps_per_phase)
+            self._offsets = np.arange(taps_per_phase)
+        self.reset()
+
+    def reset(self) -> None:
+        """Olvida el historial (al cambiar de dispositivo o reiniciar la captura)"""
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        # Posición de la siguiente muestra de salida, a la tasa intermedia y
+        # relativa al inicio de [historial + trama]
+        self._next = (self.taps - 1) * self.up
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """Remuestrea una trama int16 mono y devuelve las muestras int16 de salida disponibles"""
+        if self.passthrough:
+            return frame
+        buffer = np.concatenate((self._history, frame.astype(np.float32)))
+        limit = len(buffer) * self.up
+        count = max(0, -(-(limit - self._next) // self.down))  # Techo de la división
+
+        positions = self._next + np.arange(count) * self.down
+        base = positions // self.up
+        phase = positions % self.up
+        # Muestras de entrada de cada salida (la más reciente primero) x coeficientes de su fase
+        window = buffer[base[:, None] - self._offsets[None, :]]
+        output = np.einsum('ij,ij->i', window, self._phases[phase])
+
+        consumed = len(buffer) - (self.taps - 1)
+        self._next += count * self.down - consumed * self.up
+        self._history = buffer[consumed:]
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16)
+
+    def expected_samples(self, input_samples: int) -> float:
+        """Muestras de salida que corresponden a 'input_samples' de entrada"""
+        return input_samples * self.output_rate / self.input_rate
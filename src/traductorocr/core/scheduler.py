@@ -0,0 +1,188 @@
+"""
+Planificador de tareas con un número fijo de hilos, colas por canal y
+cancelación de tareas superadas (gana la más reciente)
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from traductorocr.core.config import SCHEDULER_WORKERS
+from traductorocr.utils.stats import RollingStats
+
+class Job:
+    def __init__(self, channel: str, seq: int, func: Callable[..., Any], args: tuple,
+                 on_result: Optional[Callable[[Any], None]], on_error: Optional[Callable[[Exception], None]]):
+        self.channel = channel
+        self.seq = seq
+        self.func = func
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.submitted = time.perf_counter()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Marca la tarea como cancelada (si no ha empezado, no se ejecutará)"""
+        self.cancelled = True
+
+class _Channel:
+    def __init__(self, latest_wins: bool):
+        self.latest_wins = latest_wins
+        self.pending = deque()
+        self.last_seq = 0         # Última secuencia enviada
+        self.delivered_seq = 0    # Última secuencia cuyo resultado se entregó
+        self.running = 0
+        self.cancelled = 0
+        self.wait_stats = RollingStats()
+
+class JobScheduler:
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        """
+        Inicializa el planificador.
+
+        Args:
+            workers: Número de hilos trabajadores compartidos por todos los canales
+        """
+        self._channels: Dict[str, _Channel] = {}
+        self._order = deque()  # Canales con trabajo pendiente (reparto equitativo)
+        self._cond = threading.Condition()
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"scheduler-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def add_channel(self, name: str, latest_wins: bool = True) -> None:
+        """Registra un canal (por ejemplo 'ocr', 'inverse' o 'audio')"""
+        with self._cond:
+            if name not in self._channels:
+                self._channels[name] = _Channel(latest_wins)
+
+    def submit(self, channel: str, func: Callable[..., Any], *args,
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> Job:
+        """
+        Encola una tarea en un canal. En canales 'latest_wins' se cancelan las
+        tareas pendientes anteriores y solo se entrega el resultado si ninguna
+        tarea más reciente del canal ya entregó el suyo.
+
+        Los callbacks se ejecutan en el hilo trabajador.
+        """
+        with self._cond:
+            state = self._channels.get(channel)
+            if state is None:
+                state = self._channels[channel] = _Channel(latest_wins=True)
+            state.last_seq += 1
+            job = Job(channel, state.last_seq, func, args, on_result, on_error)
+
+            if state.latest_wins:
+                while state.pending:
+                    state.pending.popleft().cancel()
+                    state.cancelled += 1
+            state.pending.append(job)
+            self._order.append(channel)
+            self._cond.notify()
+        return job
+
+    def is_current(self, job: Job) -> bool:
+        """Indica si la tarea sigue siendo la más reciente de su canal (para abortar antes)"""
+        with self._cond:
+            state = self._channels[job.channel]
+            return not job.cancelled and (not state.latest_wins or job.seq == state.last_seq)
+
+    def _next_job(self) -> Optional[Job]:
+        """Saca la siguiente tarea siguiendo el orden de llegada entre canales"""
+        while self._order:
+            state = self._channels[self._order.popleft()]
+            while state.pending:
+                job = state.pending.popleft()
+                if not job.cancelled:
+                    return job
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if not self._running:
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+                state = self._channels[job.channel]
+                state.running += 1
+                state.wait_stats.add((time.perf_counter() - job.submitted) * 1000.0)
+
+            error = None
+            result = None
+            try:
+                result = job.func(*job.args)
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                state.running -= 1
+                deliver = not job.cancelled and job.seq > state.delivered_seq
+                if deliver and state.latest_wins:
+                    state.delivered_seq = job.seq
+                elif not deliver:
+                    state.cancelled += 1
+
+            if not deliver:
+                continue
+            try:
+                if error is not None:
+                    if job.on_error:
+                        job.on_error(error)
+                    else:
+                        print(f"Error en tarea del canal '{job.channel}': {error}")
+                elif job.on_result:
+                    job.on_result(result)
+            except Exception as e:
+                print(f"Error en callback del canal '{job.channel}': {e}")
+
+    def metrics(self) -> Dict[str, dict]:
+        """Devuelve profundidad de cola, tareas en curso, canceladas y tiempo de espera por canal"""
+        with self._cond:
+            return {
+                name: {
+                    "queue_depth": sum(1 for job in state.pending if not job.cancelled),
+                    "running": state.running,
+                    "submitted": state.last_seq,
+                    "cancelled": state.cancelled,
+                    "wait": state.wait_stats.summary(),
+                }
+                for name, state in self._channels.items()
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Detiene los hilos trabajadores cuando terminen las tareas pendientes"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+_shared_scheduler: Optional[JobScheduler] = None
+_shared_lock = threading.Lock()
+
+def get_scheduler() -> JobScheduler:
+    """Devuelve el planificador compartido por OCR, traducción inversa y audio"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = JobScheduler()
+            _shared_scheduler.add_channel('ocr', latest_wins=True)
+            _shared_scheduler.add_channel('inverse', latest_wins=True)
+            # Cada trozo de subtítulo confirmado debe llegar (SubtitleStream los ordena)
+            _shared_scheduler.add_channel('audio', latest_wins=False)
+        return _shared_scheduler
+
+def current_scheduler() -> Optional[JobScheduler]:
+    """Devuelve el planificador compartido solo si ya se creó"""
+    with _shared_lock:
+        return _shared_scheduler
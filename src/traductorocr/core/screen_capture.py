@@ -0,0 +1,79 @@
+"""
+Sesión de captura de pantalla persistente (un manejador de mss por hilo)
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from mss import mss
+
+from traductorocr.utils.stats import RollingStats
+
+def box_to_monitor(box) -> Dict[str, int]:
+    """Convierte una caja (x, y, ancho, alto) de AreaSelector al formato de mss"""
+    return {
+        "top": int(box[1]),
+        "left": int(box[0]),
+        "width": int(box[2]),
+        "height": int(box[3])
+    }
+
+class CaptureSession:
+    def __init__(self):
+        """
+        Mantiene abierto el manejador de mss y un buffer BGRA preasignado para la
+        zona actual, evitando reinicializar la pantalla y copiar a un array nuevo
+        en cada captura. Debe usarse siempre desde el mismo hilo.
+        """
+        self._sct = mss()
+        self._monitor: Optional[Dict[str, int]] = None
+        self._buffer: Optional[np.ndarray] = None
+        self.stats = RollingStats()
+
+    def _prepare(self, box) -> None:
+        """Reasigna el buffer solo si cambia el tamaño de la zona"""
+        monitor = box_to_monitor(box)
+        if monitor == self._monitor:
+            return
+        shape = (monitor["height"], monitor["width"], 4)
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = np.empty(shape, dtype=np.uint8)
+        self._monitor = monitor
+
+    def grab(self, box) -> np.ndarray:
+        """
+        Captura la zona y devuelve la imagen BGRA.
+        El array devuelto se reutiliza en la siguiente captura de esta sesión:
+        copiarlo si se necesita conservarlo.
+        """
+        started = time.perf_counter()
+        self._prepare(box)
+        sct_img = self._sct.grab(self._monitor)
+        height, width = self._buffer.shape[:2]
+        # Vista sobre los bytes crudos de mss, copiada al buffer preasignado
+        raw = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(height, width, 4)
+        np.copyto(self._buffer, raw)
+        self.stats.add((time.perf_counter() - started) * 1000.0)
+        return self._buffer
+
+    def close(self) -> None:
+        """Cierra el manejador de mss"""
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+_thread_sessions = threading.local()
+
+def get_capture_session() -> CaptureSession:
+    """Devuelve la sesión de captura del hilo actual (se crea la primera vez)"""
+    session = getattr(_thread_sessions, 'session', None)
+    if session is None:
+        session = _thread_sessions.session = CaptureSession()
+    return session
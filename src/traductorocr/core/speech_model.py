@@ -0,0 +1,199 @@
+"""
+Aprovisionamiento, carga y calentamiento del modelo de voz (Vosk) en segundo plano
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, Union
+
+from traductorocr.core.config import SPEECH_SAMPLERATE, SPEECH_WARMUP_SECONDS, SPEECH_WORKER_PROCESSES
+from traductorocr.utils.paths import resource_path
+from traductorocr.utils.voice_models import MODEL_DIR, ensure_model
+
+if TYPE_CHECKING:
+    from traductorocr.core.speech_workers import LocalRecognizer, RemoteRecognizer, SpeechWorkerPool
+
+class ModelStatus(NamedTuple):
+    state: str       # idle, verifying, downloading, extracting, provisioned, loading, warming, ready, error
+    progress: float  # 0-1 dentro del estado actual
+    message: str
+
+StatusListener = Callable[[ModelStatus], None]
+
+class SpeechModelLoader:
+    def __init__(self, model_path: Optional[str] = None, workers: int = SPEECH_WORKER_PROCESSES):
+        """
+        Prepara el modelo de voz sin bloquear la interfaz: un hilo verifica (o
+        descarga) el modelo y, cuando se pide, lo carga y lo calienta con un
+        bloque de silencio. 'ready' se activa cuando ya se pueden crear reconocedores.
+
+        Con workers > 0 el modelo se carga en procesos de reconocimiento, uno
+        por fuente activa hasta ese máximo, y no en el de la interfaz (ver
+        SpeechWorkerPool).
+
+        Args:
+            model_path: Carpeta del modelo (por defecto, la del proyecto)
+            workers: Máximo de procesos de reconocimiento (0 = decodificar en este proceso)
+        """
+        self.model_path = model_path or resource_path(MODEL_DIR)
+        self.workers = workers
+        self.pool: Optional["SpeechWorkerPool"] = None
+        self.provisioned = threading.Event()
+        self.ready = threading.Event()
+        self.model = None
+        self.error: Optional[str] = None
+        self.status = ModelStatus("idle", 0.0, "Modelo de voz sin cargar")
+        self.load_ms: Optional[float] = None
+
+        self._listeners: List[StatusListener] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._load_requested = False
+        self._warm_recognizer = None
+
+    def add_listener(self, listener: StatusListener) -> None:
+        """Registra un callback de progreso (se llama desde el hilo del cargador)"""
+        self._listeners.append(listener)
+        listener(self.status)
+
+    def _set_status(self, state: str, progress: float, message: str) -> None:
+        self.status = ModelStatus(state, progress, message)
+        for listener in list(self._listeners):
+            try:
+                listener(self.status)
+            except Exception as e:
+                print(f"Error notificando el estado del modelo de voz: {e}")
+
+    def provision(self) -> None:
+        """Verifica o descarga el modelo en segundo plano (sin cargarlo en memoria)"""
+        self._ensure_thread()
+
+    def load(self) -> None:
+        """Verifica, carga y calienta el modelo en segundo plano"""
+        with self._lock:
+            self._load_requested = True
+        self._ensure_thread()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que el modelo esté listo"""
+        return self.ready.wait(timeout)
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self.ready.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return
+            self.error = None
+            self._thread = threading.Thread(target=self._run, name="speech-model", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            if not self.provisioned.is_set():
+                ensure_model(self.model_path, progress=self._set_status)
+                self.provisioned.set()
+                self._set_status("provisioned", 1.0, "Modelo de voz verificado")
+            while True:
+                with self._lock:
+                    if not self._load_requested or self.ready.is_set():
+                        self._thread = None
+                        return
+                self._load()
+        except Exception as e:
+            with self._lock:
+                self._thread = None
+            self.error = str(e)
+            print(f"Error al preparar el modelo de voz: {e}")
+            self._set_status("error", 0.0, f"Error en el modelo de voz: {e}")
+
+    def _load(self) -> None:
+        """Carga el modelo y lo calienta (las primeras decodificaciones paginan el grafo)"""
+        if self.workers > 0:
+            self._load_workers()
+            return
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+
+        SetLogLevel(-1)
+        started = time.perf_counter()
+        self._set_status("loading", 0.0, "Cargando modelo de voz...")
+        model = Model(self.model_path)
+
+        self._set_status("warming", 0.5, "Preparando reconocimiento de voz...")
+        recognizer = KaldiRecognizer(model, SPEECH_SAMPLERATE)
+        silence = bytes(2 * int(SPEECH_SAMPLERATE * SPEECH_WARMUP_SECONDS))  # int16 a cero
+        recognizer.AcceptWaveform(silence)
+        recognizer.FinalResult()  # Reinicia el reconocedor para reutilizarlo
+
+        self.model = model
+        self._warm_recognizer = recognizer
+        self.load_ms = (time.perf_counter() - started) * 1000.0
+        self.ready.set()
+        self._set_status("ready", 1.0, f"Modelo de voz listo ({self.load_ms:.0f} ms)")
+
+    def _load_workers(self) -> None:
+        """Lanza el primer proceso de reconocimiento, que carga y calienta el modelo"""
+        from traductorocr.core.speech_workers import SpeechWorkerPool
+
+        self._set_status("loading", 0.0, "Cargando modelo de voz...")
+        pool = SpeechWorkerPool(self.model_path, self.workers)
+        pool.start()
+        try:
+            self.load_ms = pool.wait_ready()
+        except Exception:
+            pool.shutdown()
+            raise
+        self.pool = pool
+        self.ready.set()
+        self._set_status("ready", 1.0, f"Modelo de voz listo ({self.load_ms:.0f} ms)")
+
+    def open_recognizer(self, on_partial: Callable[[str], None],
+                        on_final: Callable[[str], None]) -> Union["LocalRecognizer", "RemoteRecognizer"]:
+        """
+        Crea un reconocedor a SPEECH_SAMPLERATE para una fuente de audio: en un
+        proceso de reconocimiento o, con workers = 0, en este proceso. Los
+        resultados parciales y finales llegan a los callbacks.
+        """
+        if not self.ready.is_set():
+            raise RuntimeError("El modelo de voz aún no está listo")
+        if self.pool is not None:
+            return self.pool.open_recognizer(on_partial, on_final)
+        from traductorocr.core.speech_workers import LocalRecognizer
+        return LocalRecognizer(self.create_recognizer(), on_partial, on_final)
+
+    def shutdown(self) -> None:
+        """Detiene los procesos de reconocimiento (el modelo habrá que volver a cargarlo)"""
+        with self._lock:
+            pool, self.pool = self.pool, None
+            if pool is not None:
+                self.ready.clear()
+        if pool is not None:
+            pool.shutdown()
+
+    def create_recognizer(self, samplerate: int = SPEECH_SAMPLERATE):
+        """Devuelve un reconocedor en este proceso (el ya calentado la primera vez, si coincide la tasa)"""
+        if not self.ready.is_set():
+            raise RuntimeError("El modelo de voz aún no está listo")
+        if self.model is None:
+            raise RuntimeError("El modelo de voz se cargó en los procesos de reconocimiento")
+        with self._lock:
+            recognizer, self._warm_recognizer = self._warm_recognizer, None
+        if recognizer is not None and samplerate == SPEECH_SAMPLERATE:
+            return recognizer
+        from vosk import KaldiRecognizer
+        return KaldiRecognizer(self.model, samplerate)
+
+_shared_loader: Optional[SpeechModelLoader] = None
+_shared_lock = threading.Lock()
+
+def get_speech_model_loader() -> SpeechModelLoader:
+    """Devuelve el cargador compartido del modelo de voz"""
+    global _shared_loader
+    with _shared_lock:
+        if _shared_loader is None:
+            _shared_loader = SpeechModelLoader()
+        return _shared_loader
+
+def shutdown_speech_workers() -> None:
+    """Detiene los procesos de reconocimiento del cargador compartido, si se llegaron a lanzar"""
+    with _shared_lock:
+        loader = _shared_loader
+    if loader is not None:
+        loader.shutdown()
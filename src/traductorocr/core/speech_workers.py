@@ -0,0 +1,363 @@
+"""
+Decodificación de voz fuera del proceso de la interfaz: cada proceso trabajador
+carga el modelo de Vosk una sola vez y atiende los reconocedores de sus fuentes
+de audio, cada uno en su propio hilo
+"""
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from traductorocr.core.config import SPEECH_SAMPLERATE, SPEECH_WARMUP_SECONDS
+from traductorocr.utils.stats import RollingStats
+
+TextCallback = Callable[[str], None]
+
+class SpeechWorkerError(RuntimeError):
+    """El proceso de reconocimiento de voz no está disponible"""
+
+# --- Proceso trabajador ---------------------------------------------------------
+
+def _decode_stream(recognizer, inbox: "queue.Queue", responses, stream_id: int) -> None:
+    """Hilo de un reconocedor dentro del trabajador (Vosk suelta el GIL al decodificar)"""
+    while True:
+        message = inbox.get()
+        op = message[0]
+        if op == 'audio':
+            started = time.perf_counter()
+            if recognizer.AcceptWaveform(message[1]):
+                kind, text = 'result', json.loads(recognizer.Result()).get('text', '')
+            else:
+                kind, text = 'partial', json.loads(recognizer.PartialResult()).get('partial', '')
+            responses.put((kind, stream_id, text.strip(), (time.perf_counter() - started) * 1000.0))
+        elif op == 'finish':
+            started = time.perf_counter()
+            text = json.loads(recognizer.FinalResult()).get('text', '')
+            responses.put(('finished', stream_id, text.strip(), (time.perf_counter() - started) * 1000.0))
+        else:  # close
+            responses.put(('closed', stream_id, '', 0.0))
+            return
+
+def _worker_main(model_path: str, samplerate: int, requests, responses) -> None:
+    """Punto de entrada del proceso: carga y calienta el modelo y reparte los mensajes por reconocedor"""
+    try:
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+
+        SetLogLevel(-1)
+        started = time.perf_counter()
+        model = Model(model_path)
+        recognizer = KaldiRecognizer(model, samplerate)
+        recognizer.AcceptWaveform(bytes(2 * int(samplerate * SPEECH_WARMUP_SECONDS)))
+        recognizer.FinalResult()
+        responses.put(('ready', -1, '', (time.perf_counter() - started) * 1000.0))
+    except Exception as e:
+        responses.put(('error', -1, str(e), 0.0))
+        return
+
+    inboxes: Dict[int, queue.Queue] = {}
+    while True:
+        message = requests.get()
+        op, stream_id = message[0], message[1]
+        if op == 'stop':
+            break
+        if op == 'open':
+            inbox = inboxes[stream_id] = queue.Queue()
+            # El primer reconocedor reutiliza el ya calentado
+            stream_recognizer = recognizer if recognizer is not None else KaldiRecognizer(model, samplerate)
+            recognizer = None
+            threading.Thread(target=_decode_stream, args=(stream_recognizer, inbox, responses, stream_id),
+                             name=f"speech-stream-{stream_id}", daemon=True).start()
+            continue
+        inbox = inboxes.get(stream_id)
+        if inbox is None:
+            continue
+        inbox.put((op,) + message[2:])
+        if op == 'close':
+            del inboxes[stream_id]
+    for inbox in inboxes.values():
+        inbox.put(('close',))
+
+# --- Lado de la interfaz --------------------------------------------------------
+
+class LocalRecognizer:
+    def __init__(self, recognizer, on_partial: TextCallback, on_final: TextCallback):
+        """
+        Reconocedor en el propio proceso (SPEECH_WORKER_PROCESSES = 0), con la
+        misma interfaz que RemoteRecognizer: los callbacks se llaman en el hilo
+        que entrega el audio.
+        """
+        self.recognizer = recognizer
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.decode_ms = RollingStats()
+
+    def accept(self, audio: np.ndarray) -> None:
+        """Decodifica audio int16 a SPEECH_SAMPLERATE"""
+        started = time.perf_counter()
+        is_final = self.recognizer.AcceptWaveform(audio.tobytes())
+        self.decode_ms.add((time.perf_counter() - started) * 1000.0)
+        if is_final:
+            self.on_final(json.loads(self.recognizer.Result()).get('text', '').strip())
+        else:
+            self.on_partial(json.loads(self.recognizer.PartialResult()).get('partial', '').strip())
+
+    def finish(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """Cierra la frase actual con el resultado final"""
+        self.on_final(json.loads(self.recognizer.FinalResult()).get('text', '').strip())
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, object]:
+        return {"process": "local", "decode_ms": self.decode_ms.summary()}
+
+class RemoteRecognizer:
+    def __init__(self, worker: "_WorkerHandle", stream_id: int,
+                 on_partial: TextCallback, on_final: TextCallback):
+        """
+        Reconocedor que vive en un proceso trabajador. accept() y finish() solo
+        encolan; los resultados llegan a los callbacks desde el hilo lector del
+        trabajador, en el mismo orden en que se envió el audio.
+        """
+        self.worker = worker
+        self.stream_id = stream_id
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.decode_ms = RollingStats()
+        self.frames_sent = 0
+        self._finishes_sent = 0
+        self._finishes_done = 0
+        self._finished = threading.Condition()
+
+    def accept(self, audio: np.ndarray) -> None:
+        """Envía audio int16 a SPEECH_SAMPLERATE al trabajador"""
+        self.worker.send(('audio', self.stream_id, audio.tobytes()))
+        self.frames_sent += 1
+
+    def finish(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Pide el resultado final de la frase actual. Con wait=True espera a que
+        se haya entregado (False si se agota 'timeout' o el trabajador terminó).
+        """
+        with self._finished:
+            self._finishes_sent += 1
+            target = self._finishes_sent
+        self.worker.send(('finish', self.stream_id))
+        if not wait:
+            return True
+        with self._finished:
+            return self._finished.wait_for(
+                lambda: self._finishes_done >= target or self.worker.error is not None, timeout
+            ) and self._finishes_done >= target
+
+    def close(self) -> None:
+        """Libera el reconocedor en el trabajador"""
+        self.worker.release(self)
+
+    def _dispatch(self, kind: str, text: str, decode_ms: float) -> None:
+        if kind == 'partial':
+            self.decode_ms.add(decode_ms)
+            self.on_partial(text)
+        elif kind == 'result':
+            self.decode_ms.add(decode_ms)
+            self.on_final(text)
+        elif kind == 'finished':
+            self.on_final(text)
+            with self._finished:
+                self._finishes_done += 1
+                self._finished.notify_all()
+
+    def _fail(self) -> None:
+        with self._finished:
+            self._finished.notify_all()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "process": self.worker.pid,
+            "frames": self.frames_sent,
+            "decode_ms": self.decode_ms.summary(),
+        }
+
+class _WorkerHandle:
+    def __init__(self, context, model_path: str, samplerate: int, index: int):
+        self.index = index
+        self.requests = context.Queue()
+        self.responses = context.Queue()
+        self.process = context.Process(
+            target=_worker_main, args=(model_path, samplerate, self.requests, self.responses),
+            name=f"speech-worker-{index}", daemon=True
+        )
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self.streams: Dict[int, RemoteRecognizer] = {}
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_responses, name=f"speech-worker-{index}-reader",
+                                        daemon=True)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def start(self) -> None:
+        self.process.start()
+        self._reader.start()
+
+    def send(self, message: tuple) -> None:
+        if self.error is not None:
+            raise SpeechWorkerError(self.error)
+        self.requests.put(message)
+
+    def open(self, stream: RemoteRecognizer) -> None:
+        with self._lock:
+            self.streams[stream.stream_id] = stream
+        self.send(('open', stream.stream_id))
+
+    def release(self, stream: RemoteRecognizer) -> None:
+        if self.error is None:
+            self.requests.put(('close', stream.stream_id))
+        else:
+            with self._lock:
+                self.streams.pop(stream.stream_id, None)
+
+    def _read_responses(self) -> None:
+        """Entrega los resultados del trabajador a cada reconocedor (en orden)"""
+        while True:
+            try:
+                message = self.responses.get(timeout=0.5)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    self._fail(f"El proceso de voz {self.index} terminó inesperadamente "
+                               f"(código {self.process.exitcode})")
+                    return
+                continue
+            if message is None:
+                return
+            kind, stream_id, text, value = message
+            if kind == 'ready':
+                self.load_ms = value
+                self.ready.set()
+            elif kind == 'error':
+                self._fail(text)
+                return
+            elif kind == 'closed':
+                with self._lock:
+                    self.streams.pop(stream_id, None)
+            else:
+                stream = self.streams.get(stream_id)
+                if stream is not None:
+                    try:
+                        stream._dispatch(kind, text, value)
+                    except Exception as e:
+                        print(f"Error entregando el resultado de voz: {e}")
+
+    def _fail(self, error: str) -> None:
+        self.error = error
+        self.ready.set()
+        with self._lock:
+            streams = list(self.streams.values())
+        for stream in streams:
+            stream._fail()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self.process.is_alive():
+            self.requests.put(('stop', -1))
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.responses.put(None)
+        self._reader.join(timeout)
+
+class SpeechWorkerPool:
+    def __init__(self, model_path: str, processes: int = 1, samplerate: int = SPEECH_SAMPLERATE):
+        """
+        Procesos de reconocimiento de voz. Al arrancar se lanza uno solo; cada
+        fuente de audio nueva recibe su propio proceso (que carga su copia del
+        modelo) mientras no se supere 'processes' ni el número de núcleos, de
+        modo que un fallo de Vosk con una fuente no se lleva a las demás. Por
+        encima de ese límite las fuentes comparten el trabajador con menos
+        carga, cada una en su hilo: Vosk suelta el GIL al decodificar.
+
+        Se usa siempre 'spawn' (el único método en Windows): hacer fork de un
+        proceso con la interfaz y el planificador en marcha no es seguro.
+
+        Args:
+            model_path: Carpeta del modelo de Vosk
+            processes: Número máximo de procesos trabajadores
+            samplerate: Tasa del audio que se les envía
+        """
+        self.model_path = model_path
+        self.samplerate = samplerate
+        self.max_processes = max(1, min(processes, os.cpu_count() or 1))
+        self._context = multiprocessing.get_context('spawn')
+        self.workers: List[_WorkerHandle] = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _spawn_worker(self) -> _WorkerHandle:
+        worker = _WorkerHandle(self._context, self.model_path, self.samplerate, len(self.workers))
+        self.workers.append(worker)
+        worker.start()
+        return worker
+
+    def start(self) -> None:
+        """Lanza el primer proceso (carga el modelo); los demás se lanzan con cada fuente nueva"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._spawn_worker()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> float:
+        """Espera a que los trabajadores lanzados tengan el modelo cargado y devuelve el tiempo de carga (ms)"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for worker in list(self.workers):
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not worker.ready.wait(remaining):
+                raise SpeechWorkerError("Tiempo de espera agotado cargando el modelo de voz")
+            if worker.error is not None:
+                raise SpeechWorkerError(worker.error)
+        return max(worker.load_ms or 0.0 for worker in self.workers)
+
+    def open_recognizer(self, on_partial: TextCallback, on_final: TextCallback) -> RemoteRecognizer:
+        """
+        Crea un reconocedor en un trabajador libre o, si no lo hay y no se ha
+        llegado al límite, en un proceso nuevo. No espera a que este cargue el
+        modelo: el audio se encola y se decodifica en cuanto esté listo.
+        """
+        with self._lock:
+            if not self._started:
+                raise SpeechWorkerError("Los procesos de voz están detenidos")
+            alive = [worker for worker in self.workers if worker.error is None]
+            worker = min(alive, key=lambda w: len(w.streams)) if alive else None
+            if (worker is None or worker.streams) and len(self.workers) < self.max_processes:
+                worker = self._spawn_worker()
+            if worker is None:
+                raise SpeechWorkerError(self.workers[-1].error or "No hay procesos de voz disponibles")
+            stream = RemoteRecognizer(worker, next(self._ids), on_partial, on_final)
+            worker.open(stream)
+        return stream
+
+    def shutdown(self) -> None:
+        """Detiene los procesos trabajadores"""
+        with self._lock:
+            started, self._started = self._started, False
+        if started:
+            for worker in list(self.workers):
+                worker.stop()
+
+    def stats(self) -> List[Dict[str, object]]:
+        return [
+            {"pid": worker.pid, "streams": len(worker.streams),
+             "load_ms": round(worker.load_ms, 1) if worker.load_ms is not None else None,
+             "error": worker.error}
+            for worker in self.workers
+        ]
@@ -0,0 +1,195 @@
+"""
+Subtítulos incrementales: se confirman y traducen los trozos estables de los
+resultados parciales de Vosk en cuanto se asientan, sin volver a traducir lo ya
+confirmado
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from traductorocr.core.config import SUBTITLE_MIN_WORDS, SUBTITLE_STABLE_MS
+from traductorocr.utils import profiling
+from traductorocr.utils.stats import RollingStats
+
+def common_prefix(a: List[str], b: List[str]) -> int:
+    """Número de palabras iniciales iguales en las dos listas"""
+    length = 0
+    for word_a, word_b in zip(a, b):
+        if word_a != word_b:
+            break
+        length += 1
+    return length
+
+class SubtitleStream:
+    def __init__(self, translate: Callable[[str], str], on_subtitle: Callable[[str], None],
+                 scheduler=None, channel: str = 'audio',
+                 min_words: int = SUBTITLE_MIN_WORDS, stable_ms: float = SUBTITLE_STABLE_MS):
+        """
+        Sigue el prefijo estable de los resultados parciales sucesivos. Una palabra
+        es estable cuando dos parciales seguidos coinciden hasta ella, o cuando el
+        parcial lleva 'stable_ms' sin cambiar. Cada trozo estable nuevo (al menos
+        'min_words' palabras) se traduce por separado y se añade al subtítulo de
+        la frase: solo se traduce el sufijo nuevo.
+
+        Si el resultado final de Vosk corrige palabras ya confirmadas, se traduce
+        la frase final entera y reemplaza al subtítulo.
+
+        Args:
+            translate: Traduce un texto (se ejecuta en el planificador si se indica)
+            on_subtitle: Recibe el subtítulo completo de la frase actual
+            scheduler: Planificador donde traducir (None = en el hilo que llama)
+            channel: Canal del planificador (no debe ser 'latest_wins': se necesitan todos los trozos)
+            min_words: Palabras estables mínimas para confirmar un trozo antes del final
+            stable_ms: Tiempo sin cambios tras el que el parcial entero se da por estable
+        """
+        self.translate = translate
+        self.on_subtitle = on_subtitle
+        self.scheduler = scheduler
+        self.channel = channel
+        self.min_words = min_words
+        self.stable_s = stable_ms / 1000.0
+
+        self._lock = threading.Lock()
+        self.latency = RollingStats()          # Palabra oída -> su traducción en pantalla
+        self.utterance_latency = RollingStats()  # Fin de la frase -> subtítulo completo
+        self.chunks_committed = 0
+        self.corrections = 0
+        self.words_translated = 0
+        self._utterance = 0
+        self._display = 0      # Frase que se está mostrando
+        self._translations: Dict[int, List[Optional[str]]] = {}
+        self._pending: List[tuple] = []  # Trozos confirmados por encolar (fuera del candado)
+        self._finished_at: Dict[int, float] = {}
+        self.outstanding = 0   # Traducciones encoladas sin entregar
+        self._reset_utterance()
+
+    def _reset_utterance(self) -> None:
+        self._previous: List[str] = []
+        self._first_seen: List[float] = []   # Momento en que se oyó cada palabra del parcial
+        self._committed: List[str] = []
+        self._last_change = 0.0
+
+    def update(self, partial: str, now: Optional[float] = None) -> None:
+        """Procesa un nuevo resultado parcial de la frase actual"""
+        now = time.perf_counter() if now is None else now
+        words = partial.split()
+        with self._lock:
+            agreed = common_prefix(words, self._previous)
+            if words != self._previous:
+                self._first_seen = self._first_seen[:agreed] + [now] * (len(words) - agreed)
+                self._last_change = now
+            previous, self._previous = self._previous, words
+
+            # Estable = coincide con el parcial anterior y no contradice lo ya confirmado
+            committed = len(self._committed)
+            if previous and common_prefix(words, self._committed) == committed \
+                    and agreed - committed >= self.min_words:
+                self._commit(words[committed:agreed])
+        self._flush()
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Sin audio nuevo: confirma el parcial entero si lleva 'stable_ms' sin cambiar"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            committed = len(self._committed)
+            if len(self._previous) > committed and now - self._last_change >= self.stable_s \
+                    and common_prefix(self._previous, self._committed) == committed:
+                self._commit(self._previous[committed:])
+        self._flush()
+
+    def finish(self, final: str, now: Optional[float] = None) -> None:
+        """Cierra la frase con el resultado final de Vosk"""
+        now = time.perf_counter() if now is None else now
+        words = final.split()
+        with self._lock:
+            committed = len(self._committed)
+            if common_prefix(words, self._committed) == committed:
+                if len(words) > committed:
+                    self._first_seen += [now] * (len(words) - len(self._first_seen))
+                    self._commit(words[committed:])
+            elif words:
+                # El final corrige lo confirmado: traducir la frase entera como una frase nueva
+                self.corrections += 1
+                self._utterance += 1
+                self._committed = []
+                self._first_seen = [min(self._first_seen, default=now)] * len(words)
+                self._commit(words)
+            if self._translations.get(self._utterance):
+                self._finished_at[self._utterance] = now
+                self._check_complete(self._utterance)
+            self._utterance += 1
+            self._reset_utterance()
+        self._flush()
+
+    def _commit(self, words: List[str]) -> None:
+        """Confirma un trozo y encola su traducción (con el candado tomado)"""
+        start = len(self._committed)
+        heard = min(self._first_seen[start:start + len(words)], default=time.perf_counter())
+        self._committed = self._committed + words
+        slots = self._translations.setdefault(self._utterance, [])
+        slots.append(None)
+        self.chunks_committed += 1
+        self.words_translated += len(words)
+        self.outstanding += 1
+
+        self._pending.append((" ".join(words), (self._utterance, len(slots) - 1, heard)))
+
+    def _flush(self) -> None:
+        """Encola (o ejecuta, sin planificador) las traducciones de los trozos confirmados"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for text, args in pending:
+            if self.scheduler is None:
+                self._deliver(args, self.translate(text))
+            else:
+                self.scheduler.submit(self.channel, self.translate, text,
+                                      on_result=lambda translation, args=args: self._deliver(args, translation),
+                                      on_error=lambda error, args=args: self._deliver(args, f"Error al traducir: {error}"))
+
+    def _deliver(self, args, translation: str) -> None:
+        utterance, index, heard = args
+        latency_ms = (time.perf_counter() - heard) * 1000.0
+        with self._lock:
+            self.outstanding -= 1
+            if utterance < self._display:
+                return  # Ya se muestra una frase más reciente
+            slots = self._translations.get(utterance)
+            if slots is None:
+                return
+            slots[index] = translation or ""
+            if utterance > self._display:
+                for old in [key for key in self._translations if key < utterance]:
+                    del self._translations[old]
+                    self._finished_at.pop(old, None)
+                self._display = utterance
+            self._check_complete(utterance)
+            # Solo los trozos contiguos ya traducidos (el orden de las frases se conserva)
+            ready = []
+            for chunk in slots:
+                if chunk is None:
+                    break
+                ready.append(chunk)
+            subtitle = " ".join(chunk for chunk in ready if chunk)
+
+        self.latency.add(latency_ms)
+        if profiling.is_enabled():
+            profiling.record('audio.subtitle_latency', latency_ms)
+        if ready:
+            self.on_subtitle(subtitle)
+
+    def _check_complete(self, utterance: int) -> None:
+        """Registra la latencia de la frase cuando ya está cerrada y traducida entera"""
+        finished_at = self._finished_at.get(utterance)
+        if finished_at is not None and None not in self._translations[utterance]:
+            del self._finished_at[utterance]
+            self.utterance_latency.add(max(0.0, time.perf_counter() - finished_at) * 1000.0)
+
+    def stats(self) -> Dict[str, object]:
+        """Latencia voz -> subtítulo (desde que se oye la palabra) y trozos traducidos"""
+        return {
+            "latency": self.latency.summary(),
+            "utterance_latency": self.utterance_latency.summary(),
+            "chunks": self.chunks_committed,
+            "words_translated": self.words_translated,
+            "corrections": self.corrections,
+        }
@@ -0,0 +1,244 @@
+"""
+Backends de traducción intercambiables (HTTP con conexiones reutilizadas,
+sin conexión y servidor local de pruebas)
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from traductorocr.core.config import (
+    TRANSLATION_BACKEND,
+    TRANSLATION_POOL_SIZE,
+    TRANSLATION_TIMEOUT,
+    STUB_SERVER_URL,
+    OFFLINE_GLOSSARY_FILE,
+    BATCH_MAX_CHARS
+)
+from traductorocr.core.batch_translator import translate_packed
+from traductorocr.core.translation_cache import normalize_text
+from traductorocr.utils.paths import user_data_path
+
+class TranslationBackend:
+    """Interfaz común de los backends de traducción"""
+    name = "base"
+    max_chars = BATCH_MAX_CHARS
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        """Traduce varios textos; por defecto los empaqueta con separadores en una petición"""
+        return translate_packed(lambda text: self.translate(text, source, target), texts, self.max_chars)
+
+    def close(self) -> None:
+        pass
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    """Crea una sesión HTTP que mantiene las conexiones abiertas (keep-alive)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class GoogleHttpBackend(TranslationBackend):
+    name = "google"
+    url = "https://translate.googleapis.com/translate_a/single"
+    max_chars = 1800  # La petición va en la URL (GET)
+
+    def __init__(self, pool_size: int = TRANSLATION_POOL_SIZE, timeout: float = TRANSLATION_TIMEOUT):
+        """Traductor de Google sobre una sesión HTTP compartida"""
+        self.session = _pooled_session(pool_size)
+        self.timeout = timeout
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        if not text.strip():
+            return text
+        response = self.session.get(
+            self.url,
+            params={"client": "gtx", "sl": source, "tl": target, "dt": "t", "q": text},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        return "".join(part[0] for part in data[0] if part and part[0])
+
+    def close(self) -> None:
+        self.session.close()
+
+class DeepTranslatorBackend(TranslationBackend):
+    name = "deep_translator"
+
+    def __init__(self):
+        """Backend anterior basado en deep_translator (una sesión nueva por llamada)"""
+        self._translators: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        from deep_translator import GoogleTranslator
+        with self._lock:
+            translator = self._translators.get((source, target))
+            if translator is None:
+                translator = self._translators[(source, target)] = GoogleTranslator(source=source, target=target)
+        return translator.translate(text)
+
+class DictionaryBackend(TranslationBackend):
+    name = "dictionary"
+    _TOKEN_RE = re.compile(r"(\w+(?:'\w+)?)")
+
+    def __init__(self, glossary_path: Optional[str] = None):
+        """
+        Traductor sin conexión basado en un glosario JSON:
+        {"en-es": {"press a to continue": "pulsa A para continuar", "key": "llave"}}
+        Primero busca la frase completa y, si no existe, traduce palabra a palabra.
+        """
+        self.glossary: Dict[str, Dict[str, str]] = {}
+        path = glossary_path or user_data_path(OFFLINE_GLOSSARY_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                raw = json.load(f)
+            for pair, entries in raw.items():
+                self.glossary[pair] = {normalize_text(k).lower(): v for k, v in entries.items()}
+        except FileNotFoundError:
+            print(f"Glosario sin conexión no encontrado: {path}")
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar el glosario sin conexión: {e}")
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        entries = self.glossary.get(f"{source}-{target}", {})
+        phrase = entries.get(normalize_text(text).lower())
+        if phrase is not None:
+            return phrase
+        return self._TOKEN_RE.sub(lambda m: entries.get(m.group(1).lower(), m.group(1)), text)
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        return [self.translate(text, source, target) for text in texts]
+
+class ArgosBackend(TranslationBackend):
+    name = "argos"
+
+    def __init__(self):
+        """Traductor neuronal local (argostranslate), si está instalado con sus modelos"""
+        from argostranslate import translate as argos_translate
+        self._argos = argos_translate
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        return self._argos.translate(text, source, target)
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        return [self.translate(text, source, target) for text in texts]
+
+class StubServerBackend(TranslationBackend):
+    name = "stub"
+
+    def __init__(self, url: str = STUB_SERVER_URL, pool_size: int = TRANSLATION_POOL_SIZE,
+                 timeout: float = TRANSLATION_TIMEOUT):
+        """Cliente del servidor local de pruebas (ver StubTranslationServer)"""
+        self.url = url.rstrip('/')
+        self.session = _pooled_session(pool_size)
+        self.timeout = timeout
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        return self.translate_batch([text], source, target)[0]
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        response = self.session.post(
+            f"{self.url}/translate",
+            json={"source": source, "target": target, "texts": texts},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["translations"]
+
+    def close(self) -> None:
+        self.session.close()
+
+class StubTranslationServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0):
+        """
+        Servidor HTTP local que "traduce" de forma determinista ("[es] texto"),
+        para pruebas y benchmarks sin red.
+
+        Args:
+            host: Interfaz donde escuchar
+            port: Puerto (0 = uno libre)
+            latency_ms: Retardo artificial por petición para simular la red
+        """
+        latency = latency_ms / 1000.0
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+            disable_nagle_algorithm = True  # Evita el retardo de ~40 ms por ACK diferido
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                request = json.loads(body or b'{}')
+                if latency:
+                    time.sleep(latency)
+                target = request.get("target", "")
+                payload = json.dumps({
+                    "translations": [f"[{target}] {text}" for text in request.get("texts", [])]
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubTranslationServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+def create_backend(name: str = TRANSLATION_BACKEND) -> TranslationBackend:
+    """Crea el backend indicado en la configuración ('google', 'offline', 'stub', ...)"""
+    name = name.lower()
+    if name == "google":
+        return GoogleHttpBackend()
+    if name == "deep_translator":
+        return DeepTranslatorBackend()
+    if name == "stub":
+        return StubServerBackend()
+    if name == "dictionary":
+        return DictionaryBackend()
+    if name in ("offline", "argos"):
+        try:
+            return ArgosBackend()
+        except ImportError:
+            if name == "argos":
+                raise
+            print("argostranslate no está instalado, usando el glosario sin conexión")
+            return DictionaryBackend()
+    raise ValueError(f"Backend de traducción desconocido: {name}")
+
+_shared_backend: Optional[TranslationBackend] = None
+_shared_lock = threading.Lock()
+
+def get_translation_backend() -> TranslationBackend:
+    """Devuelve el backend configurado (compartido por toda la aplicación)"""
+    global _shared_backend
+    with _shared_lock:
+        if _shared_backend is None:
+            _shared_backend = create_backend()
+        return _shared_backend
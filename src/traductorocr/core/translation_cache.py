@@ -0,0 +1,169 @@
+"""
+Caché persistente de traducciones (LRU en memoria + SQLite en disco)
+"""
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from traductorocr.core.config import (
+    TRANSLATION_CACHE_FILE,
+    TRANSLATION_CACHE_SIZE,
+    TRANSLATION_CACHE_WARM
+)
+from traductorocr.utils.paths import user_data_path
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+CacheKey = Tuple[str, str, str]
+
+def normalize_text(text: str) -> str:
+    """Normaliza el texto para usarlo como clave (espacios colapsados y recortados)"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+class TranslationCache:
+    def __init__(self, db_path: Optional[str] = None,
+                 max_entries: int = TRANSLATION_CACHE_SIZE,
+                 warm_entries: int = TRANSLATION_CACHE_WARM):
+        """
+        Inicializa la caché de traducciones.
+
+        Args:
+            db_path: Ruta del archivo SQLite (None = solo memoria)
+            max_entries: Número máximo de entradas en memoria (LRU)
+            warm_entries: Entradas más recientes a precargar desde disco
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                    " translation TEXT NOT NULL, updated REAL NOT NULL,"
+                    " PRIMARY KEY (source, target, text))"
+                )
+                self._db.commit()
+                self.warm(warm_entries)
+            except sqlite3.Error as e:
+                print(f"Error al abrir la caché de traducciones: {e}")
+                self._db = None
+
+    def warm(self, limit: int) -> int:
+        """Precarga en memoria las traducciones usadas más recientemente"""
+        if self._db is None or limit <= 0:
+            return 0
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT source, target, text, translation FROM translations"
+                " ORDER BY updated DESC LIMIT ?", (limit,)
+            ).fetchall()
+            # Insertar de la más antigua a la más reciente para respetar el orden LRU
+            for source, target, text, translation in reversed(rows):
+                self._entries[(source, target, text)] = translation
+            self._trim()
+        return len(rows)
+
+    def get(self, text: str, source: str, target: str) -> Optional[str]:
+        """Busca una traducción en la caché (memoria y luego disco)"""
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            translation = self._entries.get(key)
+            if translation is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return translation
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translation FROM translations WHERE source=? AND target=? AND text=?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    self._entries[key] = row[0]
+                    self._trim()
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, source: str, target: str, translation: str) -> None:
+        """Guarda una traducción en memoria y en disco"""
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            self._trim()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                        key + (translation, time.time())
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Error al guardar en la caché de traducciones: {e}")
+
+    def translate(self, text: str, source: str, target: str,
+                  translate_func: Callable[[str], str]) -> str:
+        """Devuelve la traducción cacheada o la obtiene con 'translate_func' y la guarda"""
+        cached = self.get(text, source, target)
+        if cached is not None:
+            return cached
+        translation = translate_func(text)
+        if translation:
+            self.put(text, source, target, translation)
+        return translation
+
+    def stats(self) -> Dict[str, float]:
+        """Devuelve los contadores de aciertos/fallos de la caché"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries)
+            }
+
+    def close(self) -> None:
+        """Cierra la conexión con el archivo de caché"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _trim(self) -> None:
+        """Elimina las entradas menos usadas si se supera el tamaño máximo"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+_shared_cache: Optional[TranslationCache] = None
+_shared_lock = threading.Lock()
+
+def get_translation_cache() -> TranslationCache:
+    """Devuelve la caché compartida por OCR, traducción inversa y audio"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                db_path = user_data_path(TRANSLATION_CACHE_FILE)
+            except OSError as e:
+                print(f"No se pudo crear la carpeta de datos, caché solo en memoria: {e}")
+                db_path = None
+            _shared_cache = TranslationCache(db_path)
+        return _shared_cache
+
+def current_translation_cache() -> Optional[TranslationCache]:
+    """Devuelve la caché compartida solo si ya se creó (sin abrir la base de datos)"""
+    with _shared_lock:
+        return _shared_cache
@@ -1,106 +1,319 @@
 """
 Lógica principal del traductor
 """
+import importlib
 import tkinter as tk
+from tkinter import simpledialog
 import threading
-from mss import mss
-import numpy as np
-import cv2
-import pytesseract
-from deep_translator import GoogleTranslator
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 from traductorocr.ui.area_selector import AreaSelector
-from traductorocr.core.config import TARGET_LANGUAGE, INVERSE_TARGET_LANGUAGE, THRESHOLD_VALUE
-from traductorocr.core.audio_translator import AudioTranslator
-from traductorocr.ui.ocr_tuner import OcrTuner  
+from traductorocr.core.config import (
+    TARGET_LANGUAGE,
+    INVERSE_TARGET_LANGUAGE,
+    THRESHOLD_VALUE,
+    OCR_AUTO_THRESHOLD,
+    OCR_ENGINE,
+    WATCH_INTERVAL_MS,
+    REGION_WORKERS,
+    PRELOAD_IN_BACKGROUND,
+    PRELOAD_DELAY_MS,
+    AUDIO_MAX_SOURCES
+)
+from traductorocr.core.scheduler import get_scheduler
+from traductorocr.utils.profiling import stage_timer
+
+# Las pilas de OCR (cv2, numpy, Tesseract), audio (vosk, sounddevice) y traducción
+# (requests) se importan en su primer uso para que la ventana aparezca antes
+if TYPE_CHECKING:
+    import numpy as np
+    from traductorocr.core.audio_translator import AudioSourceGroup
+    from traductorocr.core.regions import OcrRegion, RegionSet
 
 class TranslatorLogic:
     def __init__(self, ui):
         self.ui = ui
-        self.audio_translator = AudioTranslator(
-            on_translation=self._on_audio_translation,
-            on_error=self._on_audio_error
-        )
+        self.scheduler = get_scheduler()
+        self._audio_sources = None            # Se crea al seleccionar un dispositivo de audio
         self.is_capturing_audio = False
-        self.selected_device_id = None
+        self.selected_devices = {}            # Fuente de audio -> dispositivo seleccionado
+        self._start_audio_when_ready = False  # Iniciar la captura cuando el modelo de voz esté listo
+        self._model_listener_added = False
         
         self.ocr_threshold = THRESHOLD_VALUE  # Valor por defecto (80)
         self.ocr_invert = False               # Por defecto, no invertido
+        self.ocr_auto = OCR_AUTO_THRESHOLD    # Umbral y polaridad automáticos por fotograma
+        self.ocr_engine = OCR_ENGINE          # Motor de OCR de las zonas al vuelo
+        self._adhoc_regions = {}              # Zonas seleccionadas al vuelo (estado cacheado por caja)
+        self._regions = None                  # Zonas con nombre, cada una con sus ajustes
+        
+        self.watch_stop_event = None          # Evento de parada del modo vigilancia
         
         self.setup_bindings()
+        if PRELOAD_IN_BACKGROUND:
+            # Precargar en segundo plano cuando la ventana ya está en pantalla
+            self.ui.root.after(PRELOAD_DELAY_MS, self._start_preload)
+
+    def _start_preload(self):
+        threading.Thread(target=self._preload, name="preload", daemon=True).start()
+
+    def _preload(self):
+        """Importa la pila de OCR y prepara la caché y el backend de traducción"""
+        started = time.perf_counter()
+        try:
+            # Solo por el efecto de importarlo: carga cv2, numpy, mss y Tesseract
+            importlib.import_module('traductorocr.core.pipeline')
+            from traductorocr.core.translation_cache import get_translation_cache
+            from traductorocr.core.batch_translator import get_batch_translator
+            get_translation_cache()  # Se precarga desde disco
+            get_batch_translator()   # Crea el backend (sesión HTTP)
+            self._speech_model_loader().provision()  # Verifica (o descarga) el modelo de voz
+            print(f"Precarga completada en {(time.perf_counter() - started) * 1000.0:.0f} ms")
+        except Exception as e:
+            print(f"Error en la precarga: {e}")
+
+    def _speech_model_loader(self):
+        """Cargador del modelo de voz, con el progreso enlazado a la interfaz"""
+        from traductorocr.core.speech_model import get_speech_model_loader
+        loader = get_speech_model_loader()
+        if not self._model_listener_added:
+            self._model_listener_added = True
+            loader.add_listener(lambda status: self.ui.root.after(0, self._on_model_status, status))
+        return loader
+
+    def _on_model_status(self, status):
+        """Actualiza el progreso del modelo de voz (hilo de Tk)"""
+        self.ui.set_audio_model_status(*status)
+        if status.state == "ready" and self._start_audio_when_ready:
+            self._start_audio_when_ready = False
+            self.toggle_audio_capture()
+        elif status.state == "error" and self._start_audio_when_ready:
+            self._start_audio_when_ready = False
+            self.ui.audio_status_value.config(text="Inactivo", foreground="red")
+
+    def toggle_audio_panel(self):
+        """Despliega el panel de audio y empieza a cargar el modelo de voz en segundo plano"""
+        self.ui.toggle_audio_expand()
+        if self.ui.is_audio_expanded:
+            self._speech_model_loader().load()
+
+    @property
+    def audio_sources(self) -> "AudioSourceGroup":
+        """Fuentes de audio, una por selector (vosk y sounddevice se cargan en el primer uso)"""
+        if self._audio_sources is None:
+            from traductorocr.core.audio_translator import AudioSourceGroup
+            self._audio_sources = AudioSourceGroup(
+                on_translation=self._on_audio_translation,
+                on_error=self._on_audio_error,
+                max_sources=AUDIO_MAX_SOURCES
+            )
+        return self._audio_sources
+
+    @property
+    def regions(self) -> "RegionSet":
+        if self._regions is None:
+            from traductorocr.core.regions import RegionSet
+            self._regions = RegionSet()
+        return self._regions
 
     def setup_bindings(self):
         """Configura los enlaces de eventos"""
         self.ui.capture_button.config(command=self.start_capture_process)
+        self.ui.watch_button.config(command=self.toggle_watch_mode)
+        self.ui.add_region_button.config(command=self.add_named_region)
+        self.ui.clear_regions_button.config(command=self.clear_named_regions)
         self.ui.alpha_slider.config(command=self.update_transparency)
         self.ui.color_button.config(command=self.change_text_color)
         self.ui.expand_button.config(command=self.ui.toggle_expand)
+        self.ui.audio_expand_button.config(command=self.toggle_audio_panel)
         self.ui.inverse_button.config(command=self.run_inverse_translation)
         self.ui.audio_capture_button.config(command=self.toggle_audio_capture)
-        self.ui.device_selector.bind('<<ComboboxSelected>>', self._on_device_selected)
+        self.ui.device_selector.bind('<<ComboboxSelected>>', lambda event: self._on_device_selected(0))
+        self.ui.add_source_button.config(command=self.add_audio_source)
         self.ui.ocr_tuner_button.config(command=self.open_ocr_settings)
 
     def start_capture_process(self):
         """Inicia el proceso de captura de área"""
-        self.ui.root.withdraw()
-        selector_root = tk.Toplevel(self.ui.root)
-        app = AreaSelector(selector_root)
-        selector_root.wait_window()
-        box = app.selection_box
-        self.ui.root.deiconify()
+        box = self._select_box()
         if box:
             self.run_ocr_thread(box)
 
     def run_ocr_thread(self, box):
-        """Ejecuta el OCR en un hilo separado"""
+        """Encola el OCR en el planificador (solo se muestra el resultado más reciente)"""
         self.ui.disable_controls()
         self.ui.show_loading("Traduciendo...")
-        threading.Thread(target=self.ocr_task, args=(box,), daemon=True).start()
+        self.scheduler.submit(
+            'ocr', self.ocr_task, box,
+            on_result=lambda result: self.ui.root.after(0, self.finish_ocr, result)
+        )
 
     def ocr_task(self, box):
         """Realiza el OCR y la traducción"""
-        result_message = ""
         try:
-            # Capturar y procesar imagen
-            monitor = {
-                "top": int(box[1]), 
-                "left": int(box[0]), 
-                "width": int(box[2]), 
-                "height": int(box[3])
-            }
-            with mss() as sct:
-                sct_img = sct.grab(monitor)
-            
-            # Procesar imagen
-            img_np = np.array(sct_img)
-            gray_img = cv2.cvtColor(img_np, cv2.COLOR_BGRA2GRAY)
-         
-            thresh_mode = cv2.THRESH_BINARY_INV if self.ocr_invert else cv2.THRESH_BINARY
-
-            _, processed_img = cv2.threshold(gray_img, self.ocr_threshold, 255, thresh_mode)
-
-          
-            # OCR
-            text_from_ocr = pytesseract.image_to_string(processed_img, lang='eng')
-            results = text_from_ocr.split('\n')
-            
-            if not results:
-                result_message = "No se detectó texto."
-            else:
-                # Limpiar y traducir resultados
-                cleaned_results = [line for line in results if line.strip()]
-                text_to_translate = "\n".join(cleaned_results)
-                
-                if not text_to_translate:
-                    result_message = "No se detectó texto útil."
-                else:
-                    # Traducir
-                    translator = GoogleTranslator(source='en', target=TARGET_LANGUAGE)
-                    result_message = translator.translate(text_to_translate)
+            from traductorocr.core.pipeline import capture_region
+            region = self._region_for(box)
+            return self._translate_image(capture_region(region), region)
         except Exception as e:
-            result_message = f"Error: {e}"
-        
-        self.ui.root.after(0, self.finish_ocr, result_message)
+            return f"Error: {e}"
+
+    def _translate_image(self, img_np: "np.ndarray", region: "OcrRegion") -> str:
+        """Procesa la imagen, aplica OCR y traduce el texto encontrado"""
+        from traductorocr.core.pipeline import process_image
+        result = process_image(img_np, region, target=TARGET_LANGUAGE)
+        if not result.lines:
+            return "No se detectó texto útil."
+        return result.text
+
+    def _region_for(self, box) -> "OcrRegion":
+        """Devuelve la zona cacheada (umbral, bloques, líneas) de una caja seleccionada al vuelo"""
+        from traductorocr.core.regions import OcrRegion, normalize_box
+        key = normalize_box(box)
+        region = self._adhoc_regions.get(key)
+        if region is None:
+            region = self._adhoc_regions[key] = OcrRegion("Zona", key)
+        # Las zonas al vuelo usan los ajustes globales del afinador
+        region.threshold, region.invert, region.auto = self.ocr_threshold, self.ocr_invert, self.ocr_auto
+        region.engine = self.ocr_engine
+        return region
+
+    def _select_box(self):
+        """Oculta la ventana principal y pide al usuario una zona de la pantalla"""
+        self.ui.root.withdraw()
+        selector_root = tk.Toplevel(self.ui.root)
+        app = AreaSelector(selector_root)
+        selector_root.wait_window()
+        self.ui.root.deiconify()
+        return app.selection_box
+
+    def add_named_region(self):
+        """Añade una zona con nombre y ajusta su umbral con el afinador"""
+        self.stop_watch_mode()
+        name = simpledialog.askstring("Nueva zona", "Nombre de la zona (p. ej. Subtítulos):", parent=self.ui.root)
+        if not name:
+            return
+        box = self._select_box()
+        if not box or box[2] < 1 or box[3] < 1:
+            return
+
+        from traductorocr.core.regions import OcrRegion
+        from traductorocr.core.screen_capture import get_capture_session
+        from traductorocr.ui.ocr_tuner import OcrTuner
+
+        region = OcrRegion(name.strip(), box, self.ocr_threshold, self.ocr_invert, self.ocr_auto, self.ocr_engine)
+        try:
+            sample_image = get_capture_session().grab(region.box).copy()
+            settings = OcrTuner(
+                parent=self.ui.root,
+                sample_image=sample_image,
+                initial_threshold=region.threshold,
+                initial_invert=region.invert,
+                initial_auto=region.auto,
+                initial_engine=region.engine
+            ).show()
+            region.threshold, region.invert, region.auto = settings["threshold"], settings["invert"], settings["auto"]
+            region.engine = settings["engine"]
+        except Exception as e:
+            print(f"Error al ajustar la zona '{region.name}': {e}")
+
+        self.regions.add(region)
+        self.ui.set_regions(self.regions.names())
+        print(f"Zona añadida: {region.name} {region.box} (Umbral={region.threshold}, "
+              f"Invertir={region.invert}, Automático={region.auto})")
+
+    def clear_named_regions(self):
+        """Elimina todas las zonas con nombre"""
+        self.stop_watch_mode()
+        self.regions.clear()
+        self.ui.set_regions([])
+
+    def toggle_watch_mode(self):
+        """Activa/desactiva la vigilancia continua de las zonas con nombre (o de una zona nueva)"""
+        if self.watch_stop_event is not None:
+            self.stop_watch_mode()
+            return
+
+        regions = self.regions.regions()
+        if not regions:
+            box = self._select_box()
+            if not box:
+                return
+            regions = [self._region_for(box)]
+
+        self.watch_stop_event = threading.Event()
+        self.ui.set_watch_active(True)
+        self.ui.show_loading("Vigilando zona...")
+        threading.Thread(
+            target=self._watch_loop,
+            args=(regions, self.watch_stop_event),
+            daemon=True
+        ).start()
+
+    def stop_watch_mode(self):
+        """Detiene el modo vigilancia si está activo"""
+        if self.watch_stop_event is not None:
+            self.watch_stop_event.set()
+            self.watch_stop_event = None
+        self.ui.set_watch_active(False)
+
+    def _watch_loop(self, regions, stop_event: threading.Event):
+        """
+        Captura periódicamente el rectángulo que cubre todas las zonas (una sola
+        captura por intervalo), lo recorta en vistas por zona y solo ejecuta OCR +
+        traducción en las zonas que el detector de cambios indica como nuevas.
+        """
+        from traductorocr.core.regions import RegionSet, union_box
+        from traductorocr.core.screen_capture import get_capture_session
+
+        origin = union_box([region.box for region in regions])
+        for region in regions:
+            region.change_detector.reset()
+        interval = WATCH_INTERVAL_MS / 1000.0
+        executor = ThreadPoolExecutor(max_workers=min(REGION_WORKERS, len(regions)),
+                                      thread_name_prefix="ocr-region")
+        try:
+            session = get_capture_session()
+            while not stop_event.is_set():
+                started = time.perf_counter()
+                try:
+                    with stage_timer('ocr.capture'):
+                        frame = session.grab(origin)
+                    changed = [(region, view) for region, view in RegionSet.slice(frame, origin, regions)
+                               if region.change_detector.check(view)]
+                    # Las vistas apuntan al buffer de la sesión: esperar a todas antes de la siguiente captura
+                    futures = [(region, executor.submit(self._translate_image, view, region))
+                               for region, view in changed]
+                    for region, future in futures:
+                        try:
+                            region.last_result = future.result()
+                        except Exception as e:
+                            print(f"Error en la zona '{region.name}': {e}")
+                            # Forzar un nuevo intento en la próxima captura estable
+                            region.change_detector.reset()
+                    if futures and not stop_event.is_set():
+                        self.ui.root.after(0, self.ui.update_result, self._format_results(regions))
+                except Exception as e:
+                    print(f"Error en modo vigilancia: {e}")
+                    for region in regions:
+                        region.change_detector.reset()
+                elapsed = time.perf_counter() - started
+                stop_event.wait(max(0.0, interval - elapsed))
+            print(f"Latencia de captura (vigilancia): {session.stats.summary()}")
+        except Exception as e:
+            self.ui.root.after(0, self.ui.update_result, f"Error: {e}")
+            if self.watch_stop_event is stop_event:
+                self.ui.root.after(0, self.stop_watch_mode)
+        finally:
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _format_results(regions) -> str:
+        """Une el último resultado de cada zona (con su nombre si hay varias)"""
+        if len(regions) == 1:
+            return regions[0].last_result
+        return "\n\n".join(f"[{region.name}]\n{region.last_result}"
+                            for region in regions if region.last_result)
 
     def finish_ocr(self, result):
         """Finaliza el proceso de OCR actualizando la UI"""
@@ -127,59 +340,80 @@ class TranslatorLogic:
             self.ui.show_inverse_result("Escribe algo primero.")
             return
         
-        threading.Thread(
-            target=self._inverse_translate_task,
-            args=(text_to_translate,),
-            daemon=True
-        ).start()
+        self.scheduler.submit(
+            'inverse', self._inverse_translate_task, text_to_translate,
+            on_result=lambda result: self.ui.root.after(0, self.ui.show_inverse_result, result),
+            on_error=lambda e: self.ui.root.after(0, self.ui.show_inverse_result, f"Error: {e}")
+        )
 
     def _inverse_translate_task(self, text):
-        try:
-            translator = GoogleTranslator(source='es', target=INVERSE_TARGET_LANGUAGE)
-            translated_text = translator.translate(text)
-            self.ui.root.after(0, self.ui.show_inverse_result, translated_text)
-        except Exception as e:
-            error_msg = f"Error: {e}"
-            self.ui.root.after(0, self.ui.show_inverse_result, error_msg)
+        from traductorocr.core.pipeline import translate_text
+        return translate_text(text, 'es', INVERSE_TARGET_LANGUAGE)
             
-    def _on_device_selected(self, event=None):
-        """Maneja la selección de un nuevo dispositivo de audio"""
-        device_id = self.ui.get_selected_device_id()
+    def add_audio_source(self):
+        """Añade otra fuente de audio con su propio selector y subtítulos"""
+        index = self.ui.add_audio_source()
+        self.ui.device_selectors[index].bind('<<ComboboxSelected>>',
+                                             lambda event, index=index: self._on_device_selected(index))
+
+    def _on_device_selected(self, index=0):
+        """Maneja la selección de un nuevo dispositivo de audio en la fuente 'index'"""
+        device_id = self.ui.get_selected_device_id(index)
         if device_id is not None:
-            print(f"Dispositivo seleccionado: {device_id}")
-            self.selected_device_id = device_id
-            self.audio_translator.set_audio_device(device_id)
+            print(f"Dispositivo seleccionado (fuente {index + 1}): {device_id}")
+            self.selected_devices[index] = device_id
+            source = self.audio_sources.source(index)
+            source.stop_capture()
+            source.set_audio_device(device_id)
+            if self.is_capturing_audio and source.is_configured:
+                # Con la captura en marcha, la fuente nueva (o cambiada) empieza a traducir ya
+                try:
+                    source.start_capture()
+                except Exception as e:
+                    self._show_audio_error(index, str(e))
             
     def toggle_audio_capture(self):
-        """Alterna entre iniciar/detener la captura de audio"""
-        if not self.selected_device_id:
+        """Alterna entre iniciar/detener la captura de todas las fuentes de audio"""
+        if not self.selected_devices:
             self.ui.audio_status_value.config(text="Inactivo - Seleccione un dispositivo")
             return
             
         if self.is_capturing_audio:
-            self.audio_translator.stop_capture()
+            self.audio_sources.stop_all()
             self.is_capturing_audio = False
             self.ui.audio_capture_button.config(text="Iniciar Captura de Audio")
             self.ui.audio_status_value.config(text="Inactivo", foreground="red")
         else:
+            loader = self._speech_model_loader()
+            if not loader.ready.is_set():
+                # La captura empieza sola cuando el modelo termine de cargarse
+                self._start_audio_when_ready = True
+                self.ui.audio_status_value.config(text="Esperando al modelo...", foreground="orange")
+                loader.load()
+                return
             try:
-                self.audio_translator.start_capture()
+                sources = self.audio_sources.start_all()
                 self.is_capturing_audio = True
                 self.ui.audio_capture_button.config(text="Detener Captura")
-                self.ui.audio_status_value.config(text="Capturando...", foreground="green")
+                self.ui.audio_status_value.config(
+                    text="Capturando..." if sources <= 1 else f"Capturando {sources} fuentes...",
+                    foreground="green"
+                )
             except Exception as e:
+                self.audio_sources.stop_all()
                 self.ui.audio_status_value.config(text=f"Error: {str(e)}", foreground="red")
             
-    def _on_audio_translation(self, translation):
-        """Callback para cuando hay una nueva traducción de audio"""
-        self.ui.subtitles_text.config(state='normal')
-        self.ui.subtitles_text.delete('1.0', 'end')
-        self.ui.subtitles_text.insert('1.0', translation)
-        self.ui.subtitles_text.config(state='disabled')
+    def _on_audio_translation(self, index, translation):
+        """Callback para cuando hay una nueva traducción de audio (llega desde un hilo trabajador)"""
+        self.ui.root.after(0, self.ui.show_subtitle, index, translation)
         
-    def _on_audio_error(self, error):
-        """Callback para cuando hay un error en la traducción de audio"""
-        self.ui.audio_status_label.config(text=f"Error: {error}")
+    def _on_audio_error(self, index, error):
+        """Callback para cuando hay un error en la traducción de audio (puede llegar desde un hilo trabajador)"""
+        self.ui.root.after(0, self._show_audio_error, index, error)
+
+    def _show_audio_error(self, index, error):
+        prefix = f"Fuente {index + 1}: " if len(self.ui.device_selectors) > 1 else ""
+        self.ui.audio_status_label.config(text=f"Error: {prefix}{error}")
         
     def open_ocr_settings(self):
         """
@@ -201,17 +435,12 @@ class TranslatorLogic:
 
         # 4. Si seleccionó, tomar UNA captura de esa área como muestra
         try:
-            monitor = {
-                "top": int(box[1]), 
-                "left": int(box[0]), 
-                "width": int(box[2]), 
-                "height": int(box[3])
-            }
-            with mss() as sct:
-                sct_img = sct.grab(monitor)
-            
+            from traductorocr.core.screen_capture import get_capture_session
+            from traductorocr.ui.ocr_tuner import OcrTuner
+
             # Convertir la imagen de mss a un formato que OpenCV entienda (np.ndarray)
-            sample_image = np.array(sct_img)
+            # (copia, porque el buffer de la sesión se reutiliza en la siguiente captura)
+            sample_image = get_capture_session().grab(box).copy()
             
             # 5. Volver a mostrar la ventana principal ANTES de abrir el afinador
             self.ui.root.deiconify()
@@ -221,7 +450,9 @@ class TranslatorLogic:
                 parent=self.ui.root,
                 sample_image=sample_image,
                 initial_threshold=self.ocr_threshold,
-                initial_invert=self.ocr_invert
+                initial_invert=self.ocr_invert,
+                initial_auto=self.ocr_auto,
+                initial_engine=self.ocr_engine
             )
             
             # 7. 'show()' bloqueará la ejecución hasta que el usuario guarde y cierre
@@ -230,8 +461,11 @@ class TranslatorLogic:
             # 8. Actualizar nuestras variables con los nuevos ajustes
             self.ocr_threshold = new_settings["threshold"]
             self.ocr_invert = new_settings["invert"]
+            self.ocr_auto = new_settings["auto"]
+            self.ocr_engine = new_settings["engine"]
             
-            print(f"Nuevos ajustes de OCR guardados: Umbral={self.ocr_threshold}, Invertir={self.ocr_invert}")
+            print(f"Nuevos ajustes de OCR guardados: Umbral={self.ocr_threshold}, "
+                  f"Invertir={self.ocr_invert}, Automático={self.ocr_auto}, Motor={self.ocr_engine}")
 
         except Exception as e:
             print(f"Error al abrir el afinador de OCR: {e}")
@@ -0,0 +1,143 @@
+"""
+Detector de actividad de voz (energía + cruces por cero) entre la captura y Vosk:
+solo se decodifican los tramos con voz
+"""
+from collections import deque
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from traductorocr.core.config import (
+    SPEECH_SAMPLERATE,
+    VAD_SUBFRAME_MS,
+    VAD_THRESHOLD_DB,
+    VAD_ZCR_MAX,
+    VAD_HANGOVER_MS,
+    VAD_PREROLL_MS,
+    VAD_FLOOR_RISE,
+    VAD_FLOOR_FALL,
+    VAD_MIN_FLOOR_DB,
+    VAD_INITIAL_FLOOR_DB
+)
+
+class GateResult(NamedTuple):
+    audio: Optional[np.ndarray]  # Muestras a entregar al reconocedor (None = nada que decodificar)
+    ended: bool                  # Acaba de terminar un tramo de voz (pedir el resultado final)
+
+class VoiceActivityGate:
+    def __init__(self, samplerate: int = SPEECH_SAMPLERATE, subframe_ms: int = VAD_SUBFRAME_MS,
+                 threshold_db: float = VAD_THRESHOLD_DB, zcr_max: float = VAD_ZCR_MAX,
+                 hangover_ms: int = VAD_HANGOVER_MS, preroll_ms: int = VAD_PREROLL_MS):
+        """
+        Divide el audio en subtramas y decide por cada una si hay voz: energía por
+        encima del ruido de fondo adaptativo y una tasa de cruces por cero propia
+        de la voz (el ruido de banda ancha cruza mucho más). Un tramo de voz se
+        alarga 'hangover_ms' tras la última subtrama con voz (para no cortar
+        palabras) y empieza con 'preroll_ms' de audio previo (para no perder la
+        primera consonante).
+
+        Args:
+            samplerate: Tasa del audio (la del reconocedor)
+            subframe_ms: Duración de cada decisión
+            threshold_db: Margen sobre el ruido de fondo para considerar voz
+            zcr_max: Fracción máxima de cruces por cero de una subtrama con voz
+            hangover_ms: Tiempo que se mantiene abierta la puerta tras la voz
+            preroll_ms: Audio previo que se entrega al abrir la puerta
+        """
+        self.samplerate = samplerate
+        self.subframe = int(samplerate * subframe_ms / 1000)
+        self.threshold_db = threshold_db
+        self.zcr_max = zcr_max
+        self.hangover_frames = max(1, hangover_ms // subframe_ms)
+        self.preroll = deque(maxlen=max(0, preroll_ms // subframe_ms))
+        self.reset()
+
+    def reset(self) -> None:
+        """Cierra la puerta y reinicia el ruido de fondo y las estadísticas"""
+        self.noise_floor_db: Optional[float] = None  # Se inicializa con la primera subtrama
+        self.active = False
+        self._hangover = 0
+        self._carry = np.zeros(0, dtype=np.int16)
+        self.preroll.clear()
+        self.total_samples = 0
+        self.forwarded_samples = 0
+        self.segments = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fracción del audio que no llegó al reconocedor"""
+        return 1.0 - self.forwarded_samples / self.total_samples if self.total_samples else 0.0
+
+    def _features(self, subframes: np.ndarray):
+        """Energía (dBFS) y tasa de cruces por cero de cada subtrama, vectorizadas"""
+        samples = subframes.astype(np.float32)
+        energy = np.mean(samples * samples, axis=1)
+        energy_db = 10.0 * np.log10(energy / (32768.0 * 32768.0) + 1e-10)
+        signs = np.signbit(subframes)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / subframes.shape[1]
+        return energy_db, zcr
+
+    def process(self, audio: np.ndarray) -> GateResult:
+        """Recibe audio int16 mono y devuelve lo que hay que decodificar"""
+        if self._carry.size:
+            audio = np.concatenate((self._carry, audio))
+        usable = audio.size - audio.size % self.subframe
+        self._carry = audio[usable:].copy()
+        if not usable:
+            return GateResult(None, False)
+
+        subframes = audio[:usable].reshape(-1, self.subframe)
+        energy_db, zcr = self._features(subframes)
+
+        forwarded = []
+        ended = False
+        for i, (subframe, level, crossings) in enumerate(zip(subframes, energy_db, zcr)):
+            if ended:
+                # El resto empieza otro tramo: se procesa en la siguiente llamada, tras el resultado final
+                self._carry = np.concatenate((subframes[i:].reshape(-1), self._carry))
+                break
+            self.total_samples += self.subframe
+            level = float(level)
+            if self.noise_floor_db is None:
+                # Sin historial: la primera subtrama, salvo que ya sea voz (captura que empieza hablando)
+                self.noise_floor_db = max(VAD_MIN_FLOOR_DB, min(level, VAD_INITIAL_FLOOR_DB))
+            margin = level - self.noise_floor_db
+            # Voz: claramente por encima del fondo y sin el cruce por cero del ruido,
+            # o tan fuerte que no puede ser fondo (fricativas: 's', 'f'...)
+            is_speech = (margin > self.threshold_db and crossings < self.zcr_max) or \
+                        margin > 2 * self.threshold_db
+
+            # Ruido de fondo: baja rápido y sube despacio (la música continua acaba siendo fondo)
+            rate = VAD_FLOOR_FALL if level < self.noise_floor_db else VAD_FLOOR_RISE
+            self.noise_floor_db = max(VAD_MIN_FLOOR_DB, self.noise_floor_db + rate * (level - self.noise_floor_db))
+
+            if is_speech:
+                if not self.active:
+                    self.active = True
+                    self.segments += 1
+                    forwarded.extend(self.preroll)
+                    self.preroll.clear()
+                self._hangover = self.hangover_frames
+                forwarded.append(subframe)
+            elif self.active:
+                self._hangover -= 1
+                forwarded.append(subframe)
+                if self._hangover <= 0:
+                    self.active = False
+                    ended = True
+            else:
+                self.preroll.append(subframe.copy())
+
+        if not forwarded:
+            return GateResult(None, ended)
+        speech = np.concatenate(forwarded)
+        self.forwarded_samples += speech.size
+        return GateResult(speech, ended)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "audio_s": round(self.total_samples / self.samplerate, 2),
+            "skipped_fraction": round(self.skipped_fraction, 3),
+            "segments": self.segments,
+            "noise_floor_db": round(self.noise_floor_db, 1) if self.noise_floor_db is not None else None,
+        }
@@ -1,6 +1,7 @@
 """
 Diseño de la interfaz de usuario
 """
+import threading
 import tkinter as tk
 from tkinter import font as tkFont, ttk, Text, colorchooser
 
@@ -10,7 +11,8 @@ from traductorocr.core.config import (
     DEFAULT_FONT_SIZE,
     POPUP_WRAP_LENGTH,
     DEFAULT_MIN_HEIGHT,
-    DEFAULT_EXPANDED_HEIGHT
+    DEFAULT_EXPANDED_HEIGHT,
+    AUDIO_MAX_SOURCES
 )
 
 class TranslatorUI:
@@ -91,6 +93,36 @@ class TranslatorUI:
         )
         self.capture_button.pack(fill="x", ipady=5)
         
+        self.watch_button = ttk.Button(
+            self.controls_frame,
+            text="Vigilar Zona (Traducción Continua)"
+        )
+        self.watch_button.pack(fill="x", pady=(5, 0))
+        
+        # Zonas con nombre (subtítulos, diálogo...), vigiladas con una sola captura
+        self.regions_frame = ttk.Frame(self.controls_frame)
+        self.regions_frame.pack(fill="x", pady=(5, 0))
+        
+        self.add_region_button = ttk.Button(
+            self.regions_frame,
+            text="Añadir Zona"
+        )
+        self.add_region_button.pack(side="left", fill="x", expand=True)
+        
+        self.clear_regions_button = ttk.Button(
+            self.regions_frame,
+            text="Quitar Zonas"
+        )
+        self.clear_regions_button.pack(side="left", padx=(5, 0))
+        
+        self.regions_label = ttk.Label(
+            self.controls_frame,
+            text="Zonas: ninguna",
+            font=("Pearl", 8)
+        )
+        self.regions_label.pack(fill="x")
+        self.region_names = []
+        
         self.progressbar = ttk.Progressbar(
             self.controls_frame,
             mode='indeterminate'
@@ -179,6 +211,22 @@ class TranslatorUI:
         self.result_text.insert('1.0', text)
         self.result_text.config(state='disabled')
 
+    def set_watch_active(self, active: bool) -> None:
+        """Actualiza el botón del modo vigilancia según su estado"""
+        if active:
+            self.watch_button.config(text="Detener Vigilancia")
+        elif self.region_names:
+            self.watch_button.config(text="Vigilar Zonas (Traducción Continua)")
+        else:
+            self.watch_button.config(text="Vigilar Zona (Traducción Continua)")
+
+    def set_regions(self, names: list) -> None:
+        """Muestra las zonas con nombre configuradas"""
+        self.region_names = list(names)
+        text = ", ".join(names) if names else "ninguna"
+        self.regions_label.config(text=f"Zonas: {text}")
+        self.set_watch_active(False)
+
     def show_loading(self, message: str) -> None:
         """Muestra mensaje de carga"""
         self.update_result(message)
@@ -194,15 +242,16 @@ class TranslatorUI:
             return
             
         device_names = [dev[1] for dev in devices]
-        self.device_selector['values'] = device_names
+        for selector in self.device_selectors:
+            selector['values'] = device_names
         self.device_selector.set(device_names[0])  # Seleccionar el primer dispositivo
         if hasattr(self, 'audio_capture_button'):
             self.audio_capture_button.configure(state='normal')
         
-    def get_selected_device_id(self) -> int:
-        """Obtiene el ID del dispositivo seleccionado"""
+    def get_selected_device_id(self, index: int = 0) -> int:
+        """Obtiene el ID del dispositivo seleccionado en la fuente 'index'"""
         try:
-            current_device = self.device_var.get()
+            current_device = self.device_vars[index].get()
             if current_device == 'No hay dispositivos disponibles':
                 return None
                 
@@ -214,9 +263,23 @@ class TranslatorUI:
         return None
         
     def on_refresh_devices(self) -> None:
-        """Refresca la lista de dispositivos de audio"""
-        import sounddevice as sd
+        """
+        Refresca la lista de dispositivos de audio en segundo plano
+        (sounddevice se carga aquí y probar cada dispositivo es lento).
+        """
+        self.devices_loaded = True
+        self.device_selector.set('Buscando dispositivos...')
+        self.refresh_devices_button.state(['disabled'])
+        threading.Thread(target=self._query_input_devices, name="audio-devices", daemon=True).start()
+
+    def _finish_refresh_devices(self, devices: list) -> None:
+        self.refresh_devices_button.state(['!disabled'])
+        self.update_audio_devices(devices)
+
+    def _query_input_devices(self) -> None:
+        """Busca los dispositivos de entrada (hilo secundario) y actualiza la UI al terminar"""
         try:
+            import sounddevice as sd
             devices = sd.query_devices()
             input_devices = []
             
@@ -268,12 +331,72 @@ class TranslatorUI:
                     except:
                         continue  # Ignorar dispositivos que no se pueden abrir
                         
-            self.update_audio_devices(input_devices)
         except Exception as e:
             import traceback
             print(f"Error al obtener dispositivos: {str(e)}")
             print(traceback.format_exc())
-            self.update_audio_devices([])
+            input_devices = []
+        self.root.after(0, self._finish_refresh_devices, input_devices)
+
+    def add_audio_source(self) -> int:
+        """Añade otra fuente de audio (selector y subtítulos propios) y devuelve su índice"""
+        index = len(self.device_selectors)
+        source_frame = ttk.LabelFrame(self.audio_frame, text=f"Fuente {index + 1}", padding=(5, 2))
+        source_frame.pack(fill="x", pady=(5, 0))
+
+        device_var = tk.StringVar()
+        selector = ttk.Combobox(
+            source_frame,
+            textvariable=device_var,
+            state="readonly",
+            width=30,
+            font=("Pearl", 8)
+        )
+        selector['values'] = [dev[1] for dev in self.device_list]
+        selector.pack(fill="x")
+
+        subtitles = Text(
+            source_frame,
+            font=self.custom_font_object,
+            fg=self.text_color,
+            bg=self.popup_bg_color,
+            wrap=tk.WORD,
+            height=2,
+            relief=tk.FLAT,
+            state='disabled'
+        )
+        subtitles.pack(fill="x", pady=(2, 0))
+
+        self.device_vars.append(device_var)
+        self.device_selectors.append(selector)
+        self.subtitle_texts.append(subtitles)
+        if len(self.device_selectors) >= AUDIO_MAX_SOURCES:
+            self.add_source_button.state(['disabled'])
+
+        # La ventana es de tamaño fijo: crecer con la nueva fila
+        self.root.update_idletasks()
+        row_height = source_frame.winfo_reqheight() + 5
+        self.audio_sources_height += row_height
+        self.root.geometry(f"350x{self.root.winfo_height() + row_height}")
+        return index
+
+    def show_subtitle(self, index: int, text: str) -> None:
+        """Muestra el subtítulo de la fuente 'index'"""
+        subtitles = self.subtitle_texts[index]
+        subtitles.config(state='normal')
+        subtitles.delete('1.0', tk.END)
+        subtitles.insert('1.0', text)
+        subtitles.config(state='disabled')
+
+    def set_audio_model_status(self, state: str, progress: float, message: str) -> None:
+        """Muestra el progreso de la preparación del modelo de voz"""
+        self.model_status_label.config(text=message)
+        if state in ("verifying", "downloading", "extracting", "loading", "warming"):
+            self.model_progress['value'] = progress
+            if not self.model_progress.winfo_ismapped():
+                self.model_progress.pack(fill="x", after=self.model_status_label)
+        else:
+            self.model_progress.pack_forget()
 
     def get_inverse_text(self) -> str:
         """Obtiene el texto a traducir inversamente"""
@@ -388,7 +511,7 @@ class TranslatorUI:
             self.audio_frame.pack_forget()
             try:
                 current_height = get_height_from_geometry(self.root.geometry())
-                new_height = max(300, current_height - 150)  # No menor que 300
+                new_height = max(300, current_height - 150 - self.audio_sources_height)  # No menor que 300
                 self.root.geometry(f"350x{new_height}")
             except (ValueError, IndexError):
                 # Si hay error al parsear la geometría, usar tamaño predeterminado
@@ -398,7 +521,7 @@ class TranslatorUI:
         else:
             try:
                 current_height = get_height_from_geometry(self.root.geometry())
-                new_height = current_height + 150
+                new_height = current_height + 150 + self.audio_sources_height
                 self.root.geometry(f"350x{new_height}")
             except (ValueError, IndexError):
                 # Si hay error, agregar 150 al tamaño actual
@@ -406,6 +529,8 @@ class TranslatorUI:
             self.audio_frame.pack(fill="both", expand=True, pady=5)
             self.audio_expand_button.config(text="Ocultar Traductor de Audio ▲")
             self.is_audio_expanded = True
+            if not self.devices_loaded:
+                self.on_refresh_devices()
 
     def create_audio_frame(self) -> None:
         """Crea el panel de traducción de audio"""
@@ -449,6 +574,15 @@ class TranslatorUI:
             command=self.on_refresh_devices
         )
         self.refresh_devices_button.pack(side="right", padx=(5, 0))
+
+        # Botón para añadir otra fuente (p. ej. el micrófono del chat de voz junto al audio del juego)
+        self.add_source_button = ttk.Button(
+            device_frame,
+            text="+",
+            width=3,
+            style='Accent.TButton'
+        )
+        self.add_source_button.pack(side="right", padx=(5, 0))
         
         # Frame para estado
         self.status_frame = ttk.Frame(top_frame)
@@ -477,6 +611,19 @@ class TranslatorUI:
         )
         self.audio_capture_button.pack(fill="x", pady=5)
         
+        # Estado del modelo de voz (verificación, descarga, carga en segundo plano)
+        self.model_status_label = ttk.Label(
+            self.audio_frame,
+            text="Modelo de voz sin cargar",
+            font=("Pearl", 8)
+        )
+        self.model_status_label.pack(fill="x")
+        self.model_progress = ttk.Progressbar(
+            self.audio_frame,
+            mode='determinate',
+            maximum=1.0
+        )
+        
         # Área de subtítulos/traducciones
         self.subtitles_text = Text(
             self.audio_frame,
@@ -490,6 +637,12 @@ class TranslatorUI:
         )
         self.subtitles_text.pack(fill="both", expand=True)
         
-        # Inicializar lista de dispositivos
+        # Fuentes de audio: la primera usa los widgets de arriba; add_audio_source() añade más
+        self.device_vars = [self.device_var]
+        self.device_selectors = [self.device_selector]
+        self.subtitle_texts = [self.subtitles_text]
+        self.audio_sources_height = 0
+        
+        # La lista de dispositivos se carga al desplegar el panel por primera vez
         self.device_list = []
-        self.on_refresh_devices()
\ No newline at end of file
+        self.devices_loaded = False
\ No newline at end of file
@@ -2,32 +2,70 @@
 """
 Módulo para la ventana emergente de ajuste de OCR (Tuner).
 """
+import time
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
 
+from traductorocr.core.preprocessing import AutoThreshold, normalize_scale, detect_text_blocks
+from traductorocr.core.ocr_lines import recognize_lines
+from traductorocr.core.config import OCR_ENGINE, OCR_ENGINES
+
+PREVIEW_MAX_SIZE = (400, 300)
+REDRAW_DELAY_MS = 16       # Como máximo un redibujado por fotograma (~60 Hz)
+ESTIMATE_DELAY_MS = 300    # Espera a que los controles se estabilicen antes de estimar el OCR
+
 class OcrTuner:
-    def __init__(self, parent, sample_image: np.ndarray, initial_threshold: int, initial_invert: bool):
+    def __init__(self, parent, sample_image: np.ndarray, initial_threshold: int, initial_invert: bool,
+                 initial_auto: bool = False, initial_engine: str = OCR_ENGINE):
 
         self.parent = parent
         self.original_image = sample_image
         
+        # Escala de grises a resolución completa y miniatura: se calculan UNA sola vez
+        if len(sample_image.shape) == 3:
+            self.gray_image = cv2.cvtColor(sample_image, cv2.COLOR_BGRA2GRAY)
+        else:
+            self.gray_image = sample_image
+        height, width = self.gray_image.shape[:2]
+        factor = min(1.0, PREVIEW_MAX_SIZE[0] / width, PREVIEW_MAX_SIZE[1] / height)
+        self.preview_gray = cv2.resize(
+            self.gray_image,
+            (max(1, int(width * factor)), max(1, int(height * factor))),
+            interpolation=cv2.INTER_AREA
+        ) if factor < 1.0 else self.gray_image
+        self.preview_factor = factor
+        self._levels = np.arange(256, dtype=np.uint16)
+        
+        self._photo = None           # PhotoImage reutilizada entre redibujados
+        self._redraw_pending = None  # id de 'after' del redibujado pendiente
+        self._estimate_pending = None
+        self._estimate_generation = 0
+        # Un único hilo para las estimaciones: reutiliza su motor OCR (thread-local)
+        self._estimator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-tuner")
+        
         # Variables para guardar los ajustes
         self.threshold_var = tk.IntVar(value=initial_threshold)
         self.invert_var = tk.BooleanVar(value=initial_invert)
+        self.auto_var = tk.BooleanVar(value=initial_auto)
+        self.engine_var = tk.StringVar(value=initial_engine)
         
         # Variable para almacenar el resultado final
         self.result = {
             "threshold": initial_threshold,
-            "invert": initial_invert
+            "invert": initial_invert,
+            "auto": initial_auto,
+            "engine": initial_engine
         }
         
         # Crear la ventana Toplevel (emergente)
         self.window = tk.Toplevel(parent)
         self.window.title("Ajustar Previsualización de OCR")
         self.window.attributes("-topmost", True)
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # --- Crear Widgets ---
         self.main_frame = ttk.Frame(self.window, padding=10)
@@ -40,6 +78,9 @@ class OcrTuner:
         self.image_label = ttk.Label(self.image_frame)
         self.image_label.pack(fill="both", expand=True)
         
+        self.estimate_label = ttk.Label(self.image_frame, text="OCR estimado: calculando...")
+        self.estimate_label.pack(fill="x", pady=(5, 0))
+        
         # Frame para los controles
         self.controls_frame = ttk.LabelFrame(self.main_frame, text="Controles")
         self.controls_frame.pack(side="right", fill="y")
@@ -47,7 +88,7 @@ class OcrTuner:
         self._create_controls()
         
         # Actualizar la previsualización inicial
-        self._update_preview()
+        self._on_auto_toggled()
 
     def _create_controls(self):
         """Crea los sliders y checkboxes de control."""
@@ -60,7 +101,7 @@ class OcrTuner:
             to=255,
             orient=tk.HORIZONTAL,
             variable=self.threshold_var,
-            command=lambda v: self._update_preview() # Actualiza al mover
+            command=lambda v: self._schedule_preview() # Actualiza al mover (agrupado)
         )
         self.threshold_slider.pack(fill="x", padx=10)
         
@@ -69,10 +110,30 @@ class OcrTuner:
             self.controls_frame,
             text="Invertir (Texto oscuro sobre fondo claro)",
             variable=self.invert_var,
-            command=self._update_preview # Actualiza al marcar
+            command=self._schedule_preview # Actualiza al marcar
         )
         self.invert_check.pack(pady=10, fill="x")
         
+        # Checkbox de Umbral automático (Otsu + detección de polaridad)
+        self.auto_check = ttk.Checkbutton(
+            self.controls_frame,
+            text="Automático (calcular umbral y polaridad)",
+            variable=self.auto_var,
+            command=self._on_auto_toggled
+        )
+        self.auto_check.pack(pady=(0, 10), fill="x")
+        
+        # Motor de OCR (la estimación de tiempo se recalcula con el elegido)
+        ttk.Label(self.controls_frame, text="Motor OCR:").pack(pady=(0, 2))
+        self.engine_combo = ttk.Combobox(
+            self.controls_frame,
+            textvariable=self.engine_var,
+            values=OCR_ENGINES,
+            state="readonly"
+        )
+        self.engine_combo.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
+        self.engine_combo.pack(pady=(0, 10), fill="x", padx=10)
+        
         # Botón de Guardar
         self.save_button = ttk.Button(
             self.controls_frame,
@@ -81,39 +142,83 @@ class OcrTuner:
         )
         self.save_button.pack(pady=20, fill="x")
 
+    def _on_auto_toggled(self):
+        """En modo automático muestra el umbral calculado y bloquea los controles manuales"""
+        if self.auto_var.get():
+            threshold, invert = AutoThreshold().compute(self.gray_image)
+            self.threshold_var.set(threshold)
+            self.invert_var.set(invert)
+            self.threshold_slider.state(['disabled'])
+            self.invert_check.state(['disabled'])
+        else:
+            self.threshold_slider.state(['!disabled'])
+            self.invert_check.state(['!disabled'])
+        self._schedule_preview()
+
+    def _schedule_preview(self):
+        """Agrupa los cambios de los controles en un solo redibujado por fotograma"""
+        if self._redraw_pending is None:
+            self._redraw_pending = self.window.after(REDRAW_DELAY_MS, self._update_preview)
+        # Reiniciar la espera de la estimación de OCR
+        if self._estimate_pending is not None:
+            self.window.after_cancel(self._estimate_pending)
+        self._estimate_pending = self.window.after(ESTIMATE_DELAY_MS, self._start_estimate)
+
+    def _preview_binary(self) -> np.ndarray:
+        """Aplica el umbral a la miniatura mediante una tabla de consulta (LUT)"""
+        threshold = int(self.threshold_var.get())
+        invert = self.invert_var.get()
+        # Misma semántica que cv2.THRESH_BINARY / THRESH_BINARY_INV
+        lut = np.where((self._levels > threshold) != invert, 255, 0).astype(np.uint8)
+        return cv2.LUT(self.preview_gray, lut)
+
+    def _start_estimate(self):
+        """Estima en segundo plano el tiempo de OCR con los ajustes actuales"""
+        self._estimate_pending = None
+        self._estimate_generation += 1
+        generation = self._estimate_generation
+        binary = self._preview_binary()
+        self.estimate_label.config(text="OCR estimado: calculando...")
+        self._estimator.submit(self._estimate_task, binary, self.engine_var.get(), generation)
+
+    def _estimate_task(self, binary: np.ndarray, engine: str, generation: int):
+        """
+        Ejecuta el mismo pipeline que la captura (escala normalizada + bloques + OCR)
+        sobre la miniatura. Como la escala se normaliza por altura de texto, el
+        tamaño que llega a Tesseract es parecido al de la resolución completa.
+        """
+        try:
+            started = time.perf_counter()
+            normalized, _ = normalize_scale(binary)
+            boxes = detect_text_blocks(normalized)
+            lines = recognize_lines(normalized, boxes, engine)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            text = f"OCR estimado: ~{elapsed_ms:.0f} ms ({len(lines)} líneas, {len(boxes)} bloques)"
+        except Exception as e:
+            text = f"OCR estimado: no disponible ({e})"
+        try:
+            self.window.after(0, self._show_estimate, text, generation)
+        except (tk.TclError, RuntimeError):
+            pass  # La ventana ya se cerró
+
+    def _show_estimate(self, text: str, generation: int):
+        if generation == self._estimate_generation and self.window.winfo_exists():
+            self.estimate_label.config(text=text)
+
     def _update_preview(self):
-        """Aplica los filtros a la imagen original y actualiza el label."""
+        """Aplica los filtros a la miniatura y actualiza el label."""
+        self._redraw_pending = None
         try:
-            # 1. Obtener valores actuales de los controles
-            threshold = self.threshold_var.get()
-            invert = self.invert_var.get()
+            # Umbral sobre la miniatura en grises ya calculada (sin cvtColor ni LANCZOS por tick)
+            img_pil = Image.fromarray(self._preview_binary())
             
-            # 2. Determinar el modo de OpenCV
-            # Si "invert" es True, usamos THRESH_BINARY_INV (para texto oscuro)
-            # Si es False, usamos THRESH_BINARY (para texto claro)
-            thresh_mode = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
-            
-            # 3. Aplicar el filtro a la imagen original
-            # (Asegurarse de que esté en escala de grises si no lo está)
-            if len(self.original_image.shape) == 3:
-                gray_img = cv2.cvtColor(self.original_image, cv2.COLOR_BGRA2GRAY)
+            if self._photo is None or (self._photo.width(), self._photo.height()) != img_pil.size:
+                self._photo = ImageTk.PhotoImage(image=img_pil)
+                self.image_label.config(image=self._photo)
+                self.image_label.image = self._photo # Guardar referencia para evitar el garbage collector
             else:
-                gray_img = self.original_image
-                
-            _, processed_img = cv2.threshold(gray_img, threshold, 255, thresh_mode)
-            
-            # 4. Convertir la imagen de OpenCV (np.ndarray) a una imagen de Tkinter
-            img_pil = Image.fromarray(processed_img)
-            
-            # Redimensionar si es muy grande para la ventana (opcional pero bueno)
-            max_size = (400, 300)
-            img_pil.thumbnail(max_size, Image.LANCZOS)
-            
-            img_tk = ImageTk.PhotoImage(image=img_pil)
-            
-            # 5. Actualizar el label
-            self.image_label.config(image=img_tk)
-            self.image_label.image = img_tk # Guardar referencia para evitar el garbage collector
+                # Reutilizar la PhotoImage existente
+                self._photo.paste(img_pil)
             
         except Exception as e:
             print(f"Error actualizando previsualización: {e}")
@@ -122,6 +227,16 @@ class OcrTuner:
         """Guarda los valores seleccionados y cierra la ventana."""
         self.result["threshold"] = self.threshold_var.get()
         self.result["invert"] = self.invert_var.get()
+        self.result["auto"] = self.auto_var.get()
+        self.result["engine"] = self.engine_var.get()
+        self._on_close()
+
+    def _on_close(self):
+        """Cierra la ventana cancelando redibujados y estimaciones pendientes."""
+        for pending in (self._redraw_pending, self._estimate_pending):
+            if pending is not None:
+                self.window.after_cancel(pending)
+        self._estimator.shutdown(wait=False)
         self.window.destroy()
 
     def show(self):
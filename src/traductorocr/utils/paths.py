@@ -1,4 +1,3 @@
-
 import os
 import sys
 
@@ -8,4 +7,14 @@ def resource_path(relative_path: str) -> str:
         base_path = sys._MEIPASS
     except Exception:
         base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+def user_data_path(filename: str) -> str:
+    """
+    Devuelve una ruta persistente para datos del usuario (caché, ajustes).
+    A diferencia de resource_path, no apunta a la carpeta temporal del EXE.
+    """
+    base_dir = os.environ.get('APPDATA') or os.path.expanduser('~')
+    data_dir = os.path.join(base_dir, 'TraductorOCR' if os.environ.get('APPDATA') else '.traductorocr')
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
@@ -0,0 +1,174 @@
+"""
+Modo de perfilado: temporizadores por etapa con histogramas móviles y un
+perfilador por muestreo que exporta pilas colapsadas o formato speedscope.
+
+Se activa con la variable de entorno TRADUCTOROCR_PROFILE=1 o con la opción
+--profile de traductorocr.__main__. Desactivado, stage_timer no mide nada.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from traductorocr.utils.stats import RollingStats
+
+PROFILE_ENV = 'TRADUCTOROCR_PROFILE'
+PROFILE_OUTPUT_ENV = 'TRADUCTOROCR_PROFILE_OUTPUT'
+
+_enabled = os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes', 'si', 'sí')
+_histograms: Dict[str, RollingStats] = {}
+_histograms_lock = threading.Lock()
+_profiler: Optional["SamplingProfiler"] = None
+_report_registered = False
+
+class _StageTimer:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, (time.perf_counter() - self.started) * 1000.0)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def is_enabled() -> bool:
+    return _enabled
+
+def stage_timer(name: str):
+    """Context manager que mide una etapa (no hace nada si el perfilado está desactivado)"""
+    return _StageTimer(name) if _enabled else _NULL_TIMER
+
+def record(name: str, value_ms: float) -> None:
+    """Añade una muestra al histograma de la etapa"""
+    stats = _histograms.get(name)
+    if stats is None:
+        with _histograms_lock:
+            stats = _histograms.setdefault(name, RollingStats(window=2048))
+    stats.add(value_ms)
+
+def report() -> Dict[str, dict]:
+    """Devuelve el resumen (percentiles) de todas las etapas medidas"""
+    with _histograms_lock:
+        items = list(_histograms.items())
+    return {name: stats.summary() for name, stats in sorted(items)}
+
+class SamplingProfiler:
+    def __init__(self, interval_ms: float = 5.0):
+        """
+        Perfilador por muestreo: cada 'interval_ms' guarda la pila de todos los hilos.
+
+        Args:
+            interval_ms: Intervalo entre muestras
+        """
+        self.interval = interval_ms / 1000.0
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def dump(self, path: str) -> None:
+        """Guarda el perfil: formato speedscope si termina en .json, si no pilas colapsadas"""
+        if path.endswith('.json'):
+            self._dump_speedscope(path)
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(frame.replace(';', ',') for frame in stack) + f" {count}\n")
+
+    def _dump_speedscope(self, path: str) -> None:
+        frames: Dict[str, int] = {}
+        samples, weights = [], []
+        interval_ms = self.interval * 1000.0
+        for stack, count in self.stacks.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(count * interval_ms)
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": "TraductorOCR",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": "TraductorOCR",
+            "exporter": "traductorocr.utils.profiling",
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+def enable(output_path: Optional[str] = None, interval_ms: float = 5.0) -> None:
+    """
+    Activa los temporizadores y, si se indica 'output_path', el perfilador por muestreo.
+    Al salir se imprime el resumen por etapa y se guarda el perfil.
+    """
+    global _enabled, _profiler, _report_registered
+    _enabled = True
+    if output_path and _profiler is None:
+        _profiler = SamplingProfiler(interval_ms).start()
+        atexit.register(_dump_profile, output_path)
+    if not _report_registered:
+        _report_registered = True
+        atexit.register(_print_report)
+
+def _dump_profile(output_path: str) -> None:
+    if _profiler is None:
+        return
+    _profiler.stop()
+    _profiler.dump(output_path)
+    print(f"Perfil guardado en {output_path} ({_profiler.samples} muestras)")
+
+def _print_report() -> None:
+    print("Tiempos por etapa (ms):")
+    for name, summary in report().items():
+        print(f"  {name}: {summary}")
+
+if _enabled:
+    enable(os.environ.get(PROFILE_OUTPUT_ENV) or None)
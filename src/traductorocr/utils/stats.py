@@ -0,0 +1,51 @@
+"""
+Estadísticas de latencia con ventana móvil
+"""
+import threading
+from collections import deque
+from typing import Dict
+
+class RollingStats:
+    def __init__(self, window: int = 512):
+        """
+        Guarda las últimas 'window' muestras (en milisegundos) y calcula percentiles.
+
+        Args:
+            window: Número de muestras recientes a conservar
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total_count = 0
+
+    def add(self, value_ms: float) -> None:
+        """Registra una nueva muestra"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self.total_count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Devuelve número de muestras, media, p50, p95, p99 y máximo de la ventana"""
+        with self._lock:
+            values = sorted(self._samples)
+            total_count = self.total_count
+        if not values:
+            return {"count": total_count}
+
+        def percentile(p: float) -> float:
+            index = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+            return round(values[index], 3)
+
+        return {
+            "count": total_count,
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(values[-1], 3),
+        }
+
+    def reset(self) -> None:
+        """Descarta todas las muestras"""
+        with self._lock:
+            self._samples.clear()
+            self.total_count = 0
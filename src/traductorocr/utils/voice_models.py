@@ -1,56 +1,164 @@
 """
-Funciones para descargar y gestionar modelos de voz
+Funciones para descargar, verificar y gestionar modelos de voz
 """
+import json
 import os
-import requests
+import shutil
 import zipfile
-from tqdm import tqdm
+import zlib
+from typing import Callable, Dict, Optional
+
 from traductorocr.utils.paths import resource_path
 
-def download_vosk_model():
+MODEL_DIR = 'vosk-model-small-en-us'
+MODEL_URL = "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"
+MANIFEST_FILENAME = '.traductorocr-manifest.json'
+
+# Archivos imprescindibles de un modelo de Vosk (para carpetas antiguas sin manifiesto):
+# modelo acústico, grafo de decodificación, configuración y extractor de i-vectores
+REQUIRED_FILES = [
+    'am/final.mdl',
+    'graph/HCLr.fst',
+    'graph/Gr.fst',
+    'conf/model.conf',
+    'ivector/final.ie',
+]
+
+# progress(estado, fracción 0-1, mensaje)
+ProgressCallback = Callable[[str, float, str], None]
+
+def _report(progress: Optional[ProgressCallback], state: str, fraction: float, message: str) -> None:
+    if progress is not None:
+        progress(state, fraction, message)
+
+def file_crc32(path: str, chunk_size: int = 1 << 20) -> str:
+    """CRC32 de un archivo (el mismo que guarda el zip de cada archivo)"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+    return f"{crc & 0xFFFFFFFF:08x}"
+
+def manifest_from_zip(zip_file: zipfile.ZipFile) -> Dict[str, Dict]:
     """
-    Descarga el modelo de voz pequeño en inglés de Vosk si no está presente
+    Manifiesto {ruta relativa: {size, crc32}} leído del índice del zip
+    (sin la carpeta raíz del archivo).
     """
-    model_path = resource_path('vosk-model-small-en-us')
-    if os.path.exists(model_path):
-        return True
-        
-    # URL del modelo pequeño en inglés
-    model_url = "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"
-    zip_path = resource_path('vosk-model.zip')
-    
+    files = {}
+    for info in zip_file.infolist():
+        if info.is_dir():
+            continue
+        relative = info.filename.split('/', 1)[1] if '/' in info.filename else info.filename
+        files[relative] = {"size": info.file_size, "crc32": f"{info.CRC:08x}"}
+    return files
+
+def read_manifest(model_path: str) -> Optional[Dict[str, Dict]]:
     try:
-        print("Descargando modelo de voz (85MB)...")
-        response = requests.get(model_url, stream=True)
+        with open(os.path.join(model_path, MANIFEST_FILENAME), encoding='utf-8') as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def verify_model(model_path: str, check_hashes: bool = True,
+                 progress: Optional[ProgressCallback] = None) -> bool:
+    """
+    Comprueba que el modelo está completo: cada archivo del manifiesto existe con
+    su tamaño (y su CRC32 si 'check_hashes'). Así se detectan las carpetas que
+    quedaron a medio extraer. Las carpetas sin manifiesto (instalaciones antiguas)
+    solo se aceptan si tienen los archivos imprescindibles.
+    """
+    if not os.path.isdir(model_path):
+        return False
+
+    manifest = read_manifest(model_path)
+    if manifest is None:
+        return all(os.path.isfile(os.path.join(model_path, name)) and
+                   os.path.getsize(os.path.join(model_path, name)) > 0
+                   for name in REQUIRED_FILES)
+
+    total = sum(entry["size"] for entry in manifest.values()) or 1
+    checked = 0
+    for relative, entry in manifest.items():
+        path = os.path.join(model_path, relative)
+        if not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+            return False
+        if check_hashes:
+            if file_crc32(path) != entry["crc32"]:
+                return False
+            checked += entry["size"]
+            _report(progress, "verifying", checked / total, "Verificando modelo de voz...")
+    return True
+
+def _download(url: str, zip_path: str, progress: Optional[ProgressCallback]) -> None:
+    """Descarga a un archivo temporal y lo renombra al terminar"""
+    import requests
+
+    partial_path = zip_path + '.part'
+    with requests.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
         total_size = int(response.headers.get('content-length', 0))
-        
-        with open(zip_path, 'wb') as f, tqdm(
-            desc="Descargando",
-            total=total_size,
-            unit='iB',
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as progress:
-            for data in response.iter_content(chunk_size=1024):
-                size = f.write(data)
-                progress.update(size)
-                
-        print("Extrayendo modelo...")
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(resource_path(''))
-            
-        # Renombrar la carpeta extraída
-        extracted_dir = resource_path('vosk-model-small-en-us-0.15')
-        if os.path.exists(extracted_dir):
-            os.rename(extracted_dir, model_path)
-            
-        # Limpiar archivo zip
-        os.remove(zip_path)
+        downloaded = 0
+        with open(partial_path, 'wb') as f:
+            for data in response.iter_content(chunk_size=1 << 16):
+                downloaded += f.write(data)
+                if total_size:
+                    _report(progress, "downloading", downloaded / total_size,
+                            f"Descargando modelo de voz ({downloaded >> 20}/{total_size >> 20} MB)...")
+    os.replace(partial_path, zip_path)
+
+def _extract(zip_path: str, target_dir: str, progress: Optional[ProgressCallback]) -> Dict[str, Dict]:
+    """Extrae el zip (sin su carpeta raíz) en 'target_dir' y devuelve su manifiesto"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+        manifest = manifest_from_zip(zip_file)
+        members = [info for info in zip_file.infolist() if not info.is_dir()]
+        root = os.path.abspath(target_dir)
+        for i, info in enumerate(members):
+            relative = info.filename.split('/', 1)[1] if '/' in info.filename else info.filename
+            destination = os.path.abspath(os.path.join(root, relative))
+            if not destination.startswith(root + os.sep):
+                raise ValueError(f"Ruta no válida en el zip: {info.filename}")
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            with zip_file.open(info) as src, open(destination, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            _report(progress, "extracting", (i + 1) / len(members), "Extrayendo modelo de voz...")
+    return manifest
+
+def ensure_model(model_path: Optional[str] = None, url: str = MODEL_URL,
+                 progress: Optional[ProgressCallback] = None) -> str:
+    """
+    Deja el modelo listo en 'model_path' y devuelve la ruta. Si falta o está
+    incompleto, lo descarga, lo extrae en una carpeta temporal, lo verifica con el
+    manifiesto del zip y solo entonces la mueve a su sitio (una extracción
+    interrumpida nunca queda como modelo válido). Lanza una excepción si falla.
+    """
+    model_path = model_path or resource_path(MODEL_DIR)
+    _report(progress, "verifying", 0.0, "Verificando modelo de voz...")
+    if verify_model(model_path, progress=progress):
+        return model_path
+
+    if os.path.isdir(model_path):
+        print(f"Modelo de voz incompleto en {model_path}, se descargará de nuevo")
+
+    zip_path = model_path + '.zip'
+    partial_dir = model_path + '.partial'
+    try:
+        _download(url, zip_path, progress)
+        if os.path.isdir(partial_dir):
+            shutil.rmtree(partial_dir)
+        manifest = _extract(zip_path, partial_dir, progress)
+        with open(os.path.join(partial_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({"source": url, "files": manifest}, f, indent=1)
+        if not verify_model(partial_dir, progress=progress):
+            raise RuntimeError("El modelo extraído no coincide con el manifiesto")
+
+        if os.path.isdir(model_path):
+            shutil.rmtree(model_path)
+        os.replace(partial_dir, model_path)
         print("Modelo instalado correctamente")
-        return True
-        
-    except Exception as e:
-        print(f"Error al descargar el modelo: {e}")
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-        return False
\ No newline at end of file
+        return model_path
+    finally:
+        for leftover in (zip_path, zip_path + '.part'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        if os.path.isdir(partial_dir):
+            shutil.rmtree(partial_dir, ignore_errors=True)